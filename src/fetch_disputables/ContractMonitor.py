@@ -2,6 +2,7 @@ import asyncio
 import os
 import threading
 from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Union
 
@@ -10,6 +11,10 @@ from dotenv import load_dotenv
 from web3 import Web3
 
 from .alerts import generic_alert, get_twilio_info
+from .block_cache import get_blocks
+from .checkpoints import checkpoint_store
+from .config_snapshot import ConfigSnapshot
+from .rpc import Priority, add_rate_limit, rpc_batch_call, rpc_batch_max_size, rpc_priority
 from .Ses import MockSes, Ses, TeamSes
 from .Slack import MockSlack, Slack
 from .utils import NotificationSources, create_async_task, get_logger
@@ -18,19 +23,54 @@ load_dotenv(".env")
 
 logger = get_logger(__name__)
 
+contract_monitor_path = Path(__file__).resolve().parents[2] / "contract-monitor.yaml"
+
+
+@dataclass(frozen=True)
+class ContractMonitorConfig:
+    start_block: int
+    contract_addresses: tuple[str, ...]
+
+
+def load_contract_monitor_config() -> ContractMonitorConfig:
+    with open(contract_monitor_path, "r") as yaml_file:
+        data = yaml.safe_load(yaml_file)
+        return ContractMonitorConfig(
+            start_block=data["start_block"],
+            contract_addresses=tuple(data["contract_addresses"]),
+        )
+
 
 class ContractMonitor:
+    def __init__(self):
+        self.config = ConfigSnapshot(contract_monitor_path, load_contract_monitor_config)
+        self._applied_config = None
+
     def _read_contract_monitor_config(self):
-        contract_monitor_path = (
-            Path(__file__).resolve().parents[2] / "contract-monitor.yaml"
-        )
-        with open(contract_monitor_path, "r") as yaml_file:
-            data = yaml.safe_load(yaml_file)
-            start_block = data["start_block"]
-            contract_addresses = data["contract_addresses"]
+        """Apply contract-monitor.yaml, if it changed since the last poll.
+
+        start_block only applies when the monitor starts; contracts added later
+        are monitored from the block the scan has reached.
+        """
+        config = self.config.get()
+        if config is self._applied_config:
+            return
+        starting = self._applied_config is None
+        self._applied_config = config
+        self.contract_addresses = list(config.contract_addresses)
+        if not starting:
+            logger.info(f"Contract monitor config changed, monitoring {self.contract_addresses}")
+            return
 
-            self.start_block = start_block
-            self.contract_addresses = contract_addresses
+        self.start_block = config.start_block
+        checkpoint = checkpoint_store.resume_block(self._checkpoint_keys())
+        if checkpoint is not None:
+            logger.info(f"Resuming contract monitor after checkpointed block {checkpoint}")
+            self.start_block = checkpoint + 1
+
+    def _checkpoint_keys(self) -> list[tuple[int, str, str]]:
+        chain_id = int(os.getenv("NETWORK_ID", "369"))
+        return [(chain_id, address, "transactions") for address in self.contract_addresses]
 
     def _map_network_id_env_to_rpc_url(self) -> str:
         network_id = os.getenv("NETWORK_ID", "369")
@@ -86,44 +126,63 @@ class ContractMonitor:
             )
         )
 
-    async def process_contract(
-        self, contract_address: str, w3: Web3, start_block: int, last_block: int
+    async def process_blocks(
+        self, contract_addresses: list[str], w3: Web3, start_block: int, last_block: int
     ):
-        for block_number in range(start_block, last_block + 1):
-            block = w3.eth.get_block(block_number, full_transactions=True)
-            for tx in block.transactions:
-                from_address = tx["from"]
-                to_address = tx["to"]
-
-                if (
-                    from_address is not None and from_address.lower() == contract_address.lower()
-                    or to_address is not None and to_address.lower() == contract_address.lower()
-                ):
-                    tx_hash = tx["hash"]
-                    receipt = w3.eth.get_transaction_receipt(tx_hash)
-
-                    if receipt["status"] == 0:
-                        logger.info(f"""
-                            Found reverted transaction:
-                            Chain ID: {w3.eth.chain_id}
-                            RPC: {w3.provider}
-                            Contract address: {contract_address}
-                            Tx hash: {tx_hash.hex()}
-                            Block number: {block_number}
-                            Sending notification...
-                        """)
-                        create_async_task(
-                            self._send_notification,
-                            chain_id=w3.eth.chain_id,
-                            rpc=str(w3.provider),
-                            contract_address=contract_address,
-                            tx_hash=tx_hash.hex(),
-                            block_number=block_number,
-                        )
+        """Look for reverted transactions from or to any of contract_addresses in a block range.
+
+        Blocks, then the receipts of matching transactions, are fetched in
+        JSON-RPC batches of RPC_BATCH_MAX_SIZE; every block is fetched once for
+        all contracts, through the shared block cache.
+        """
+        addresses = {address.lower() for address in contract_addresses}
+        chain_id = w3.eth.chain_id
+
+        for window_start in range(start_block, last_block + 1, rpc_batch_max_size):
+            window = range(window_start, min(window_start + rpc_batch_max_size, last_block + 1))
+            blocks = await get_blocks(w3, chain_id, list(window), full_transactions=True)
+
+            matches = []
+            for block_number, block in zip(window, blocks):
+                if block is None:
+                    continue
+                for tx in block.transactions:
+                    from_address = tx["from"]
+                    to_address = tx["to"]
+
+                    if from_address is not None and from_address.lower() in addresses:
+                        matches.append((block_number, from_address, tx["hash"]))
+                    elif to_address is not None and to_address.lower() in addresses:
+                        matches.append((block_number, to_address, tx["hash"]))
+
+            receipts = await asyncio.gather(
+                *(rpc_batch_call(w3, "eth_getTransactionReceipt", [tx_hash.hex()]) for _, _, tx_hash in matches)
+            )
+
+            for (block_number, contract_address, tx_hash), receipt in zip(matches, receipts):
+                if receipt is not None and receipt["status"] == 0:
+                    logger.info(f"""
+                        Found reverted transaction:
+                        Chain ID: {chain_id}
+                        RPC: {w3.provider}
+                        Contract address: {contract_address}
+                        Tx hash: {tx_hash.hex()}
+                        Block number: {block_number}
+                        Sending notification...
+                    """)
+                    create_async_task(
+                        self._send_notification,
+                        chain_id=chain_id,
+                        rpc=str(w3.provider),
+                        contract_address=contract_address,
+                        tx_hash=tx_hash.hex(),
+                        block_number=block_number,
+                    )
 
     async def process_contracts(self):
         rpc_url = self._map_network_id_env_to_rpc_url()
         w3 = Web3(Web3.HTTPProvider(rpc_url))
+        add_rate_limit(w3)
 
         start_block = self.start_block
         last_block = w3.eth.block_number
@@ -135,10 +194,10 @@ class ContractMonitor:
             Last block: {last_block}
         """)
 
-        for contract_address in self.contract_addresses:
-            await self.process_contract(contract_address, w3, start_block, last_block)
+        await self.process_blocks(self.contract_addresses, w3, start_block, last_block)
 
-        self.start_block = last_block
+        self.start_block = max(self.start_block, last_block + 1)
+        checkpoint_store.commit(self._checkpoint_keys(), last_block)
 
     async def run(self):
         try:
@@ -152,10 +211,13 @@ class ContractMonitor:
         logger.info("Starting contract monitor")
         poll_interval = 30
         while True:
+            self._read_contract_monitor_config()
             await self.process_contracts()
             await asyncio.sleep(poll_interval)
 
     def start_thread(self):
+        # block scans share the endpoint's rate limit with, and yield to, the event scans and disputes
+        rpc_priority.set(Priority.BACKGROUND)
         asyncio.run(self.run())
 
     def start(
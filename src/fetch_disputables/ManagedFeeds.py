@@ -1,4 +1,5 @@
 import yaml
+from typing import Optional
 from typing import TypedDict
 
 from telliot_core.apps.telliot_config import TelliotConfig
@@ -6,6 +7,7 @@ from telliot_feeds.feeds import CATALOG_FEEDS
 from telliot_feeds.datafeed import DataFeed
 
 from fetch_disputables.data import Threshold, Metrics, MonitoredFeed
+from fetch_disputables.data import fetch_trusted_value
 from fetch_disputables.utils import get_logger
 
 logger = get_logger(__name__)
@@ -23,23 +25,35 @@ class ManagedFeeds:
     async def fetch_new_datapoint(self, query_id: str):
         try:
             datafeed = self._map_queryId_to_datafeed(query_id)
-            trusted_val, _ = await datafeed.source.fetch_new_datapoint()
+            trusted_val, _ = await fetch_trusted_value(datafeed)
             return trusted_val
         except Exception as e:
             logger.error("Error while fetching new datapoint")
             logger.error(e)
             return None
 
-    async def is_report_removable(self, monitored_feed: MonitoredFeed, query_id: str, cfg: TelliotConfig, value: float):
+    async def is_report_removable(
+        self, monitored_feed: MonitoredFeed, query_id: str, cfg: TelliotConfig, value: float, timestamp: Optional[int] = None
+    ):
         try:
             monitored_feed.feed = self._map_queryId_to_datafeed(query_id)
             monitored_feed.threshold = self._map_queryId_to_threshold(query_id)
-            return await monitored_feed.is_disputable(cfg, value)
+            return await monitored_feed.is_disputable(cfg, value, timestamp)
         except Exception as e:
             logger.error("Error while checking if report is removable")
             logger.error(e)
             return False
 
+    def datafeeds(self) -> list[DataFeed]:
+        """Get the feeds reports of the managed query ids are checked against."""
+        feeds = []
+        for query_id in self.managed_feeds:
+            try:
+                feeds.append(self._map_queryId_to_datafeed(query_id))
+            except Exception as e:
+                logger.error(e)
+        return feeds
+
     def _map_queryId_to_datafeed(self, query_id: str) -> DataFeed:
         datafeed_query_tag = self.managed_feeds[query_id]['datafeed_query_tag']
         datafeed = CATALOG_FEEDS.get(datafeed_query_tag)
@@ -26,7 +26,8 @@ class Slack:
             NotificationSources.NEW_REPORT: 'DISPUTABLE_REPORT',
             NotificationSources.REPORTER_STOP_REPORTING: 'REPORTER_STOP',
             NotificationSources.REPORTER_BALANCE_THRESHOLD: 'REPORTER_BALANCE',
-            NotificationSources.DISPUTER_BALANCE_THRESHOLD: 'DISPUTER_BALANCE'
+            NotificationSources.DISPUTER_BALANCE_THRESHOLD: 'DISPUTER_BALANCE',
+            NotificationSources.REORGED_EVENT: 'REORGED_EVENT'
         }
         return notification_source_to_alert[notification_source]
 
@@ -1,4 +1,5 @@
 """Send text messages using Twilio."""
+import asyncio
 import os
 from typing import List
 from typing import Optional
@@ -68,7 +69,8 @@ def _map_notification_source_to_environment_alert(notification_source: Notificat
             NotificationSources.REPORTER_STOP_REPORTING: 'REPORTER_STOP',
             NotificationSources.REPORTER_BALANCE_THRESHOLD: 'REPORTER_BALANCE',
             NotificationSources.DISPUTER_BALANCE_THRESHOLD: 'DISPUTER_BALANCE',
-            NotificationSources.TRANSACTION_REVERTED: 'TRANSACTION_REVERTED'
+            NotificationSources.TRANSACTION_REVERTED: 'TRANSACTION_REVERTED',
+            NotificationSources.REORGED_EVENT: 'REORGED_EVENT'
         }
         return notification_source_to_alert[notification_source]
 
@@ -188,7 +190,9 @@ async def handle_notification_service(
     if team_ses != None and "email" in notification_service:
         logger.info(f"Sending team email - {notification_source}")
         try:
-            notification_service_results[notification_source]["team_email"] = team_ses.send_email(subject=subject, msg=msg)
+            notification_service_results[notification_source]["team_email"] = await asyncio.to_thread(
+                team_ses.send_email, subject=subject, msg=msg
+            )
             notification_service_results[notification_source]["error"]["team_email"] = None
             logger.info("Team email sent")
         except Exception as e:
@@ -198,7 +202,7 @@ async def handle_notification_service(
     if "sms" in notification_service:
         logger.info(f"Sending SMS message - {notification_source}")
         try:
-            sms_response = sms_message_function(notification_source)
+            sms_response = await asyncio.to_thread(sms_message_function, notification_source)
             if sms_response == None:
                 sms_response = f"SMS message sent - {notification_source}"
                 notification_service_results[notification_source]["error"]["sms"] = None
@@ -214,7 +218,7 @@ async def handle_notification_service(
     if "email" in notification_service:
         logger.info(f"Sending email - {notification_source}")
         try:
-            email_response = ses.send_email(subject=subject, msg=msg, new_report=new_report)
+            email_response = await asyncio.to_thread(ses.send_email, subject=subject, msg=msg, new_report=new_report)
             notification_service_results[notification_source]["email"] = email_response
             notification_service_results[notification_source]["error"]["email"] = None
             if email_response != None:
@@ -226,7 +230,8 @@ async def handle_notification_service(
     if "slack" in notification_service:
         logger.info(f"Sending slack message - {notification_source}")
         try:
-            slack_response = slack.send_message(
+            slack_response = await asyncio.to_thread(
+                slack.send_message,
                 subject=subject, msg=msg, new_report=new_report, notification_source=notification_source
             )
             notification_service_results[notification_source]["slack"] = slack_response
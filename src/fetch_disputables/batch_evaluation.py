@@ -0,0 +1,165 @@
+"""Threshold verdicts for many (reported, trusted) value pairs at once, e.g. when catching up or replaying history.
+
+evaluate_batch gives the verdict MonitoredFeed.is_disputable would give each
+pair once the trusted value is fetched, computing the numeric rows with
+NumPy in one pass instead of branching per report.
+"""
+from dataclasses import dataclass
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+
+from fetch_disputables.data import Metrics
+from fetch_disputables.data import Threshold
+
+# ints up to this size, and their differences, convert to float64 exactly,
+# so the vectorized arithmetic matches Python's
+MAX_EXACT_INT = 2**52
+
+METRIC_CODES = {Metrics.Percentage: 0, Metrics.Range: 1, Metrics.Equality: 2}
+
+COMPARABLE_TYPES = (str, bytes, float, int, tuple)
+
+
+@dataclass
+class BatchVerdicts:
+    """Per-row results of evaluate_batch.
+
+    disputable is only meaningful where valid is True; valid is False where
+    is_disputable would return None (or raise, see evaluate_one).
+    percent_diff is the absolute fractional difference of valid percentage
+    rows, NaN elsewhere.
+    """
+
+    disputable: np.ndarray
+    valid: np.ndarray
+    percent_diff: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.disputable)
+
+    def verdicts(self) -> List[Optional[bool]]:
+        """Get the verdicts as is_disputable returns them, None where there is none."""
+        return [bool(d) if v else None for d, v in zip(self.disputable, self.valid)]
+
+
+def is_numeric(value: Any) -> bool:
+    if isinstance(value, float):
+        return True
+    return isinstance(value, int) and abs(value) <= MAX_EXACT_INT
+
+
+def evaluate_one(reported_val: Any, trusted_val: Any, threshold: Threshold) -> Tuple[Optional[bool], Optional[float]]:
+    """Get the verdict and percent difference of one pair, like MonitoredFeed.is_disputable.
+
+    Where is_disputable would raise, i.e. a range threshold on values
+    that can't be subtracted, the verdict is None.
+    """
+    if not (isinstance(reported_val, COMPARABLE_TYPES) and isinstance(trusted_val, COMPARABLE_TYPES)):
+        return None, None
+
+    if threshold.metric == Metrics.Percentage:
+        if not trusted_val:
+            return None, None
+        if isinstance(trusted_val, (str, bytes, tuple)) or isinstance(reported_val, (str, bytes, tuple)):
+            return None, None
+        if threshold.amount is None:
+            return None, None
+        percent_diff = float(abs((reported_val - trusted_val) / trusted_val))
+        return percent_diff >= threshold.amount, percent_diff
+
+    elif threshold.metric == Metrics.Range:
+        if threshold.amount is None:
+            return None, None
+        try:
+            return abs(reported_val - trusted_val) >= threshold.amount, None
+        except TypeError:
+            return None, None
+
+    elif threshold.metric == Metrics.Equality:
+        if (
+            isinstance(reported_val, str)
+            and isinstance(trusted_val, str)
+            and reported_val.startswith("0x")
+            and trusted_val.startswith("0x")
+        ):
+            return trusted_val.lower() != reported_val.lower(), None
+        return bool(trusted_val != reported_val), None
+
+    return None, None
+
+
+def evaluate_batch(
+    reported_vals: Sequence[Any],
+    trusted_vals: Sequence[Any],
+    thresholds: Union[Threshold, Sequence[Threshold]],
+) -> BatchVerdicts:
+    """Evaluate rows of reported values against trusted values and thresholds.
+
+    thresholds is one Threshold for all rows or one per row. Rows of floats
+    and ints small enough to be exact as floats are evaluated with NumPy, the
+    others (text, bytes, tuples, large ints) row by row with evaluate_one.
+    Either way the verdicts match is_disputable's, including a zero trusted
+    value or text on a percentage threshold giving no verdict.
+    """
+    n = len(reported_vals)
+    if len(trusted_vals) != n:
+        raise ValueError(f"got {n} reported values but {len(trusted_vals)} trusted values")
+    if isinstance(thresholds, Threshold):
+        thresholds = [thresholds] * n
+    elif len(thresholds) != n:
+        raise ValueError(f"got {n} reported values but {len(thresholds)} thresholds")
+
+    disputable = np.zeros(n, dtype=bool)
+    valid = np.zeros(n, dtype=bool)
+    percent_diff = np.full(n, np.nan)
+
+    numeric = np.fromiter(
+        (is_numeric(r) and is_numeric(t) for r, t in zip(reported_vals, trusted_vals)), dtype=bool, count=n
+    )
+    metrics = np.fromiter((METRIC_CODES.get(th.metric, -1) for th in thresholds), dtype=np.int8, count=n)
+    amounts = np.fromiter(
+        (np.nan if th.amount is None else th.amount for th in thresholds), dtype=float, count=n
+    )
+
+    # rows needing Python semantics
+    for i in np.flatnonzero(~numeric | (metrics < 0)):
+        verdict, diff = evaluate_one(reported_vals[i], trusted_vals[i], thresholds[i])
+        if verdict is not None:
+            disputable[i], valid[i] = verdict, True
+        if diff is not None:
+            percent_diff[i] = diff
+
+    rows = np.flatnonzero(numeric & (metrics >= 0))
+    if len(rows) == 0:
+        return BatchVerdicts(disputable, valid, percent_diff)
+    reported = np.array([float(reported_vals[i]) for i in rows])
+    trusted = np.array([float(trusted_vals[i]) for i in rows])
+    amount = amounts[rows]
+    metric = metrics[rows]
+    has_amount = ~np.isnan(amount)
+
+    # inf and NaN values give NaN and inf like Python floats, without warnings
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        diff = np.abs((reported - trusted) / trusted)
+        distance = np.abs(reported - trusted)
+
+    percentage = (metric == 0) & (trusted != 0) & has_amount
+    percent_diff[rows[percentage]] = diff[percentage]
+    disputable[rows[percentage]] = diff[percentage] >= amount[percentage]
+    valid[rows[percentage]] = True
+
+    range_ = (metric == 1) & has_amount
+    disputable[rows[range_]] = distance[range_] >= amount[range_]
+    valid[rows[range_]] = True
+
+    equality = metric == 2
+    disputable[rows[equality]] = trusted[equality] != reported[equality]
+    valid[rows[equality]] = True
+
+    return BatchVerdicts(disputable, valid, percent_diff)
@@ -0,0 +1,155 @@
+"""Blocks fetched by any component, cached per chain and shared with the others."""
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from web3 import Web3
+
+from fetch_disputables.rpc import rpc_batch_call
+
+from dotenv import load_dotenv
+load_dotenv()
+
+block_cache_size = int(os.getenv("BLOCK_CACHE_SIZE", 1024))
+block_cache_finality_depth = int(os.getenv("BLOCK_CACHE_FINALITY_DEPTH", 64))
+
+BlockId = Union[int, str]  # a block number or "latest"
+# fetch blocks in one round trip, with full transactions or not, None for missing ones
+FetchBlocks = Callable[[List[BlockId], bool], Awaitable[List[Any]]]
+
+
+class BlockCache:
+    """Blocks per chain, by number, with LRU eviction at max_blocks per chain.
+
+    Blocks at least finality_depth below the highest block seen on their
+    chain can't be reorged anymore and are served from the cache. Nearer the
+    head, a cached block is only reused after its hash was checked against
+    the header of the block now at its height, so a block with transactions
+    costs a header instead of the full block, and reorged blocks are never
+    served. A block with transactions also serves requests for its header.
+
+    Thread-safe: the contract monitor thread shares the cache with the main
+    event loop.
+    """
+
+    def __init__(self, max_blocks: int = block_cache_size, finality_depth: int = block_cache_finality_depth) -> None:
+        self.max_blocks = max(max_blocks, 0)
+        self.finality_depth = max(finality_depth, 0)
+        # chain_id -> block number -> (block, has full transactions)
+        self._blocks: Dict[int, "OrderedDict[int, Tuple[Any, bool]]"] = {}
+        self._heads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def is_final(self, chain_id: int, block_number: int) -> bool:
+        with self._lock:
+            return self._heads.get(chain_id, -1) - block_number >= self.finality_depth
+
+    def get_cached(self, chain_id: int, block_number: int, full_transactions: bool = False) -> Optional[Any]:
+        """Get a cached block, whether it is final or not."""
+        with self._lock:
+            entry = self._blocks.get(chain_id, {}).get(block_number)
+            if entry is None or (full_transactions and not entry[1]):
+                return None
+            self._blocks[chain_id].move_to_end(block_number)
+            return entry[0]
+
+    def put(self, chain_id: int, block: Any, full_transactions: bool = False) -> None:
+        if block is None:
+            return
+        with self._lock:
+            self._put(chain_id, block, full_transactions)
+
+    def _put(self, chain_id: int, block: Any, full_transactions: bool) -> None:
+        number = int(block.number)
+        if number > self._heads.get(chain_id, -1):
+            self._heads[chain_id] = number
+        if self.max_blocks == 0:
+            return
+        blocks = self._blocks.setdefault(chain_id, OrderedDict())
+        entry = blocks.get(number)
+        if entry is not None and entry[1] and not full_transactions and entry[0].hash == block.hash:
+            # keep the transactions of the same block
+            blocks.move_to_end(number)
+            return
+        blocks[number] = (block, full_transactions)
+        blocks.move_to_end(number)
+        # a block's parent replaced by a reorg
+        parent = blocks.get(number - 1)
+        if parent is not None and parent[0].hash != block.parentHash:
+            del blocks[number - 1]
+        while len(blocks) > self.max_blocks:
+            blocks.popitem(last=False)
+
+    async def get_blocks(
+        self, chain_id: int, block_ids: List[BlockId], fetch: FetchBlocks, full_transactions: bool = False
+    ) -> List[Any]:
+        """Get blocks by number or "latest", fetching those not final in the cache in one call of fetch."""
+        results: List[Any] = [None] * len(block_ids)
+        missing: List[int] = []
+        revalidate: List[int] = []
+        for i, block_id in enumerate(block_ids):
+            cached = None if isinstance(block_id, str) else self.get_cached(chain_id, block_id, full_transactions)
+            if cached is not None and self.is_final(chain_id, block_id):  # type: ignore[arg-type]
+                results[i] = cached
+            elif cached is not None and full_transactions:
+                revalidate.append(i)
+            else:
+                missing.append(i)
+
+        if revalidate:
+            headers = await fetch([block_ids[i] for i in revalidate], False)
+            for i, header in zip(revalidate, headers):
+                cached = self.get_cached(chain_id, block_ids[i], True)  # type: ignore[arg-type]
+                if header is not None and cached is not None and header.hash == cached.hash:
+                    results[i] = cached
+                    self.put(chain_id, header)
+                else:
+                    missing.append(i)
+
+        if missing:
+            missing.sort()
+            blocks = await fetch([block_ids[i] for i in missing], full_transactions)
+            for i, block in zip(missing, blocks):
+                results[i] = block
+                self.put(chain_id, block, full_transactions)
+        return results
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blocks.clear()
+            self._heads.clear()
+
+
+block_cache = BlockCache()
+
+
+def rpc_block_fetcher(w3: Web3) -> FetchBlocks:
+    """Fetch blocks from w3's endpoint in one JSON-RPC batch.
+
+    The batch bypasses w3's formatters and middleware, so blocks of POA
+    chains need no geth_poa_middleware here.
+    """
+
+    async def fetch(block_ids: List[BlockId], full_transactions: bool) -> List[Any]:
+        return await asyncio.gather(*(
+            rpc_batch_call(
+                w3, "eth_getBlockByNumber", [hex(n) if isinstance(n, int) else n, full_transactions]
+            )
+            for n in block_ids
+        ))
+
+    return fetch
+
+
+async def get_blocks(w3: Web3, chain_id: int, block_ids: List[BlockId], full_transactions: bool = False) -> List[Any]:
+    """Get blocks of w3's chain by number or "latest" through the shared block cache."""
+    return await block_cache.get_blocks(chain_id, block_ids, rpc_block_fetcher(w3), full_transactions)
@@ -0,0 +1,230 @@
+"""Block timestamps learned per chain, so the block at a timestamp is found in a round trip or two."""
+import json
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from fetch_disputables.utils import get_logger
+
+from dotenv import load_dotenv
+load_dotenv()
+
+logger = get_logger(__name__)
+
+block_index_max_anchors = int(os.getenv("BLOCK_INDEX_MAX_ANCHORS", 10000))
+timestamp_search_probes = max(int(os.getenv("TIMESTAMP_SEARCH_PROBES", 16)), 2)
+
+BlockId = Union[int, str]  # a block number or "latest"
+# fetch blocks (anything with number and timestamp attributes) in one round trip, None for missing ones
+GetBlocks = Callable[[List[BlockId]], Awaitable[List[Any]]]
+
+
+class Anchors:
+    """Known (block number, timestamp) pairs of one chain, sorted by block number."""
+
+    def __init__(self, pairs: List[Tuple[int, int]] = ()) -> None:  # type: ignore[assignment]
+        self.numbers: List[int] = []
+        self.timestamps: List[int] = []
+        for number, timestamp in sorted(pairs):
+            self.add(number, timestamp)
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def add(self, number: int, timestamp: int) -> bool:
+        """Add an anchor, return whether it was new."""
+        i = bisect_right(self.numbers, number)
+        if i and self.numbers[i - 1] == number:
+            if self.timestamps[i - 1] == timestamp:
+                return False
+            # the block was replaced (reorg)
+            self.timestamps[i - 1] = timestamp
+            return True
+        self.numbers.insert(i, number)
+        self.timestamps.insert(i, timestamp)
+        return True
+
+    def bracket(self, timestamp: int) -> Tuple[Optional[int], Optional[int]]:
+        """Get the indexes of the last anchor at or before timestamp and the first one after it."""
+        i = bisect_right(self.timestamps, timestamp)
+        return (i - 1 if i else None), (i if i < len(self.numbers) else None)
+
+    def thin(self, max_anchors: int) -> None:
+        """Drop every other anchor until at most max_anchors are left, keeping the first and the last."""
+        while len(self.numbers) > max(max_anchors, 2):
+            keep = list(range(0, len(self.numbers) - 1, 2)) + [len(self.numbers) - 1]
+            self.numbers = [self.numbers[i] for i in keep]
+            self.timestamps = [self.timestamps[i] for i in keep]
+
+    def pairs(self) -> List[List[int]]:
+        return [[n, t] for n, t in zip(self.numbers, self.timestamps)]
+
+
+class BlockTimestampIndex:
+    """Sparse table of block timestamps per chain, to find the block at a timestamp.
+
+    A lookup starts from the known blocks (anchors) bracketing the timestamp
+    and interpolates the block number between them, so with regular block
+    times it usually takes one batch of blocks around the estimate, plus the
+    head when the timestamp is newer than every anchor. Lookups add the head
+    and the blocks found on both sides of the timestamp as anchors, and the
+    found blocks are memoized.
+
+    Anchors are kept in a JSON file replaced atomically like the checkpoints,
+    and thinned out to max_anchors per chain.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_anchors: int = block_index_max_anchors,
+        probes: int = timestamp_search_probes,
+        memo_size: int = 1024,
+    ) -> None:
+        self.path = Path(path or os.getenv("BLOCK_INDEX_FILE", "block_index.json"))
+        self.max_anchors = max_anchors
+        self.probes = max(probes, 2)
+        self.memo_size = memo_size
+        self._lock = threading.Lock()
+        self._anchors: Dict[int, Anchors] = self._load()
+        self._found: Dict[int, "OrderedDict[int, int]"] = {}
+
+    def _load(self) -> Dict[int, Anchors]:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            return {int(chain_id): Anchors([(int(n), int(t)) for n, t in pairs]) for chain_id, pairs in data.items()}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.error(f"Ignoring unreadable block index file {self.path}: {e}")
+            return {}
+
+    def _write(self) -> None:
+        with self._lock:
+            data = {str(chain_id): anchors.pairs() for chain_id, anchors in self._anchors.items()}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Unable to persist block index to {self.path}: {e}")
+
+    def anchors(self, chain_id: int) -> Anchors:
+        with self._lock:
+            if chain_id not in self._anchors:
+                self._anchors[chain_id] = Anchors()
+            return self._anchors[chain_id]
+
+    def learn(self, chain_id: int, number: int, timestamp: int) -> bool:
+        """Add a block as an anchor, return whether it was new."""
+        anchors = self.anchors(chain_id)
+        with self._lock:
+            added = anchors.add(number, timestamp)
+            anchors.thin(self.max_anchors)
+        return added
+
+    def _memoize(self, chain_id: int, timestamp: int, number: int) -> None:
+        found = self._found.setdefault(chain_id, OrderedDict())
+        found[timestamp] = number
+        found.move_to_end(timestamp)
+        while len(found) > self.memo_size:
+            found.popitem(last=False)
+
+    def _probes(self, lo: int, hi: int, estimate: int) -> List[int]:
+        """Blocks strictly between lo and hi to fetch next: around the estimate, and evenly spread.
+
+        The spread ones bound the number of rounds like a k-ary search if
+        block times are irregular.
+        """
+        near = self.probes // 2
+        probes = {estimate + offset for offset in range(-(near // 2), near - near // 2 + 1)}
+        spread = self.probes - near
+        probes.update(lo + (hi - lo) * i // (spread + 1) for i in range(1, spread + 1))
+        return sorted(n for n in probes if lo < n < hi)
+
+    async def find_block(self, chain_id: int, timestamp: int, get_blocks: GetBlocks) -> Optional[int]:
+        """Get the last block at or before timestamp.
+
+        0 if timestamp is older than the chain, the head if it is newer than
+        the head, None if a block couldn't be fetched.
+        """
+        found = self._found.get(chain_id)
+        if found is not None and timestamp in found:
+            found.move_to_end(timestamp)
+            return found[timestamp]
+
+        anchors = self.anchors(chain_id)
+        learned = False
+
+        async def fetch(block_ids: List[BlockId]) -> Optional[list]:
+            blocks = await get_blocks(block_ids)
+            if any(block is None for block in blocks):
+                logger.error(f"Unable to get blocks {block_ids} on chain_id {chain_id}")
+                return None
+            return blocks
+
+        def learn(*blocks: Tuple[int, int]) -> None:
+            nonlocal learned
+            for number, timestamp in blocks:
+                learned = self.learn(chain_id, number, timestamp) or learned
+
+        with self._lock:
+            lo_i, hi_i = anchors.bracket(timestamp)
+            lo = (anchors.numbers[lo_i], anchors.timestamps[lo_i]) if lo_i is not None else None
+            hi = (anchors.numbers[hi_i], anchors.timestamps[hi_i]) if hi_i is not None else None
+        if hi is None or lo is None:
+            # newer or older than every anchor: check the head or the genesis block
+            block_ids: List[BlockId] = (["latest"] if hi is None else []) + ([0] if lo is None else [])
+            blocks = await fetch(block_ids)
+            if blocks is None:
+                return None
+            learn(*((block.number, block.timestamp) for block in blocks))
+            for block_id, block in zip(block_ids, blocks):
+                if block_id == "latest":
+                    if timestamp >= block.timestamp:
+                        self._save(learned)
+                        return block.number
+                    hi = (block.number, block.timestamp)
+                else:
+                    if timestamp < block.timestamp:
+                        self._save(learned)
+                        return 0
+                    lo = (block.number, block.timestamp)
+
+        (lo_number, lo_time), (hi_number, hi_time) = lo, hi  # type: ignore[misc]
+        while hi_number - lo_number > 1:
+            estimate = lo_number + int((timestamp - lo_time) * (hi_number - lo_number) / (hi_time - lo_time))
+            blocks = await fetch(self._probes(lo_number, hi_number, estimate))
+            if blocks is None:
+                return None
+            for block in blocks:
+                if block.timestamp <= timestamp and block.number > lo_number:
+                    lo_number, lo_time = block.number, block.timestamp
+                elif block.timestamp > timestamp and block.number < hi_number:
+                    hi_number, hi_time = block.number, block.timestamp
+
+        learn((lo_number, lo_time), (hi_number, hi_time))
+        self._memoize(chain_id, timestamp, lo_number)
+        self._save(learned)
+        return lo_number
+
+    def _save(self, learned: bool) -> None:
+        if learned:
+            self._write()
+
+
+block_index = BlockTimestampIndex()
@@ -0,0 +1,91 @@
+"""Durable block checkpoints so the monitor resumes where it left off after a restart."""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+from fetch_disputables.utils import get_logger
+
+from dotenv import load_dotenv
+load_dotenv()
+
+logger = get_logger(__name__)
+
+CheckpointKey = Tuple[int, str, str]  # (chain_id, contract address, topic)
+
+
+class CheckpointStore:
+    """Last fully processed block per (chain_id, contract, topic).
+
+    Checkpoints are kept in a JSON file that is replaced atomically on every
+    commit (write to a temporary file, fsync, os.replace), so a crash leaves
+    either the previous or the new state on disk, never a torn file.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = Path(path or os.getenv("CHECKPOINT_FILE", "checkpoints.json"))
+        self._lock = threading.Lock()
+        self._checkpoints: Dict[str, int] = self._load()
+
+    @staticmethod
+    def _key(chain_id: int, contract: str, topic: str) -> str:
+        return f"{chain_id}:{contract.lower()}:{topic.lower()}"
+
+    def _load(self) -> Dict[str, int]:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            return {str(key): int(block) for key, block in data.items()}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.error(f"Ignoring unreadable checkpoint file {self.path}: {e}")
+            return {}
+
+    def _write(self) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._checkpoints, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def get(self, chain_id: int, contract: str, topic: str) -> Optional[int]:
+        """Get the last fully processed block, None if nothing was committed yet."""
+        with self._lock:
+            return self._checkpoints.get(self._key(chain_id, contract, topic))
+
+    def resume_block(self, keys: Iterable[CheckpointKey]) -> Optional[int]:
+        """Get the block to resume a scan covering all keys from.
+
+        That is the oldest checkpoint among keys, so no key skips history;
+        keys without a checkpoint are ignored. None if no key has one.
+        """
+        blocks = [block for block in (self.get(*key) for key in keys) if block is not None]
+        return min(blocks) if blocks else None
+
+    def commit(self, keys: Iterable[CheckpointKey], block_number: int) -> None:
+        """Record block_number as fully processed for all keys and persist it.
+
+        Checkpoints never move backwards.
+        """
+        with self._lock:
+            changed = False
+            for chain_id, contract, topic in keys:
+                key = self._key(chain_id, contract, topic)
+                if self._checkpoints.get(key, -1) < block_number:
+                    self._checkpoints[key] = block_number
+                    changed = True
+            if not changed:
+                return
+            try:
+                self._write()
+            except OSError as e:
+                logger.error(f"Unable to persist block checkpoints to {self.path}: {e}")
+
+
+checkpoint_store = CheckpointStore()
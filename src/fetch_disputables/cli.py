@@ -1,10 +1,14 @@
 """CLI dashboard to display recent values reported to Fetch oracles."""
+import asyncio
+import functools
 import logging
 import warnings
-from time import sleep
 from decimal import *
 from datetime import datetime
 from dataclasses import replace
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
 
 import os
 
@@ -23,15 +27,20 @@ from fetch_disputables.alerts import generic_alert
 from fetch_disputables.alerts import get_twilio_info
 from fetch_disputables.alerts import handle_notification_service
 from fetch_disputables.config import AutoDisputerConfig
-from fetch_disputables.data import chain_events
-from fetch_disputables.data import get_events
+from fetch_disputables.config_snapshot import ConfigSnapshot
+from fetch_disputables.data import cfg_for_chain
+from fetch_disputables.data import EventBatch
+from fetch_disputables.data import EventSource
 from fetch_disputables.data import parse_new_report_event
 from fetch_disputables.data import parse_new_dispute_event
+from fetch_disputables.data import prefetch_trusted_values
 from fetch_disputables.disputer import dispute
+from fetch_disputables.handle_connect_endpoint import probe_endpoints
 from fetch_disputables.utils import clear_console
 from fetch_disputables.utils import format_values
 from fetch_disputables.utils import get_logger
 from fetch_disputables.utils import get_tx_explorer_url
+from fetch_disputables.utils import NewReport
 from fetch_disputables.utils import select_account
 from fetch_disputables.utils import Topics
 from fetch_disputables.Ses import Ses, MockSes, TeamSes
@@ -46,13 +55,23 @@ from fetch_disputables.utils import (
 from fetch_disputables.data import get_fetch_balance, get_pls_balance
 from fetch_disputables.utils import NotificationSources
 from fetch_disputables.remove_report import remove_report
+from fetch_disputables.rpc import priority
+from fetch_disputables.rpc import Priority
 from fetch_disputables.ManagedFeeds import ManagedFeeds
 from fetch_disputables.ContractMonitor import contract_monitor
+from fetch_disputables.subscriptions import ingest_events
+from fetch_disputables.subscriptions import LogSubscriber
 
 from dotenv import load_dotenv
 load_dotenv('.env')
 
 notification_service: list[str] = get_service_notification()
+# how many reports are evaluated at once
+report_eval_concurrency = int(os.getenv("REPORT_EVAL_CONCURRENCY", 8))
+# how many reports of a chain are evaluated or waiting to be disputed and alerted on at once
+report_queue_size = int(os.getenv("REPORT_QUEUE_SIZE", 64))
+# seconds between fetches of the monitored feeds' trusted values, 0 to only fetch them for reports
+trusted_value_prefetch_interval = float(os.getenv("TRUSTED_VALUE_PREFETCH_INTERVAL", 0))
 notification_service_results: dict = {
     NotificationSources.NEW_DISPUTE_AGAINST_REPORTER: {
         "sms": None,
@@ -163,6 +182,10 @@ notification_service_results: dict = {
         }
     }
 } 
+oracle_address_chain_addy: dict[int, str] = {
+    1: "0x88dF592F8eb5D7Bd38bFeF7dEb0fBc02cf3778a0",
+    5: "0x51c59c6cAd28ce3693977F2feB4CfAebec30d8a2",
+}
 reporters: list[str] = get_reporters()
 reporters_time_margin: int = get_report_time_margin()
 
@@ -251,8 +274,16 @@ def print_title_info() -> None:
     default=False,
     is_flag=True
 )
+@click.option(
+    "--subscribe",
+    "-sub",
+    "subscribe",
+    help="Subscribe to new events through WebSocket endpoints, polling only as a fallback",
+    is_flag=True,
+    default=False,
+)
 @async_run
-async def main(all_values: bool, wait: int, account_name: str, is_disputing: bool, confidence_threshold: float, gas_multiplier: int, skip_processed_reports: bool) -> None:
+async def main(all_values: bool, wait: int, account_name: str, is_disputing: bool, confidence_threshold: float, gas_multiplier: int, skip_processed_reports: bool, subscribe: bool) -> None:
     """CLI dashboard to display recent values reported to Fetch oracles."""
     global ses, slack, team_ses
     team_ses = TeamSes()
@@ -279,18 +310,82 @@ async def main(all_values: bool, wait: int, account_name: str, is_disputing: boo
         is_disputing=is_disputing,
         confidence_threshold=confidence_threshold,
         gas_multiplier=gas_multiplier,
-        skip_processed_reports=skip_processed_reports
+        skip_processed_reports=skip_processed_reports,
+        subscribe=subscribe
     )
 
 
+async def evaluate_report(slots: asyncio.Semaphore, cfg: TelliotConfig, **kwargs) -> Optional[NewReport]:
+    """Parse a NewReport event and check its value once an evaluation slot is free."""
+    async with slots:
+        try:
+            return await parse_new_report_event(cfg=cfg, **kwargs)
+        except Exception as e:
+            logger.error(f"unable to parse new report event on chain_id {cfg.main.chain_id}: {e}")
+            return None
+
+
+class ChainDispatcher:
+    """Hand the evaluated reports of one chain to the dispute and notify stage, in chain order.
+
+    Reports are evaluated concurrently, also across batches, but each one is
+    handled only once it and the reports submitted before it on the chain
+    are, so alerts and disputes keep chain order. Every chain has its own
+    dispatcher, so a slow dispute on one chain doesn't hold up the others.
+    At most max_pending reports are evaluated or waiting to be handled;
+    submit waits for room beyond that.
+    """
+
+    def __init__(
+        self,
+        chain_id: int,
+        handle: Callable[[int, Optional[NewReport]], Awaitable[None]],
+        max_pending: int = report_queue_size,
+    ) -> None:
+        self.chain_id = chain_id
+        self.handle = handle
+        self._slots = asyncio.Semaphore(max(max_pending, 1))
+        # evaluation tasks, and batches to checkpoint once the reports before them are handled
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker = asyncio.ensure_future(self._run())
+
+    async def submit(self, evaluation: Callable[[], Awaitable[Optional[NewReport]]]) -> None:
+        """Start evaluating a report, once fewer than max_pending are in flight."""
+        await self._slots.acquire()
+        self._queue.put_nowait(asyncio.ensure_future(evaluation()))
+
+    def commit(self, batch: EventBatch) -> None:
+        """Checkpoint batch once the reports submitted before it were handled."""
+        self._queue.put_nowait(batch)
+
+    def close(self) -> None:
+        self._worker.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if isinstance(item, EventBatch):
+                item.commit()
+                continue
+            try:
+                await self.handle(self.chain_id, await item)
+            except Exception as e:
+                logger.error(f"unable to handle report on chain_id {self.chain_id}: {e}")
+            finally:
+                self._slots.release()
+
+
 async def start(
-    all_values: bool, wait: int, account_name: str, is_disputing: bool, confidence_threshold: float, gas_multiplier: int, skip_processed_reports: bool
+    all_values: bool, wait: int, account_name: str, is_disputing: bool, confidence_threshold: float, gas_multiplier: int, skip_processed_reports: bool, subscribe: bool = False
 ) -> None:
     """Start the CLI dashboard."""
     cfg = TelliotConfig()
     cfg.main.chain_id = int(os.getenv("NETWORK_ID", "943"))
-    disp_cfg = AutoDisputerConfig()
-    managed_feeds = ManagedFeeds()
+    # config files are reloaded when they change, not on every report
+    disputer_config = ConfigSnapshot("disputer-config.yaml", AutoDisputerConfig)
+    managed_feeds_config = ConfigSnapshot("managed-feeds.yaml", ManagedFeeds)
+    disp_cfg = disputer_config.get()
+    managed_feeds = managed_feeds_config.get()
     print_title_info()
 
     from_number, recipients = get_twilio_info()
@@ -312,37 +407,193 @@ async def start(
 
     display_rows = []
     displayed_events = set()
-    new_dispute_events_alerts_sent = set()
 
-    # Build query if filter is set
-    while True:
+    event_sources = [
+        EventSource(topic=Topics.NEW_REPORT, contract_name="fetch360-oracle"),
+        EventSource(topic=Topics.NEW_REPORT, contract_name="fetchflex-oracle"),
+        # addresses are for token contract
+        EventSource(topic=Topics.NEW_ORACLE_ADDRESS, chain_addy=oracle_address_chain_addy),
+        EventSource(topic=Topics.NEW_PROPOSED_ORACLE_ADDRESS, chain_addy=oracle_address_chain_addy),
+        EventSource(topic=Topics.NEW_DISPUTE, contract_name="fetch-governance"),
+    ]
+
+    # bounds how many reports are evaluated at once, e.g. waiting on trusted value APIs
+    evaluation_slots = asyncio.Semaphore(report_eval_concurrency)
+    # per chain, reports being evaluated or waiting for the dispute and notify stage
+    dispatchers: dict[int, ChainDispatcher] = {}
+
+    if trusted_value_prefetch_interval > 0:
+        # fetch trusted values ahead of the reports, so evaluating one waits on RPC only
+        create_async_task(
+            prefetch_trusted_values,
+            lambda: disputer_config.get().feed_index.datafeeds() + managed_feeds_config.get().datafeeds(),
+            trusted_value_prefetch_interval,
+        )
 
-        # Fetch NewReport events
-        event_lists = await get_events(
-            cfg=cfg,
-            contract_name="fetch360-oracle",
-            topics=[Topics.NEW_REPORT],
+    # keep endpoint health fresh in the background instead of checking it on every lookup
+    create_async_task(probe_endpoints)
+
+    async def handle_report(chain_id: int, new_report: Optional[NewReport]) -> None:
+        """Alert on, display and dispute an evaluated report."""
+        nonlocal display_rows
+        chain_cfg = cfg_for_chain(cfg, chain_id)
+
+        # Skip duplicate & missing events
+        if new_report is None or new_report.tx_hash in displayed_events:
+            return
+        displayed_events.add(new_report.tx_hash)
+
+        logger.debug(f"Found report, hash: {new_report.tx_hash}")
+
+        click.echo(f"New Report found: {new_report.tx_hash}")
+
+        if new_report.reporter in reporters:
+            update_reporter_last_timestamp(
+                reporters_last_timestamp,
+                new_report.reporter,
+                new_report.submission_timestamp
+            )
+
+        if new_report.is_managed_feed:
+            latest_report["price"] = new_report.value
+            latest_report["query_id"] = new_report.query_id
+            latest_report["timestamp"] = new_report.submission_timestamp
+            latest_report["initialized"] = True
+
+        new_report_notification_task = create_async_task(
+            handle_notification_service,
+            subject=f"DVM ALERT ({os.getenv('ENV_NAME', 'default')}) - New Report",
+            msg=format_new_report_message(new_report),
+            notification_service=notification_service,
+            sms_message_function=lambda notification_source: alert(all_values, replace(new_report), recipients, from_number, notification_source),
+            ses=ses,
+            slack=slack,
+            new_report=new_report,
+            notification_service_results=notification_service_results,
+            notification_source=NotificationSources.NEW_REPORT
         )
-        fetch_flex_report_events = await get_events(
-            cfg=cfg,
-            contract_name="fetchflex-oracle",
-            topics=[Topics.NEW_REPORT],
+        new_report_notification_task.add_done_callback(
+            lambda future_obj: notification_task_callback(
+                msg=f"New Report",
+                notification_service_results=notification_service_results,
+                notification_source=NotificationSources.NEW_REPORT
+            )
         )
-        fetch360_events = await chain_events(
-            cfg=cfg,
-            # addresses are for token contract
-            chain_addy={
-                1: "0x88dF592F8eb5D7Bd38bFeF7dEb0fBc02cf3778a0",
-                5: "0x51c59c6cAd28ce3693977F2feB4CfAebec30d8a2",
-            },
-            topics=[[Topics.NEW_ORACLE_ADDRESS], [Topics.NEW_PROPOSED_ORACLE_ADDRESS]],
+
+        if is_disputing and new_report.disputable:
+            with priority(Priority.DISPUTE):
+                new_dispute = await dispute(chain_cfg, disputer_config.get(), account, new_report, gas_multiplier)
+            if new_dispute:
+                success_msg = format_new_dispute_message(new_dispute)
+                new_dispute_notification_task = create_async_task(
+                    handle_notification_service,
+                    subject=f"DVM ALERT ({os.getenv('ENV_NAME', 'default')}) - Auto-Disputer began a dispute",
+                    msg=(
+                        f"{success_msg}"
+                        "\nAuto-Disputed Report:\n"
+                        f"{format_new_report_message(new_report)}"
+                    ),
+                    notification_service=notification_service,
+                    sms_message_function=lambda notification_source: dispute_alert(success_msg, recipients, from_number, notification_source),
+                    ses=ses,
+                    slack=slack,
+                    team_ses=team_ses,
+                    notification_service_results=notification_service_results,
+                    notification_source=NotificationSources.AUTO_DISPUTER_BEGAN_A_DISPUTE
+                )
+                new_dispute_notification_task.add_done_callback(
+                    lambda future_obj: notification_task_callback(
+                        msg=f"Auto-Disputer began a dispute",
+                        notification_service_results=notification_service_results,
+                        notification_source=NotificationSources.AUTO_DISPUTER_BEGAN_A_DISPUTE
+                    )
+                )
+
+        if is_disputing and new_report.removable:
+            with priority(Priority.DISPUTE):
+                success_msg = await remove_report(chain_cfg, managed_feeds_config.get(), account, new_report, gas_multiplier)
+            if success_msg:
+                removable_notification_task = create_async_task(
+                    handle_notification_service,
+                    subject=f"DVM ALERT ({os.getenv('ENV_NAME', 'default')}) - Report Removed",
+                    msg=(
+                        f"Report Removed:\n"
+                        f"{format_new_report_message(new_report)}"
+                    ),
+                    notification_service=notification_service,
+                    sms_message_function=lambda notification_source: alert(all_values, replace(new_report), recipients, from_number, notification_source),
+                    ses=ses,
+                    slack=slack,
+                    notification_service_results=notification_service_results,
+                    notification_source=NotificationSources.REMOVE_REPORT
+                )
+                removable_notification_task.add_done_callback(
+                    lambda future_obj: notification_task_callback(
+                        msg=f"Report Removed",
+                        notification_service_results=notification_service_results,
+                        notification_source=NotificationSources.REMOVE_REPORT
+                    )
+                )
+
+        display_rows.append(
+            (
+                new_report.tx_hash,
+                new_report.submission_timestamp,
+                new_report.link,
+                new_report.query_type,
+                new_report.value,
+                new_report.status_str,
+                new_report.asset,
+                new_report.currency,
+                new_report.chain_id,
+            )
         )
-        governance_dispute_events = await get_events(
-            cfg=cfg,
-            contract_name="fetch-governance",
-            topics=[Topics.NEW_DISPUTE],
+
+        # Prune display
+        if len(display_rows) > 10:
+            # sort by timestamp
+            display_rows = sorted(display_rows, key=lambda x: x[1])
+            displayed_events.remove(display_rows[0][0])
+            del display_rows[0]
+
+        # Display table
+        _, times, links, query_type, values, disputable_strs, assets, currencies, chain = zip(*display_rows)
+
+        dataframe_state = dict(
+            When=times,
+            Transaction=links,
+            QueryType=query_type,
+            Asset=assets,
+            Currency=currencies,
+            # split length of characters in the Values' column that overflow when displayed in cli
+            Value=values,
+            Disputable=disputable_strs,
+            ChainId=chain,
         )
-        event_lists += fetch360_events + fetch_flex_report_events + governance_dispute_events
+        df = pd.DataFrame.from_dict(dataframe_state)
+        df = df.sort_values("When")
+        df["Value"] = df["Value"].apply(format_values)
+        clear_console()
+        print_title_info()
+        print(df.to_markdown(index=False), end="\r")
+        df.to_csv("table.csv", mode="a", header=False)
+        click.echo("\n")
+
+    def dispatcher(chain_id: int) -> ChainDispatcher:
+        if chain_id not in dispatchers:
+            dispatchers[chain_id] = ChainDispatcher(chain_id, handle_report)
+        return dispatchers[chain_id]
+
+    log_subscriber = None
+    if subscribe:
+        log_subscriber = LogSubscriber()
+        if not log_subscriber.start(cfg, event_sources):
+            logger.warning("No WebSocket endpoints configured, falling back to polling")
+
+    # Build query if filter is set
+    while True:
+
+        managed_feeds = managed_feeds_config.get()
 
         send_alerts_when_reporters_stops_reporting(reporters_last_timestamp)
 
@@ -393,212 +644,86 @@ async def start(
             )
         )
 
-        for event_list in event_lists:
-            # event_list = [(80001, EXAMPLE_NEW_REPORT_EVENT)]
-            if not event_list:
-                continue
-            for chain_id, event in event_list:
-
+        # Fetch NewReport, NewDispute and oracle address events in one scan per chain,
+        # handed over as soon as each block range chunk is fetched, then stream
+        # subscribed events until the next check
+        async for batch in ingest_events(cfg=cfg, sources=event_sources, subscriber=log_subscriber, wait=wait):
+            disp_cfg = disputer_config.get()
+            managed_feeds = managed_feeds_config.get()
+            for chain_id, event in batch.retracted:
                 cfg.main.chain_id = chain_id
-                if (
-                    HexBytes(Topics.NEW_ORACLE_ADDRESS) in event.topics
-                    or HexBytes(Topics.NEW_PROPOSED_ORACLE_ADDRESS) in event.topics
-                ):
-                    link = get_tx_explorer_url(cfg=cfg, tx_hash=event.transactionHash.hex())
-                    msg = f"\n❗NEW ORACLE ADDRESS ALERT❗\n{link}"
-                    generic_alert(from_number=from_number, recipients=recipients, msg=msg)
+                link = get_tx_explorer_url(cfg=cfg, tx_hash=event.transactionHash.hex())
+                msg = f"\n❗REORG ALERT❗\nAn event alerted on was reorged out, disregard the previous alert\n{link}"
+                generic_alert(
+                    from_number=from_number,
+                    recipients=recipients,
+                    msg=msg,
+                    notification_source=NotificationSources.REORGED_EVENT,
+                )
+            for event_list in batch.event_lists:
+                # event_list = [(80001, EXAMPLE_NEW_REPORT_EVENT)]
+                if not event_list:
                     continue
-                    
-                if HexBytes(Topics.NEW_DISPUTE) in event.topics:
-                    if event.transactionHash.hex() in new_dispute_events_alerts_sent:
+                for chain_id, event in event_list:
+
+                    cfg.main.chain_id = chain_id
+                    if (
+                        HexBytes(Topics.NEW_ORACLE_ADDRESS) in event.topics
+                        or HexBytes(Topics.NEW_PROPOSED_ORACLE_ADDRESS) in event.topics
+                    ):
+                        link = get_tx_explorer_url(cfg=cfg, tx_hash=event.transactionHash.hex())
+                        msg = f"\n❗NEW ORACLE ADDRESS ALERT❗\n{link}"
+                        generic_alert(from_number=from_number, recipients=recipients, msg=msg)
                         continue
-
-                    new_dispute = await parse_new_dispute_event(
-                        cfg=cfg,
-                        log=event
-                    )
-
-                    if new_dispute.reporter in reporters:
-                        subject = f"DVM ALERT ({os.getenv('ENV_NAME', 'default')}) - New Dispute against Reporter {new_dispute.reporter}"
-                        msg = format_new_dispute_message(new_dispute)
-                        new_dispute_against_reporter_notification_task = create_async_task(
-                            handle_notification_service,
-                            subject=subject,
-                            msg=msg,
-                            notification_service=notification_service,
-                            sms_message_function=lambda notification_source: dispute_alert(f"{subject}\n{msg}", recipients, from_number, notification_source),
-                            ses=ses,
-                            slack=slack,
-                            notification_service_results=notification_service_results,
-                            notification_source=NotificationSources.NEW_DISPUTE_AGAINST_REPORTER
+                    
+                    if HexBytes(Topics.NEW_DISPUTE) in event.topics:
+                        new_dispute = await parse_new_dispute_event(
+                            cfg=cfg,
+                            log=event
                         )
-                        new_dispute_against_reporter_notification_task.add_done_callback(
-                            lambda future_obj: notification_task_callback(
-                                msg=f"New Dispute Event against Reporter",
+
+                        if new_dispute.reporter in reporters:
+                            subject = f"DVM ALERT ({os.getenv('ENV_NAME', 'default')}) - New Dispute against Reporter {new_dispute.reporter}"
+                            msg = format_new_dispute_message(new_dispute)
+                            new_dispute_against_reporter_notification_task = create_async_task(
+                                handle_notification_service,
+                                subject=subject,
+                                msg=msg,
+                                notification_service=notification_service,
+                                sms_message_function=lambda notification_source: dispute_alert(f"{subject}\n{msg}", recipients, from_number, notification_source),
+                                ses=ses,
+                                slack=slack,
                                 notification_service_results=notification_service_results,
                                 notification_source=NotificationSources.NEW_DISPUTE_AGAINST_REPORTER
                             )
-                        )
-                        new_dispute_events_alerts_sent.add(new_dispute.tx_hash)
-                    continue
+                            new_dispute_against_reporter_notification_task.add_done_callback(
+                                lambda future_obj: notification_task_callback(
+                                    msg=f"New Dispute Event against Reporter",
+                                    notification_service_results=notification_service_results,
+                                    notification_source=NotificationSources.NEW_DISPUTE_AGAINST_REPORTER
+                                )
+                            )
+                        continue
 
-                try:
-                    new_report = await parse_new_report_event(
-                        cfg=cfg,
-                        monitored_feeds=disp_cfg.monitored_feeds,
+                    # reports are parsed and checked concurrently, see evaluate_report, then
+                    # disputed and alerted on in chain order, see ChainDispatcher
+                    await dispatcher(chain_id).submit(functools.partial(
+                        evaluate_report,
+                        evaluation_slots,
+                        cfg=cfg_for_chain(cfg, chain_id),
+                        monitored_feeds=disp_cfg.feed_index,
                         managed_feeds=managed_feeds,
                         log=event,
                         confidence_threshold=confidence_threshold,
                         displayed_events=displayed_events,
                         skip_processed_reports=skip_processed_reports
-                    )
-                except Exception as e:
-                    logger.error(f"unable to parse new report event on chain_id {chain_id}: {e}")
-                    continue
-
-                # Skip duplicate & missing events
-                if new_report is None or new_report.tx_hash in displayed_events:
-                    continue
-                displayed_events.add(new_report.tx_hash)
+                    ))
 
-                logger.debug(f"Found report, hash: {new_report.tx_hash}")
-
-                click.echo(f"New Report found: {new_report.tx_hash}")
-
-                if new_report.reporter in reporters:
-                    update_reporter_last_timestamp(
-                        reporters_last_timestamp,
-                        new_report.reporter,
-                        new_report.submission_timestamp
-                    )
-
-                if new_report.is_managed_feed:
-                    latest_report["price"] = new_report.value
-                    latest_report["query_id"] = new_report.query_id
-                    latest_report["timestamp"] = new_report.submission_timestamp
-                    latest_report["initialized"] = True
-
-                new_report_notification_task = create_async_task(
-                    handle_notification_service,
-                    subject=f"DVM ALERT ({os.getenv('ENV_NAME', 'default')}) - New Report",
-                    msg=format_new_report_message(new_report),
-                    notification_service=notification_service,
-                    sms_message_function=lambda notification_source: alert(all_values, replace(new_report), recipients, from_number, notification_source),
-                    ses=ses,
-                    slack=slack,
-                    new_report=new_report,
-                    notification_service_results=notification_service_results,
-                    notification_source=NotificationSources.NEW_REPORT
-                )
-                new_report_notification_task.add_done_callback(
-                    lambda future_obj: notification_task_callback(
-                        msg=f"New Report",
-                        notification_service_results=notification_service_results,
-                        notification_source=NotificationSources.NEW_REPORT
-                    )
-                )
-
-                if is_disputing and new_report.disputable:
-                    new_dispute = await dispute(cfg, disp_cfg, account, new_report, gas_multiplier)
-                    if new_dispute:
-                        success_msg = format_new_dispute_message(new_dispute)
-                        new_dispute_notification_task = create_async_task(
-                            handle_notification_service,
-                            subject=f"DVM ALERT ({os.getenv('ENV_NAME', 'default')}) - Auto-Disputer began a dispute",
-                            msg=(
-                                f"{success_msg}"
-                                "\nAuto-Disputed Report:\n"
-                                f"{format_new_report_message(new_report)}"
-                            ),
-                            notification_service=notification_service,
-                            sms_message_function=lambda notification_source: dispute_alert(success_msg, recipients, from_number, notification_source),
-                            ses=ses,
-                            slack=slack,
-                            team_ses=team_ses,
-                            notification_service_results=notification_service_results,
-                            notification_source=NotificationSources.AUTO_DISPUTER_BEGAN_A_DISPUTE
-                        )
-                        new_dispute_notification_task.add_done_callback(
-                            lambda future_obj: notification_task_callback(
-                                msg=f"Auto-Disputer began a dispute",
-                                notification_service_results=notification_service_results,
-                                notification_source=NotificationSources.AUTO_DISPUTER_BEGAN_A_DISPUTE
-                            )
-                        )
-
-                if is_disputing and new_report.removable:
-                    success_msg = await remove_report(cfg, managed_feeds, account, new_report, gas_multiplier)
-                    if success_msg:
-                        removable_notification_task = create_async_task(
-                            handle_notification_service,
-                            subject=f"DVM ALERT ({os.getenv('ENV_NAME', 'default')}) - Report Removed",
-                            msg=(
-                                f"Report Removed:\n"
-                                f"{format_new_report_message(new_report)}"
-                            ),
-                            notification_service=notification_service,
-                            sms_message_function=lambda notification_source: alert(all_values, replace(new_report), recipients, from_number, notification_source),
-                            ses=ses,
-                            slack=slack,
-                            notification_service_results=notification_service_results,
-                            notification_source=NotificationSources.REMOVE_REPORT
-                        )
-                        removable_notification_task.add_done_callback(
-                            lambda future_obj: notification_task_callback(
-                                msg=f"Report Removed",
-                                notification_service_results=notification_service_results,
-                                notification_source=NotificationSources.REMOVE_REPORT
-                            )
-                        )
-                    
-
-                display_rows.append(
-                    (
-                        new_report.tx_hash,
-                        new_report.submission_timestamp,
-                        new_report.link,
-                        new_report.query_type,
-                        new_report.value,
-                        new_report.status_str,
-                        new_report.asset,
-                        new_report.currency,
-                        new_report.chain_id,
-                    )
-                )
-
-                # Prune display
-                if len(display_rows) > 10:
-                    # sort by timestamp
-                    display_rows = sorted(display_rows, key=lambda x: x[1])
-                    displayed_events.remove(display_rows[0][0])
-                    del display_rows[0]
-
-                # Display table
-                _, times, links, query_type, values, disputable_strs, assets, currencies, chain = zip(*display_rows)
-
-                dataframe_state = dict(
-                    When=times,
-                    Transaction=links,
-                    QueryType=query_type,
-                    Asset=assets,
-                    Currency=currencies,
-                    # split length of characters in the Values' column that overflow when displayed in cli
-                    Value=values,
-                    Disputable=disputable_strs,
-                    ChainId=chain,
-                )
-                df = pd.DataFrame.from_dict(dataframe_state)
-                df = df.sort_values("When")
-                df["Value"] = df["Value"].apply(format_values)
-                clear_console()
-                print_title_info()
-                print(df.to_markdown(index=False), end="\r")
-                df.to_csv("table.csv", mode="a", header=False)
-                click.echo("\n")
-                # reset config to clear object attributes that were set during loop
-                disp_cfg = AutoDisputerConfig()
+            # checkpoint the chunk only after all of its events were handled
+            dispatcher(batch.chain_id).commit(batch)
 
-        sleep(wait)
+        if log_subscriber is None:
+            await asyncio.sleep(wait)
 
 
 def update_reporter_last_timestamp(
@@ -766,8 +891,8 @@ async def update_reporters_pls_balance(
     reporters: list[str],
     reporters_pls_balance: dict[str, tuple[Decimal, bool]],
 ):
-    for reporter in reporters:
-        balance = await get_pls_balance(telliot_config, reporter)
+    balances = await asyncio.gather(*(get_pls_balance(telliot_config, reporter) for reporter in reporters))
+    for reporter, balance in zip(reporters, balances):
         old_balance, alert_sent = reporters_pls_balance.get(reporter, (0, False))
         reporters_pls_balance[reporter] = (balance, balance <= reporters_pls_balance_threshold[reporter] and alert_sent)
 
@@ -776,9 +901,9 @@ async def update_reporters_fetch_balance(
     reporters: list[str],
     reporters_fetch_balance: dict[str, tuple[Decimal, bool]],
 ):
-    for reporter in reporters:
+    fetch_balances = await asyncio.gather(*(get_fetch_balance(cfg, reporter) for reporter in reporters))
+    for reporter, reporter_fetch_balance in zip(reporters, fetch_balances):
         old_fetch_balance, alert_sent = reporters_fetch_balance.get(reporter, (0, False))
-        reporter_fetch_balance = await get_fetch_balance(cfg, reporter)
         reporters_fetch_balance[reporter] = (reporter_fetch_balance, reporter_fetch_balance <= reporters_fetch_balance_threshold[reporter] and alert_sent)
 
 def alert_reporters_balance_threshold(
@@ -7,13 +7,13 @@ from pathlib import Path
 
 import yaml
 from box import Box
-from telliot_feeds.feeds import CATALOG_FEEDS
 from telliot_feeds.feeds import DataFeed
 from telliot_feeds.feeds import DATAFEED_BUILDER_MAPPING
-from telliot_feeds.queries.query_catalog import query_catalog
 
+from fetch_disputables.data import find_catalog_entry
 from fetch_disputables.data import Metrics
 from fetch_disputables.data import MonitoredFeed
+from fetch_disputables.data import MonitoredFeedIndex
 from fetch_disputables.data import Threshold
 from fetch_disputables.utils import get_logger
 
@@ -24,9 +24,12 @@ logger = get_logger(__name__)
 class AutoDisputerConfig:
 
     monitored_feeds: Optional[List[MonitoredFeed]]
+    feed_index: MonitoredFeedIndex
 
     def __init__(self) -> None:
 
+        self.feed_index = MonitoredFeedIndex([])
+
         try:
             with open("disputer-config.yaml", "r") as f:
                 self.box = Box(yaml.safe_load(f))
@@ -47,6 +50,8 @@ class AutoDisputerConfig:
             return
 
         self.monitored_feeds = self.build_monitored_feeds_from_yaml()
+        # built once per config load, see parse_new_report_event
+        self.feed_index = MonitoredFeedIndex(self.monitored_feeds)
 
     def build_monitored_feeds_from_yaml(self) -> Optional[List[MonitoredFeed]]:
         """
@@ -56,7 +61,7 @@ class AutoDisputerConfig:
 
         This function reads the selected query Ids from disputer-config.yaml,
         then selects the matching DataFeed from telliot_feeds.query_catalog
-        dict.
+        dict (see find_catalog_entry).
 
         It also reads the query Id's selected threshold from disputer-config.yaml
         then creates a Threshold object representing the treshold.
@@ -73,12 +78,12 @@ class AutoDisputerConfig:
                 try:
                     if hasattr(self.box.feeds[i], "query_id"):
                         query_id = self.box.feeds[i].query_id[2:]
-                        catalog_entry = query_catalog.find(query_id=query_id)
+                        catalog_entry = find_catalog_entry(query_id)
                         if not catalog_entry:
                             logger.error(f"No corresponding datafeed found for query id: {query_id}")
                             return None
                         # if catalog entry exists for query id, feed exists
-                        datafeed: DataFeed[Any] = CATALOG_FEEDS.get(catalog_entry[0].tag)
+                        datafeed: DataFeed[Any] = catalog_entry[1]
                     elif hasattr(self.box.feeds[i], "query_type"):
                         query_type = self.box.feeds[i].query_type
                         datafeed = DATAFEED_BUILDER_MAPPING[query_type]
@@ -125,8 +130,12 @@ class AutoDisputerConfig:
                 logger.error(f"Python Box attribute error: {e}")
             except Exception as e:
                 logger.error(f"Error configuring datafeed_query_tag: {e}")
+            always_verify = bool(getattr(self.box.feeds[i], "always_verify", False))
             monitored_feeds.append(MonitoredFeed(
-                feed=datafeed, threshold=threshold, datafeed_query_tag=datafeed_query_tag
+                feed=datafeed,
+                threshold=threshold,
+                datafeed_query_tag=datafeed_query_tag,
+                always_verify=always_verify,
             ))
 
         return monitored_feeds
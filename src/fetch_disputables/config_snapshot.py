@@ -0,0 +1,78 @@
+"""Config files loaded once and reloaded only when they change on disk."""
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+from typing import Generic
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+from fetch_disputables.utils import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class ConfigSnapshot(Generic[T]):
+    """The config built from one file, swapped for a new one when the file changes.
+
+    get() only stats the file; the file is hashed when its mtime or size
+    changed and load() runs only if the content did, e.g. not on a touch. A
+    missing file is a state of its own and is loaded once too. If load()
+    raises, the previous snapshot is kept.
+
+    Snapshots are shared by everything that read them since the last change,
+    so they must be treated as read-only.
+    """
+
+    def __init__(self, path: Union[str, Path], load: Callable[[], T]) -> None:
+        self.path = Path(path)
+        self._load = load
+        self._stat: Optional[Tuple[int, int]] = None
+        self._digest: Optional[str] = None
+        self._value: Optional[T] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _read_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_digest(self) -> Optional[str]:
+        try:
+            return hashlib.sha256(self.path.read_bytes()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    def get(self) -> T:
+        """Get the current snapshot, reloading it first if the file changed."""
+        stat = self._read_stat()
+        if self._loaded and stat == self._stat:
+            return self._value  # type: ignore[return-value]
+
+        with self._lock:
+            if self._loaded and stat == self._stat:
+                return self._value  # type: ignore[return-value]
+            digest = self._read_digest()
+            if self._loaded and digest == self._digest:
+                self._stat = stat
+                return self._value  # type: ignore[return-value]
+            try:
+                value = self._load()
+            except Exception as e:
+                if not self._loaded:
+                    raise
+                logger.error(f"Error reloading {self.path}, keeping the previous config: {e}")
+                self._stat, self._digest = stat, digest
+                return self._value  # type: ignore[return-value]
+            if self._loaded:
+                logger.info(f"Reloaded {self.path}")
+            self._value, self._stat, self._digest, self._loaded = value, stat, digest, True
+            return value
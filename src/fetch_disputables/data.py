@@ -1,16 +1,22 @@
 """Get and parse NewReport events from Fetch oracles."""
 from decimal import *
 import asyncio
+import copy
+import functools
 import math
 from dataclasses import dataclass
+from dataclasses import field
 from enum import Enum
 from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Tuple
+from typing import Set
 from typing import Union
-import time
 import os
 
 import eth_abi
@@ -30,13 +36,34 @@ from telliot_feeds.queries.json_query import JsonQuery
 from telliot_feeds.queries.query import OracleQuery
 from telliot_feeds.queries.query_catalog import query_catalog
 from web3 import Web3
-from web3._utils.events import get_event_data
+from web3.exceptions import BlockNotFound
 from web3.exceptions import ExtraDataLengthError
 from web3.middleware import geth_poa_middleware
 from web3.types import LogReceipt
 
 from fetch_disputables import ALWAYS_ALERT_QUERY_TYPES
-from fetch_disputables import NEW_REPORT_ABI, NEW_DISPUTE_ABI
+from fetch_disputables.block_cache import block_cache
+from fetch_disputables.block_cache import BlockId
+from fetch_disputables.block_cache import FetchBlocks
+from fetch_disputables.block_index import block_index
+from fetch_disputables.checkpoints import checkpoint_store
+from fetch_disputables.event_decoder import new_dispute_decoder
+from fetch_disputables.event_decoder import new_report_decoder
+from fetch_disputables.event_index import ReorgBuffer
+from fetch_disputables.event_index import Release
+from fetch_disputables.event_index import SeenEventIndex
+from fetch_disputables.rpc import priority
+from fetch_disputables.rpc import Priority
+from fetch_disputables.report_stats import report_prefilter
+from fetch_disputables.report_stats import report_prefilter_tolerance
+from fetch_disputables.report_stats import report_stats
+from fetch_disputables.report_stats import ReportClass
+from fetch_disputables.retry import retry
+from fetch_disputables.retry import RetryPolicy
+from fetch_disputables.rpc import rpc_batch_call
+from fetch_disputables.rpc import rpc_call
+from fetch_disputables.trusted_values import trusted_value_history
+from fetch_disputables.trusted_values import trusted_values
 from fetch_disputables.utils import are_all_attributes_none
 from fetch_disputables.utils import disputable_str
 from fetch_disputables.utils import get_logger
@@ -44,9 +71,9 @@ from fetch_disputables.utils import get_tx_explorer_url
 from fetch_disputables.utils import NewReport
 from fetch_disputables.utils import NewDispute
 from fetch_disputables.handle_connect_endpoint import (
-    connected_endpoints,
-    handle_connect_endpoint,
-    get_endpoint
+    get_endpoint,
+    get_rpc_pool,
+    RpcPool
 )
 
 from fetch_disputables.utils import Topics
@@ -63,9 +90,37 @@ class Metrics(Enum):
     Range = "range"
 
 start_block: Dict[int, int] = {}
-disputes_start_block: Dict[int, int] = {}
+# chains whose start_block was rewound below a reorged out event, rescanned from there
+rewound_chains: Set[int] = set()
 inital_block_offset = int(os.getenv("INITIAL_BLOCK_OFFSET", 0))
 chain_reorg = int(os.getenv("CHAIN_REORG", 0))
+log_chunk_size = int(os.getenv("LOG_CHUNK_SIZE", 2000))
+log_chunk_min_size = int(os.getenv("LOG_CHUNK_MIN_SIZE", 10))
+log_chunk_max_size = int(os.getenv("LOG_CHUNK_MAX_SIZE", 10000))
+# seconds before a slow eth_getLogs is also sent to the next best endpoint, 0 to disable
+log_hedge_delay = float(os.getenv("LOG_HEDGE_DELAY", 0))
+query_data_cache_size = int(os.getenv("QUERY_DATA_CACHE_SIZE", 256))
+# retries of trusted value fetches without a value
+trusted_value_retry = RetryPolicy(
+    attempts=int(os.getenv("TRUSTED_VALUE_RETRIES", 3)),
+    base_delay=float(os.getenv("TRUSTED_VALUE_RETRY_DELAY", 1)),
+    max_delay=10,
+    deadline=float(os.getenv("TRUSTED_VALUE_RETRY_DEADLINE", 30)),
+)
+# FetchRNG sources may only have the randomness of a report some time after it
+rng_retry = RetryPolicy(
+    attempts=int(os.getenv("RNG_RETRIES", 3)),
+    base_delay=float(os.getenv("RNG_RETRY_DELAY", 20)),
+    max_delay=60,
+    deadline=float(os.getenv("RNG_RETRY_DEADLINE", 120)),
+)
+confirmations = int(os.getenv("CONFIRMATIONS", 0))
+alert_confirmations = int(os.getenv("ALERT_CONFIRMATIONS", confirmations))
+# logs stay seen while a reorg may still put them back in a scanned range
+seen_events = SeenEventIndex(reorg_depth=max(chain_reorg, confirmations))
+# events that only raise alerts, released at the lower ALERT_CONFIRMATIONS depth
+alert_only_topics = {Topics.NEW_DISPUTE, Topics.NEW_ORACLE_ADDRESS, Topics.NEW_PROPOSED_ORACLE_ADDRESS}
+pending_events = ReorgBuffer(confirmations=confirmations, alert_confirmations=alert_confirmations)
 
 
 @dataclass
@@ -111,13 +166,51 @@ class MonitoredFeed(Base):
     trusted_val: Optional[Reportable] = None
     percent_diff: Optional[float] = None
     datafeed_query_tag: Optional[str] = None
+    # never skip the trusted value fetch, even with REPORT_PREFILTER
+    always_verify: bool = False
+
+    def for_report(self, feed: DataFeed[Any]) -> "MonitoredFeed":
+        """Get a copy monitoring feed for one report.
+
+        The copy holds the report's trusted value and difference, so the
+        monitored feeds of a shared config are never modified.
+        """
+        return MonitoredFeed(
+            feed=feed,
+            threshold=self.threshold,
+            datafeed_query_tag=self.datafeed_query_tag,
+            always_verify=self.always_verify,
+        )
+
+    def prefilter(self, reported_val: Reportable) -> Optional[ReportClass]:
+        """Classify a numeric report against the recent verified reports of its query.
+
+        None if the report must be verified anyway: REPORT_PREFILTER is off,
+        the feed always verifies, or the value or threshold isn't numeric.
+        """
+        if not report_prefilter or self.always_verify:
+            return None
+        if isinstance(reported_val, bool) or not isinstance(reported_val, (int, float)):
+            return None
+        if self.threshold.metric == Metrics.Percentage and self.threshold.amount is not None:
+            max_relative = self.threshold.amount * report_prefilter_tolerance
+            return report_stats.classify(self.feed.query.query_id.hex(), reported_val, max_relative=max_relative)
+        if self.threshold.metric == Metrics.Range and self.threshold.amount is not None:
+            max_absolute = self.threshold.amount * report_prefilter_tolerance
+            return report_stats.classify(self.feed.query.query_id.hex(), reported_val, max_absolute=max_absolute)
+        return None
 
     async def is_disputable(
         self,
         cfg: TelliotConfig,
         reported_val: Reportable,
+        timestamp: Optional[int] = None,
     ) -> Optional[bool]:
-        """Check if the reported value is disputable."""
+        """Check if the reported value is disputable.
+
+        timestamp is the report's submission time; current-value feeds are then
+        compared with a trusted value fetched close to it, if there is one.
+        """
         if reported_val is None:
             logger.error("Need reported value to check disputability")
             return None
@@ -131,9 +224,14 @@ class MonitoredFeed(Base):
             reported_val = HexBytes(reported_val[0])
             cfg.main.chain_id = self.feed.query.chainId
 
-            block_number = get_block_number_at_timestamp(cfg, block_timestamp)
+            block_number = await get_block_number_at_timestamp(cfg, block_timestamp)
 
-            trusted_val, _ = await general_fetch_new_datapoint(self.feed, block_number)
+            trusted_val, _ = await retry(
+                lambda: general_fetch_new_datapoint(self.feed, block_number),
+                trusted_value_retry,
+                retry_if=is_missing_datapoint,
+                description="EVMCall trusted value",
+            )
             if not isinstance(trusted_val, tuple):
                 logger.warning(f"Bad value response for EVMCall: {trusted_val}")
                 return None
@@ -144,20 +242,18 @@ class MonitoredFeed(Base):
             trusted_val = HexBytes(trusted_val[0])
         elif get_query_type(self.feed.query) == "FetchRNG":
 
-            retries = 3
-            while retries > 0:
-                try:
-                    trusted_val, _ = await general_fetch_new_datapoint(self.feed)
-                    if trusted_val is None:
-                        logger.warning(f"FetchRNG could not build trusted value: {trusted_val}")
-                        retries -= 1
-                        time.sleep(20)
-                    else:
-                        retries = 0
-                except Exception as e:
-                    logger.warning(f"FetchRNG could not build trusted value: {trusted_val} {e}")
-                    retries -= 1
-                    time.sleep(20)
+            # the randomness sources may not have the block or beacon round yet,
+            # other reports are evaluated while this one waits
+            try:
+                trusted_val, _ = await retry(
+                    lambda: general_fetch_new_datapoint(self.feed),
+                    rng_retry,
+                    retry_if=is_missing_datapoint,
+                    description="FetchRNG trusted value",
+                )
+            except Exception as e:
+                logger.warning(f"FetchRNG could not build trusted value: {e}")
+                return None
 
             if trusted_val is None:
                 logger.warning(f"Unable to fetch trusted value for FetchRNG: {trusted_val}")
@@ -167,34 +263,42 @@ class MonitoredFeed(Base):
             if not isinstance(reported_val, tuple):
                 return True
 
-            timestamp = reported_val[1]
+            rng_timestamp = reported_val[1]
 
-            if not self.feed.source.is_valid_timestamp(timestamp):
-                logger.warning(f"FetchRNGCustom invalid timestamp {timestamp}")
+            if not self.feed.source.is_valid_timestamp(rng_timestamp):
+                logger.warning(f"FetchRNGCustom invalid timestamp {rng_timestamp}")
                 return True
 
-            self.feed.source.timestamp = timestamp;
-
-            retries = 3
-            while retries > 0:
-                try:
-                    trusted_val, _ = await general_fetch_new_datapoint(self.feed)
-                    if trusted_val is None:
-                        logger.warning(f"FetchRNGCustom could not build trusted value: {trusted_val}")
-                        retries -= 1
-                        time.sleep(20)
-                    else:
-                        retries = 0
-                except Exception as e:
-                    logger.warning(f"FetchRNGCustom could not build trusted value: {trusted_val} {e}")
-                    retries -= 1
-                    time.sleep(20)
+            self.feed.source.timestamp = rng_timestamp;
+
+            # the randomness sources may not have the block or beacon round yet,
+            # other reports are evaluated while this one waits
+            try:
+                trusted_val, _ = await retry(
+                    lambda: general_fetch_new_datapoint(self.feed),
+                    rng_retry,
+                    retry_if=is_missing_datapoint,
+                    description="FetchRNGCustom trusted value",
+                )
+            except Exception as e:
+                logger.warning(f"FetchRNGCustom could not build trusted value: {e}")
+                return None
 
             if trusted_val is None:
                 logger.warning(f"Unable to fetch trusted value for FetchRNGCustom: {trusted_val}")
                 return None
         else:
-            trusted_val, _ = await general_fetch_new_datapoint(self.feed)
+            report_class = self.prefilter(reported_val)
+            if report_class == ReportClass.FINE:
+                logger.info(
+                    f"Reported value {reported_val} for query id {self.feed.query.query_id.hex()} is within "
+                    "the recent verified reports, skipping trusted value fetch"
+                )
+                return False
+            if report_class is not None:
+                logger.info(f"Reported value {reported_val} classified as {report_class.value}, verifying")
+
+            trusted_val, _ = await fetch_trusted_value(self.feed, timestamp)
 
             if trusted_val is None:
                 logger.warning(f"trusted val was {trusted_val}")
@@ -233,7 +337,10 @@ class MonitoredFeed(Base):
                 """)
                 self.trusted_val = trusted_val
                 self.percent_diff = float(abs(percent_diff))
-                return float(abs(percent_diff)) >= self.threshold.amount
+                disputable = float(abs(percent_diff)) >= self.threshold.amount
+                if not disputable and report_prefilter:
+                    report_stats.record(query_id, reported_val)
+                return disputable
 
             elif self.threshold.metric == Metrics.Range:
 
@@ -244,7 +351,10 @@ class MonitoredFeed(Base):
                     logger.error("Please set a threshold amount to measure range")
                     return None
                 range_: float = abs(reported_val - trusted_val)
-                return range_ >= self.threshold.amount
+                disputable = range_ >= self.threshold.amount
+                if not disputable and report_prefilter and isinstance(reported_val, (int, float)):
+                    report_stats.record(self.feed.query.query_id.hex(), reported_val)
+                return disputable
 
             elif self.threshold.metric == Metrics.Equality:
                 logger.debug(f"""
@@ -283,6 +393,76 @@ async def general_fetch_new_datapoint(feed: DataFeed, *args: Any) -> Optional[An
     return await feed.source.fetch_new_datapoint(*args)
 
 
+def is_missing_datapoint(datapoint: Optional[Tuple[Any, Any]]) -> bool:
+    return datapoint is None or datapoint[0] is None
+
+
+# query types whose trusted value depends on the report, fetched for each one
+per_report_query_types = {"EVMCall", "FetchRNG", "FetchRNGCustom"}
+
+
+def trusted_value_key(feed: DataFeed) -> Optional[Tuple[str, str]]:
+    """Get the key feeds of one query with the same kind of source share datapoints under."""
+    try:
+        return HexBytes(feed.query.query_id).hex(), type(feed.source).__name__
+    except Exception:
+        return None
+
+
+def uses_trusted_value_cache(feed: DataFeed) -> bool:
+    """Check if reports of feed are checked against a shared trusted value, see MonitoredFeed.is_disputable.
+
+    EVMCall and FetchRNG feeds fetch a value for each report instead.
+    """
+    return get_query_type(feed.query) not in per_report_query_types
+
+
+async def fetch_trusted_value(feed: DataFeed, timestamp: Optional[float] = None) -> Optional[Any]:
+    """Fetch a current datapoint from a datafeed, shared with other reports of its query.
+
+    With a timestamp, a datapoint fetched within TRUSTED_VALUE_MAX_AGE of it
+    (live or prefetched, see TrustedValueHistory) is returned instead, if
+    there is one. Otherwise see TrustedValueCache. Fetches without a value
+    are retried with trusted_value_retry.
+    """
+    key = trusted_value_key(feed)
+
+    async def fetch() -> Any:
+        datapoint = await retry(
+            lambda: general_fetch_new_datapoint(feed),
+            trusted_value_retry,
+            retry_if=is_missing_datapoint,
+            description=f"trusted value of query id {key[0]}" if key else "trusted value",
+        )
+        if key is not None:
+            # only real fetches are samples, cache hits would restamp an old value
+            trusted_value_history.record(key, datapoint)
+        return datapoint
+
+    if key is None:
+        return await fetch()
+    if timestamp is not None:
+        datapoint = trusted_value_history.nearest(key, timestamp, trusted_values.max_age)
+        if datapoint is not None:
+            return datapoint
+    return await trusted_values.get(key, fetch)
+
+
+async def prefetch_trusted_values(get_feeds: Callable[[], List[DataFeed]], interval: float) -> None:
+    """Fetch the trusted values of feeds every interval seconds, ahead of the reports needing them.
+
+    Feeds fetching a trusted value for each report, see uses_trusted_value_cache, are skipped.
+    """
+    while True:
+        feeds = {trusted_value_key(feed): feed for feed in get_feeds() if uses_trusted_value_cache(feed)}
+        feeds.pop(None, None)
+        results = await asyncio.gather(*(fetch_trusted_value(feed) for feed in feeds.values()), return_exceptions=True)
+        for key, result in zip(feeds, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Unable to prefetch trusted value for query id {key[0]}: {result}")
+        await asyncio.sleep(interval)
+
+
 def get_contract_info(chain_id: int, name: str) -> Tuple[Optional[str], Optional[str]]:
     """Get the contract address and ABI for the given chain ID."""
 
@@ -300,7 +480,10 @@ def get_contract_info(chain_id: int, name: str) -> Tuple[Optional[str], Optional
 
 
 def get_contract(cfg: TelliotConfig, account: ChainedAccount, name: str) -> Optional[Contract]:
-    """Build Contract object from abi and address"""
+    """Build Contract object from abi and address
+
+    Connects to the node and the contract, so async code calls it with rpc_call.
+    """
 
     chain_id = cfg.main.chain_id
     addr, abi = get_contract_info(chain_id, name)
@@ -340,9 +523,85 @@ def get_query_type(q: OracleQuery) -> str:
     return type(q).__name__
 
 
+def normalize_query_id(query_id: str) -> str:
+    """Lowercase a hex query id and strip its 0x prefix."""
+    query_id = query_id.lower()
+    return query_id[2:] if query_id.startswith("0x") else query_id
+
+
+@functools.lru_cache(maxsize=None)
+def get_catalog_index() -> Dict[str, Tuple[str, Optional[DataFeed[Any]]]]:
+    """Map the query ids of telliot's query catalog to their (tag, CATALOG_FEEDS entry).
+
+    Built on first use, once per process.
+    """
+    index: Dict[str, Tuple[str, Optional[DataFeed[Any]]]] = {}
+    for entry in query_catalog.find():
+        # query_catalog.find returns the first entry of a query id first
+        index.setdefault(normalize_query_id(entry.query_id), (entry.tag, CATALOG_FEEDS.get(entry.tag)))
+    return index
+
+
+def find_catalog_entry(query_id: str) -> Optional[Tuple[str, Optional[DataFeed[Any]]]]:
+    """Get the (tag, CATALOG_FEEDS entry) of a query id, with or without 0x prefix."""
+    return get_catalog_index().get(normalize_query_id(query_id))
+
+
+class MonitoredFeedIndex:
+    """Monitored feeds indexed by the query they match, for constant time lookup per report.
+
+    Feeds for one query are keyed by query id. Generic feeds, whose query
+    parameters are all None so that they have no query id, are keyed by
+    query type and match any report of that type. The feeds are shared and
+    must not be modified, see MonitoredFeed.for_report.
+    """
+
+    def __init__(self, monitored_feeds: Optional[List[MonitoredFeed]]) -> None:
+        self.by_query_id: Dict[str, MonitoredFeed] = {}
+        self.by_query_type: Dict[str, MonitoredFeed] = {}
+
+        for mf in monitored_feeds or []:
+            try:
+                feed_qid = HexBytes(mf.feed.query.query_id).hex()
+            except Exception as e:
+                if are_all_attributes_none(mf.feed.query):
+                    self.by_query_type[get_query_type(mf.feed.query)] = mf
+                else:
+                    logger.error(f"Error while assembling query id for {mf.feed.query.descriptor}: {e}")
+                continue
+            self.by_query_id[feed_qid] = mf
+
+    def __len__(self) -> int:
+        return len(self.by_query_id) + len(self.by_query_type)
+
+    def find(self, query_id: str) -> Optional[MonitoredFeed]:
+        """Get the feed monitoring a query id, like "0x..."."""
+        return self.by_query_id.get(query_id)
+
+    def find_generic(self, query_type: str) -> Optional[MonitoredFeed]:
+        """Get the generic feed monitoring a query type, if any."""
+        return self.by_query_type.get(query_type)
+
+    def datafeeds(self) -> List[DataFeed[Any]]:
+        """Get the feeds reports of the monitored query ids are checked against."""
+        feeds = []
+        for mf in self.by_query_id.values():
+            if get_query_type(mf.feed.query) == "SpotPrice" and mf.datafeed_query_tag is not None:
+                feed = CATALOG_FEEDS.get(mf.datafeed_query_tag)
+            else:
+                feed = mf.feed
+            if feed is not None:
+                feeds.append(feed)
+        return feeds
+
+    def is_monitored(self, query_id: str, query_type: str) -> bool:
+        """Check if reports of a query are monitored for auto-disputing."""
+        return query_id in self.by_query_id or query_type in self.by_query_type
+
+
 def mk_filter(
-    from_block: int, to_block: Union[str, int], addr: str, topics: list[str]
-) -> dict[str, Union[int, str, list[str]]]:
+    from_block: int, to_block: Union[str, int], addr: Union[str, list[str]], topics: list[Any]
+) -> dict[str, Union[int, str, list[Any]]]:
     """Create a dict with the given parameters."""
     return {
         "fromBlock": from_block,
@@ -352,27 +611,213 @@ def mk_filter(
     }
 
 
-async def log_loop(web3: Web3, chain_id: int, addr: str, topics: list[str]) -> list[tuple[int, Any]]:
-    """Generate a list of recent events from a contract."""
+@dataclass
+class EventSource:
+    """An event to ingest from one contract on every chain it is deployed to.
+
+    The contract address is looked up in the telliot contract directory by
+    contract_name, unless chain_addy maps chain ids to explicit addresses.
+    """
+
+    topic: str
+    contract_name: Optional[str] = None
+    chain_addy: Optional[Dict[int, str]] = None
+
+    def address(self, chain_id: int) -> Optional[str]:
+        if self.chain_addy is not None:
+            return self.chain_addy.get(chain_id)
+        addr, _ = get_contract_info(chain_id, self.contract_name)
+        return addr
+
+
+def is_range_too_large_error(msg: str) -> bool:
+    """Check if an eth_getLogs error means the requested block range was too wide."""
+    msg = msg.lower()
+    if "too many requests" in msg:
+        return False
+    return any(
+        hint in msg
+        for hint in (
+            "query returned more than",
+            "more than 10000 results",
+            "block range",
+            "range is too large",
+            "limit exceeded",
+            "response size",
+            "timed out",
+            "timeout",
+        )
+    )
+
+
+class BlockRangeWalker:
+    """Walk a block range in chunks whose size adapts to what the RPC accepts.
+
+    A chunk is halved each time the provider rejects it as too large (or times
+    out) and doubled again after two consecutive successful chunks, bounded by
+    LOG_CHUNK_MIN_SIZE and LOG_CHUNK_MAX_SIZE. The size is kept between walks
+    so a chain's next tick starts from what last worked.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = log_chunk_size,
+        min_chunk_size: int = log_chunk_min_size,
+        max_chunk_size: int = log_chunk_max_size,
+    ) -> None:
+        self.min_chunk_size = max(min_chunk_size, 1)
+        self.max_chunk_size = max(max_chunk_size, self.min_chunk_size)
+        self.chunk_size = min(max(chunk_size, self.min_chunk_size), self.max_chunk_size)
+        self._successes = 0
+
+    def shrink(self) -> bool:
+        """Halve the chunk size, return False if it is already at the minimum."""
+        self._successes = 0
+        if self.chunk_size <= self.min_chunk_size:
+            return False
+        self.chunk_size = max(self.chunk_size // 2, self.min_chunk_size)
+        return True
+
+    def grow(self) -> None:
+        self._successes += 1
+        if self._successes >= 2:
+            self._successes = 0
+            self.chunk_size = min(self.chunk_size * 2, self.max_chunk_size)
+
+    async def walk(
+        self, get_logs: Callable[[int, int], Awaitable[List[Any]]], from_block: int, to_block: int
+    ) -> AsyncIterator[Tuple[int, int, List[Any]]]:
+        """Yield (chunk_from, chunk_to, logs) for consecutive chunks of [from_block, to_block].
+
+        Errors other than an oversized range, or an oversized range at the
+        minimum chunk size, are raised to the caller; chunks already yielded
+        stay yielded.
+        """
+        chunk_from = from_block
+        while chunk_from <= to_block:
+            chunk_to = min(chunk_from + self.chunk_size - 1, to_block)
+            try:
+                logs = await get_logs(chunk_from, chunk_to)
+            except Exception as e:
+                if is_range_too_large_error(str(e)) and self.shrink():
+                    logger.info(
+                        f"eth_getLogs rejected blocks {chunk_from}-{chunk_to}, "
+                        f"retrying with chunks of {self.chunk_size} blocks: {e}"
+                    )
+                    continue
+                raise
+            self.grow()
+            yield chunk_from, chunk_to, logs
+            chunk_from = chunk_to + 1
+
+
+range_walkers: Dict[int, BlockRangeWalker] = {}
+
+
+@dataclass
+class EventBatch:
+    """Events of one block range chunk of a chain, one list of (chain_id, log) per topic."""
+
+    chain_id: int
+    to_block: int
+    sources: list[tuple[str, str]]
+    event_lists: List[List[tuple[int, Any]]]
+    # logs the node reported as removed by a reorg
+    removed: List[tuple[int, Any]] = field(default_factory=list)
+    # logs that were already handed over to an alert and then reorged out
+    retracted: List[tuple[int, Any]] = field(default_factory=list)
+    # False for pushed logs that arrived before a scan reached the block their
+    # subscription went live at: the blocks before them may not be read yet
+    covered: bool = True
+
+    def commit(self) -> None:
+        """Checkpoint the chunk once its events have been fully processed."""
+        if not self.covered:
+            return
+        checkpoint_store.commit(
+            ((self.chain_id, addr, topic) for addr, topic in self.sources), self.to_block
+        )
+
+
+async def log_loop(
+    pool: RpcPool, chain_id: int, sources: list[tuple[str, str]]
+) -> AsyncIterator[EventBatch]:
+    """Generate recent events for all (address, topic) pairs of a chain.
+
+    A single eth_getLogs request per block range chunk covers every address and
+    every topic0 (OR-ed); logs are then split by topic, dropping address/topic
+    combinations that were not asked for. Events are yielded chunk by chunk and
+    start_block advances with each chunk, so a backfill that fails part way
+    resumes from the last chunk that landed. On the first scan of a chain the
+    range starts after the checkpoint left by a previous run.
+    """
     try:
-        block_number = web3.eth.get_block_number()
+        block_number = await pool.call(lambda w3: w3.eth.get_block_number())
     except Exception as e:
         if "server rejected" in str(e):
             logger.info(f"Attempted to connect to deprecated infura network. Please check configs! {e}")
         else:
             logger.warning(f"unable to retrieve latest block number from chain_id {chain_id}: {e}")
-        return []
-    from_block = start_block.get(chain_id, block_number - inital_block_offset)
-    from_block -= chain_reorg  # go back CHAIN_REORG more blocks to account for reorgs
-
-    if topics[0] == Topics.NEW_DISPUTE:
-        from_block = disputes_start_block.get(chain_id, block_number - inital_block_offset)
-        from_block -= chain_reorg
+        return
+    rewound = chain_id in rewound_chains
+    rewound_chains.discard(chain_id)
+    checkpoint = None
+    if chain_id not in start_block:
+        # resume from the last fully processed block of a previous run, if any
+        checkpoint = checkpoint_store.resume_block((chain_id, addr, topic) for addr, topic in sources)
+        if checkpoint is not None:
+            logger.info(f"Resuming chain_id {chain_id} from checkpointed block {checkpoint}")
+            start_block[chain_id] = checkpoint
+    if checkpoint is not None:
+        # the blocks up to the checkpoint were alerted on by the previous run, whose
+        # seen events are gone, so the reorg overlap would alert on them again
+        from_block = checkpoint + 1
+    elif rewound:
+        # the logs above start_block are pinned in seen_events, no overlap is needed
+        from_block = start_block[chain_id] + 1
+    else:
+        from_block = start_block.get(chain_id, block_number - inital_block_offset)
+        from_block -= chain_reorg  # go back CHAIN_REORG more blocks to account for reorgs
     from_block = max(from_block, 0)
-    event_filter = mk_filter(from_block, block_number, addr, topics)
+
+    wanted = {(Web3.toChecksumAddress(addr), topic) for addr, topic in sources}
+    addresses = list(dict.fromkeys(addr for addr, _ in wanted))
+    topics = list(dict.fromkeys(topic for _, topic in sources))
+
+    async def get_logs(chunk_from: int, chunk_to: int) -> List[Any]:
+        log_filter = mk_filter(chunk_from, chunk_to, addresses, [topics])
+        return await pool.call(lambda w3: w3.eth.get_logs(log_filter), hedge_after=log_hedge_delay)  # type: ignore
+
+    if chain_id not in range_walkers:
+        range_walkers[chain_id] = BlockRangeWalker()
+    walker = range_walkers[chain_id]
 
     try:
-        events = web3.eth.get_logs(event_filter)  # type: ignore
+        async for _, chunk_to, events in walker.walk(get_logs, from_block, block_number):
+            if chain_id in rewound_chains:
+                # a reorg was found below this chunk, stop here so the next scan starts from the rewound start_block
+                return
+            events_by_topic: dict[str, list[tuple[int, Any]]] = {topic: [] for topic in topics}
+            for event in events:
+                if not event.topics:
+                    continue
+                topic = Web3.toHex(event.topics[0])
+                if (Web3.toChecksumAddress(event.address), topic) not in wanted:
+                    continue
+                # skip logs re-read from the reorg overlap or already pushed by a subscription
+                if not seen_events.add(chain_id, event):
+                    continue
+                events_by_topic[topic].append((chain_id, event))
+            start_block[chain_id] = chunk_to
+            seen_events.evict(chain_id, chunk_to)
+            yield EventBatch(
+                chain_id=chain_id,
+                to_block=chunk_to,
+                sources=sources,
+                event_lists=[events_by_topic[topic] for topic in topics],
+            )
+        if chain_id not in rewound_chains:
+            seen_events.unpin(chain_id)
     except Exception as e:
         msg = str(e)
         if "unknown block" in msg:
@@ -383,103 +828,265 @@ async def log_loop(web3: Web3, chain_id: int, addr: str, topics: list[str]) -> l
             logger.info(f"Too many requests to node on chain_id {chain_id}")
         else:
             logger.error(f"unknown RPC error gathering eth event logs on chain_id {chain_id}\n {msg}")
-        return []
-
-    unique_events_list = []
-    for event in events:
-        if (chain_id, event) not in unique_events_list:
-            unique_events_list.append((chain_id, event))
-    start_block[chain_id] = block_number
-    if topics[0] == Topics.NEW_DISPUTE:
-        disputes_start_block[chain_id] = block_number
-    return unique_events_list
-
-
-async def chain_events(
-    cfg: TelliotConfig, chain_addy: dict[int, str], topics: list[list[str]]
-) -> List[List[tuple[int, Any]]]:
-    """"""
-    events_loop = []
-    for topic in topics:
-        for chain_id, address in chain_addy.items():
-            try:
-                endpoint = get_endpoint(cfg, chain_id)
-                if not endpoint: continue
-                if endpoint.url.endswith("{INFURA_API_KEY}"):
-                    continue
-                endpoint.connect()
-                w3 = endpoint.web3
-            except (IndexError, ValueError) as e:
-                logger.error(f"Unable to connect to endpoint on chain_id {chain_id}: {e}")
-                continue
-            events_loop.append(log_loop(w3, chain_id, address, topic))
-    events: List[List[tuple[int, Any]]] = await asyncio.gather(*events_loop)
 
-    return events
 
-async def get_events(cfg: TelliotConfig, contract_name: str, topics: list[str]) -> List[List[tuple[int, Any]]]:
-    """Get all events from all live Fetch networks"""
+async def get_events(
+    cfg: TelliotConfig, sources: List[EventSource], skip_chain_ids: Optional[set[int]] = None
+) -> AsyncIterator[EventBatch]:
+    """Get all events from all live Fetch networks
 
-    endpoints = []
+    Every chain, except those in skip_chain_ids, is scanned once per call for
+    all of its sources. Chains are
+    walked concurrently and each fetched block range chunk is yielded as an
+    EventBatch as soon as it lands; call EventBatch.commit once its events
+    are processed to checkpoint the chunk.
+    """
+
+    chain_ids = []
     for endpoint in cfg.endpoints.endpoints:
         if endpoint.url.endswith("{INFURA_API_KEY}"): continue
 
         chain_id = endpoint.chain_id
+        if skip_chain_ids and chain_id in skip_chain_ids: continue
+        if chain_id in chain_ids: continue
 
-        handle_connect_endpoint(endpoint, chain_id)
+        chain_ids.append(chain_id)
 
-        connected_endpoint = connected_endpoints[chain_id]
-        if connected_endpoint is None: continue
+    log_loops = []
+    for chain_id in chain_ids:
+        pool = get_rpc_pool(cfg, chain_id)
 
-        endpoints.append(endpoint)
+        if pool is None: continue
 
-    log_loops = []
-    for endpoint in endpoints:
-        w3 = endpoint.web3
+        chain_sources = []
+        for source in sources:
+            addr = source.address(chain_id)
+            if not addr: continue
+            chain_sources.append((addr, source.topic))
 
-        chain_id = endpoint.chain_id
+        if not chain_sources: continue
+
+        log_loops.append(log_loop(pool, chain_id, chain_sources))
+
+    queue: asyncio.Queue = asyncio.Queue()
 
-        if not w3: continue
+    async def drain(chain_log_loop: AsyncIterator[EventBatch]) -> None:
+        try:
+            async for batch in chain_log_loop:
+                await queue.put(batch)
+        finally:
+            await queue.put(None)
 
-        addr, _ = get_contract_info(chain_id, contract_name)
+    tasks = [asyncio.create_task(drain(chain_log_loop)) for chain_log_loop in log_loops]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            batch = await queue.get()
+            if batch is None:
+                remaining -= 1
+                continue
+            yield batch
+    finally:
+        for task in tasks:
+            task.cancel()
 
-        if not addr: continue
 
-        log_loops.append(log_loop(w3, chain_id, addr, topics))
+def pool_block_fetcher(cfg: TelliotConfig, chain_id: int) -> FetchBlocks:
+    """Fetch blocks of chain_id for the block cache through the chain's endpoint pool.
 
-    events_lists: List[List[tuple[int, Any]]] = await asyncio.gather(*log_loops)
+    Each block is fetched with RpcPool.call, off the event loop, rate limited
+    and failing over between the chain's ranked endpoints.
+    """
+
+    def get_block(w3: Web3, block_id: BlockId, full_transactions: bool) -> Any:
+        try:
+            return w3.eth.get_block(block_id, full_transactions)
+        except BlockNotFound:
+            return None
+        except ExtraDataLengthError:
+            # for poa chains get_block method throws an error if poa middleware is not injected
+            if geth_poa_middleware not in w3.middleware_onion:
+                w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+            return w3.eth.get_block(block_id, full_transactions)
+
+    async def fetch_blocks(block_ids: List[BlockId], full_transactions: bool) -> List[Any]:
+        pool = get_rpc_pool(cfg, chain_id)
+        if pool is None:
+            raise ConnectionError(f"no connected endpoint for chain_id {chain_id}")
+        return await asyncio.gather(*(
+            pool.call(lambda w3, block_id=block_id: get_block(w3, block_id, full_transactions))
+            for block_id in block_ids
+        ))
+
+    return fetch_blocks
+
+
+async def release_confirmed_events(cfg: TelliotConfig, batch: EventBatch, head: int) -> EventBatch:
+    """Release the pending events of batch's chain that are confirmed at head.
+
+    Events reorged out are dropped and start_block is rewound below them, so
+    the next scan reads the blocks that replaced them; a scan of the chain
+    still running stops at its next chunk instead of moving start_block on. The returned batch is
+    checkpointed just below the oldest event still pending.
+    """
+    chain_id = batch.chain_id
+    fetch_blocks = pool_block_fetcher(cfg, chain_id)
 
-    return events_lists
+    async def block_hash(block_number: int) -> bytes:
+        # deep enough blocks come from the block cache, nearer ones are fetched
+        block, = await block_cache.get_blocks(chain_id, [block_number], fetch_blocks)
+        return block.hash
 
+    try:
+        release = await pending_events.release(chain_id, head, block_hash)
+    except Exception as e:
+        logger.warning(f"unable to check block hashes of pending events on chain_id {chain_id}: {e}")
+        release = Release()
 
-def get_query_from_data(query_data: bytes) -> Optional[Union[AbiQuery, JsonQuery]]:
+    for event in release.orphaned + release.retracted:
+        logger.warning(
+            f"event in tx {event.transactionHash.hex()} on chain_id {chain_id} was reorged out "
+            f"of block {event.blockNumber}"
+        )
+        start_block[chain_id] = min(start_block.get(chain_id, event.blockNumber), event.blockNumber - 1)
+        # the canonical logs from here on stay seen, so the rescan doesn't ingest them again
+        seen_events.pin(chain_id, event.blockNumber)
+        rewound_chains.add(chain_id)
+
+    topics = list(dict.fromkeys(topic for _, topic in batch.sources))
+    to_block = batch.to_block
+    oldest_pending = pending_events.oldest_block(chain_id)
+    if oldest_pending is not None:
+        to_block = min(to_block, oldest_pending - 1)
+
+    return EventBatch(
+        chain_id=chain_id,
+        to_block=to_block,
+        sources=batch.sources,
+        event_lists=[
+            [(chain_id, event) for event in release.confirmed if Web3.toHex(event.topics[0]) == topic]
+            for topic in topics
+        ],
+        retracted=[(chain_id, event) for event in release.retracted],
+        covered=batch.covered,
+    )
+
+
+async def confirm_events(cfg: TelliotConfig, batches: AsyncIterator[EventBatch]) -> AsyncIterator[EventBatch]:
+    """Hold back ingested events until they have enough confirmations.
+
+    Events are released CONFIRMATIONS blocks deep, or ALERT_CONFIRMATIONS deep
+    for events that only raise alerts, once their block hash is checked to
+    still be canonical. Logs removed by a reorg are dropped while pending, or
+    passed on as retracted if an alert was already sent for them. Chains with
+    events still pending once batches are exhausted are checked against their
+    current head.
+    """
+    last_batches: Dict[int, EventBatch] = {}
+    heads: Dict[int, int] = {}
+    async for batch in batches:
+        chain_id = batch.chain_id
+        retracted = []
+        for _, event in batch.removed:
+            pending = pending_events.remove(chain_id, event)
+            if pending is not None and pending.released:
+                retracted.append((chain_id, event))
+        for event_list in batch.event_lists:
+            for _, event in event_list:
+                topic = Web3.toHex(event.topics[0])
+                pending_events.add(chain_id, event, alert_only=topic in alert_only_topics)
+
+        last_batches[chain_id] = batch
+        heads[chain_id] = max(heads.get(chain_id, 0), batch.to_block)
+        confirmed = await release_confirmed_events(cfg, batch, heads[chain_id])
+        confirmed.retracted = retracted + confirmed.retracted
+        yield confirmed
+
+    for chain_id, batch in last_batches.items():
+        if not pending_events.pending(chain_id):
+            continue
+        pool = get_rpc_pool(cfg, chain_id)
+        if pool is None:
+            continue
+        try:
+            head = await pool.call(lambda w3: w3.eth.get_block_number())
+        except Exception as e:
+            logger.warning(f"unable to retrieve latest block number from chain_id {chain_id}: {e}")
+            continue
+        if head <= heads[chain_id]:
+            continue
+        yield await release_confirmed_events(cfg, batch, head)
+
+
+@dataclass(frozen=True)
+class DecodedQueryData:
+    """A report's queryData decoded once, see decode_query_data.
+
+    params are the (name, value) pairs of the query parameters, None when
+    they can't be decoded (error says why).
+    """
+
+    query: Optional[Union[AbiQuery, JsonQuery]]
+    query_type: Optional[str]
+    params: Optional[Tuple[Tuple[str, Any], ...]]
+    error: Optional[str] = None
+
+
+@functools.lru_cache(maxsize=query_data_cache_size)
+def decode_query_data(query_data: bytes) -> DecodedQueryData:
+    """Decode queryData into its query, query type and parameters.
+
+    Oracles report the same queryData over and over, so results are kept in
+    an LRU cache of QUERY_DATA_CACHE_SIZE entries. The cached query is shared
+    and must not be modified.
+    """
+    query = None
     for q_type in (JsonQuery, AbiQuery):
         try:
-            return q_type.get_query_from_data(query_data)
+            query = q_type.get_query_from_data(query_data)
+            break
         except ValueError:
             pass
-    return None
-
+    query_type = get_query_type(query) if query is not None else None
 
-def get_source_from_data(query_data: bytes) -> Optional[DataSource]:
-    """Recreate data source using query type thats decoded from query data field"""
     try:
         query_type, encoded_param_values = eth_abi.decode_abi(["string", "bytes"], query_data)
     except OverflowError:
-        logger.error("OverflowError while decoding query data.")
-        return None
+        return DecodedQueryData(query, query_type, None, "OverflowError while decoding query data.")
+    except Exception as e:
+        return DecodedQueryData(query, query_type, None, f"Unable to decode query data: {e}")
     try:
         cls = Registry.registry[query_type]
     except KeyError:
-        logger.error(f"Unsupported query type: {query_type}")
-        return None
+        return DecodedQueryData(query, query_type, None, f"Unsupported query type: {query_type}")
     params_abi = cls.abi
     param_names = [p["name"] for p in params_abi]
     param_types = [p["type"] for p in params_abi]
-    param_values = eth_abi.decode_abi(param_types, encoded_param_values)
+    try:
+        param_values = eth_abi.decode_abi(param_types, encoded_param_values)
+    except Exception as e:
+        return DecodedQueryData(query, query_type, None, f"Unable to decode {query_type} query parameters: {e}")
+    return DecodedQueryData(query, query_type, tuple(zip(param_names, param_values)))
+
+
+def get_query_from_data(query_data: bytes) -> Optional[Union[AbiQuery, JsonQuery]]:
+    return decode_query_data(bytes(query_data)).query
+
+
+def get_source_from_data(query_data: bytes) -> Optional[DataSource]:
+    """Recreate data source using query type thats decoded from query data field"""
+    decoded = decode_query_data(bytes(query_data))
+    if decoded.params is None:
+        logger.error(decoded.error)
+        return None
+    feed = DATAFEED_BUILDER_MAPPING.get(decoded.query_type)
+    if feed is None:
+        logger.error(f"No datafeed builder for query type: {decoded.query_type}")
+        return None
 
-    source = DATAFEED_BUILDER_MAPPING[query_type].source
-    for key, value in zip(param_names, param_values):
+    # a fresh source per call, the builder's source is a shared template
+    source = copy.copy(feed.source)
+    for key, value in decoded.params:
         setattr(source, key, value)
     return source
 
@@ -488,23 +1095,10 @@ async def parse_new_dispute_event(
     log: LogReceipt
 ) -> Optional[NewDispute]:
     chain_id = cfg.main.chain_id
-    endpoint = get_endpoint(cfg, chain_id)
 
     new_dispute = NewDispute()
 
-    if not endpoint:
-        logger.error(f"Unable to find a suitable endpoint for chain_id {chain_id}")
-        return None
-    
-    try:
-        endpoint.connect()
-        w3 = endpoint.web3
-    except ValueError as e:
-        logger.error(f"Unable to connect to endpoint on chain_id {chain_id}: {e}")
-        return None
-    
-    codec = w3.codec
-    event_data = get_event_data(codec, NEW_DISPUTE_ABI, log)
+    event_data = new_dispute_decoder.decode(log)
 
     new_dispute.tx_hash = event_data.transactionHash.hex()
     new_dispute.chain_id = chain_id
@@ -526,34 +1120,23 @@ async def parse_new_report_event(
     cfg: TelliotConfig,
     log: LogReceipt,
     confidence_threshold: float,
-    monitored_feeds: List[MonitoredFeed],
+    monitored_feeds: Union[List[MonitoredFeed], MonitoredFeedIndex],
     managed_feeds,
     displayed_events: set[str],
     see_all_values: bool = False,
     skip_processed_reports: bool = False
 ) -> Optional[NewReport]:
-    """Parse a NewReport event."""
+    """Parse a NewReport event.
+
+    monitored_feeds is best passed as the MonitoredFeedIndex of the disputer
+    config; a list of feeds is indexed on every call.
+    """
 
     chain_id = cfg.main.chain_id
 
     new_report = NewReport()
 
-    endpoint = get_endpoint(cfg, chain_id)
-
-    if not endpoint:
-        logger.error(f"Unable to find a suitable endpoint for chain_id {chain_id}")
-        return None
-    else:
-
-        try:
-            endpoint.connect()
-            w3 = endpoint.web3
-        except ValueError as e:
-            logger.error(f"Unable to connect to endpoint on chain_id {chain_id}: {e}")
-            return None
-
-        codec = w3.codec
-        event_data = get_event_data(codec, NEW_REPORT_ABI, log)
+    event_data = new_report_decoder.decode(log)
 
     q = get_query_from_data(event_data.args._queryData)
 
@@ -581,50 +1164,40 @@ async def parse_new_report_event(
 
     # if query of event matches a query type of the monitored feeds, fill the query parameters
 
-    monitored_feed = None
-    query_tag = None
-
-    for mf in monitored_feeds:
-        try:
-            feed_qid = HexBytes(mf.feed.query.query_id).hex()
-        except Exception as e:
-            logger.error(f"Error while assembling query id for {mf.feed.query.descriptor}: {e}")
-            feed_qid = None
-
-        try:
-            feed_qtag = mf.datafeed_query_tag
-        except Exception as e:
-            logger.error(f"Error while assembling query tag for {mf}: {e}")
-            feed_qtag = None
-
-        if feed_qid is None:
-            if get_query_type(mf.feed.query) == new_report.query_type:
-                # for generic queries the query params are None
-                if are_all_attributes_none(mf.feed.query):
-                    source = get_source_from_data(event_data.args._queryData)
-                    if source is None:
-                        logger.error(f"Unable to form source from queryData of query type {new_report.query_type}")
-                        return None
-                    mf.feed = DataFeed(query=q, source=source)
-                    monitored_feed = mf
-
-        if feed_qid == new_report.query_id:
-            if new_report.query_type == "SpotPrice":
-                catalog_entry = query_catalog.find(query_id=new_report.query_id)
-                query_tag = catalog_entry[0].tag if feed_qtag is None else feed_qtag
-                mf.feed = CATALOG_FEEDS.get(query_tag)
+    if not isinstance(monitored_feeds, MonitoredFeedIndex):
+        monitored_feeds = MonitoredFeedIndex(monitored_feeds)
 
-            else:
-
-                source = get_source_from_data(event_data.args._queryData)
+    query_tag = None
 
-                if source is None:
-                    logger.error(f"Unable to form source from queryData of query type {new_report.query_type}")
+    monitored_feed = None
+    mf = monitored_feeds.find(new_report.query_id)
+    if mf is not None:
+        if new_report.query_type == "SpotPrice":
+            query_tag = mf.datafeed_query_tag
+            if query_tag is None:
+                catalog_entry = find_catalog_entry(new_report.query_id)
+                if catalog_entry is None:
+                    logger.error(f"No catalog entry for monitored SpotPrice query id {new_report.query_id}")
                     return None
-
-                mf.feed = DataFeed(query=q, source=source)
-
-            monitored_feed = mf
+                query_tag, catalog_feed = catalog_entry
+            else:
+                catalog_feed = CATALOG_FEEDS.get(query_tag)
+            monitored_feed = mf.for_report(catalog_feed)
+        else:
+            source = get_source_from_data(event_data.args._queryData)
+            if source is None:
+                logger.error(f"Unable to form source from queryData of query type {new_report.query_type}")
+                return None
+            monitored_feed = mf.for_report(DataFeed(query=q, source=source))
+    else:
+        # for generic queries the query params are None
+        mf = monitored_feeds.find_generic(new_report.query_type)
+        if mf is not None:
+            source = get_source_from_data(event_data.args._queryData)
+            if source is None:
+                logger.error(f"Unable to form source from queryData of query type {new_report.query_type}")
+                return None
+            monitored_feed = mf.for_report(DataFeed(query=q, source=source))
 
     if new_report.query_type in ALWAYS_ALERT_QUERY_TYPES:
         new_report.status_str = "❗❗❗❗ VERY IMPORTANT DATA SUBMISSION ❗❗❗❗"
@@ -639,10 +1212,9 @@ async def parse_new_report_event(
 
         # build a monitored feed for all feeds not auto-disputing for
         threshold = Threshold(metric=Metrics.Percentage, amount=confidence_threshold)
-        catalog = query_catalog.find(query_id=new_report.query_id)
-        if catalog:
-            query_tag = catalog[0].tag
-            feed = CATALOG_FEEDS.get(query_tag)
+        catalog_entry = find_catalog_entry(new_report.query_id)
+        if catalog_entry:
+            query_tag, feed = catalog_entry
             if feed is None:
                 logger.error(f"Unable to find feed for tag {query_tag}")
                 return None
@@ -678,7 +1250,7 @@ async def parse_new_report_event(
         new_report.status_str = disputable_str(False, new_report.query_id)
         new_report.disputable = False
         removable = await managed_feeds.is_report_removable(
-            monitored_feed, new_report.query_id, cfg, new_report.value
+            monitored_feed, new_report.query_id, cfg, new_report.value, new_report.submission_timestamp
         )
         logger.info(f"Removable: {removable}")
         new_report.removable = removable
@@ -696,7 +1268,7 @@ async def parse_new_report_event(
         
         return new_report
 
-    disputable = await monitored_feed.is_disputable(cfg, new_report.value)
+    disputable = await monitored_feed.is_disputable(cfg, new_report.value, new_report.submission_timestamp)
     if disputable is None:
 
         if see_all_values:
@@ -723,49 +1295,31 @@ async def parse_new_report_event(
         return new_report
 
 
-def get_block_number_at_timestamp(cfg: TelliotConfig, timestamp: int) -> Optional[int]:
+async def get_block_number_at_timestamp(cfg: TelliotConfig, timestamp: int) -> Optional[int]:
+    """Get the last block at or before timestamp on cfg's main chain, looked up in the block index.
 
+    Blocks are fetched through the chain's endpoint pool, see pool_block_fetcher.
+    """
+    chain_id = cfg.main.chain_id
+    fetch_blocks = pool_block_fetcher(cfg, chain_id)
     try:
-        endpoint = cfg.get_endpoint()
-        endpoint.connect()
-    except ValueError as e:
-        logger.error(f"Unable to connect to endpoint on chain_id {cfg.main.chain_id}: {e}")
+        return await block_index.find_block(
+            chain_id, timestamp, lambda block_ids: block_cache.get_blocks(chain_id, block_ids, fetch_blocks)
+        )
+    except Exception as e:
+        logger.error(f"Unable to find the block at timestamp {timestamp} on chain_id {chain_id}: {e}")
         return None
 
-    w3 = endpoint.web3
-
-    current_block = w3.eth.block_number
-    start_block = 0
-    end_block = current_block
-
-    while start_block <= end_block:
-        midpoint = math.floor((start_block + end_block) / 2)
-        # for poa chains get_block method throws an error if poa middleware is not injected
-        try:
-            block = w3.eth.get_block(midpoint)
-        except ExtraDataLengthError:
-            w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-            block = w3.eth.get_block(midpoint)
-
-        if block.timestamp == timestamp:
-            return midpoint
-        elif block.timestamp < timestamp:
-            start_block = midpoint + 1
-        else:
-            end_block = midpoint - 1
-
-    # If we haven't found an exact match, interpolate between adjacent blocks
-    block_a = w3.eth.get_block(end_block)
-    block_b = w3.eth.get_block(start_block)
-
-    block_delta = block_b.number - block_a.number
-    timestamp_delta = block_b.timestamp - block_a.timestamp
-    target_delta = timestamp - block_a.timestamp
+def cfg_for_chain(cfg: TelliotConfig, chain_id: int) -> TelliotConfig:
+    """Get a copy of cfg with its own main chain id, sharing the endpoints.
 
-    estimated_block_delta = target_delta * block_delta / timestamp_delta
-    estimated_block_number = block_a.number + estimated_block_delta
-
-    return int(estimated_block_number)
+    For tasks running concurrently, which would otherwise switch
+    cfg.main.chain_id under each other.
+    """
+    chain_cfg = copy.copy(cfg)
+    chain_cfg.main = copy.copy(cfg.main)
+    chain_cfg.main.chain_id = chain_id
+    return chain_cfg
 
 def get_w3(cfg: TelliotConfig, chain_id: int) -> Optional[Web3]:
     endpoint = get_endpoint(cfg, chain_id)
@@ -775,21 +1329,29 @@ def get_w3(cfg: TelliotConfig, chain_id: int) -> Optional[Web3]:
     return endpoint.web3
 
 async def get_fetch_balance(cfg: TelliotConfig, address: str) -> Optional[Decimal]:
-    w3 = get_w3(cfg, int(os.getenv("NETWORK_ID", "943")))
-
-    fetch_token = get_contract(cfg, name="fetch-token", account=None)
-    fetch_balance, status = await fetch_token.read("balanceOf", Web3.toChecksumAddress(address))
+    w3 = await rpc_call(get_w3, cfg, int(os.getenv("NETWORK_ID", "943")))
 
-    if not status.ok:
-        logger.error(f"Unable to retrieve {address} account balance")
-        return None
+    fetch_token = await rpc_call(get_contract, cfg, name="fetch-token", account=None)
+    call_data = fetch_token.contract.encodeABI(fn_name="balanceOf", args=[Web3.toChecksumAddress(address)])
+    # balance polling yields to event scans and disputes on a busy endpoint;
+    # concurrent polls for several reporters share one batch request
+    with priority(Priority.BACKGROUND):
+        try:
+            result = await rpc_batch_call(
+                w3, "eth_call", [{"to": fetch_token.address, "data": call_data}, "latest"]
+            )
+            fetch_balance = w3.codec.decode_single("uint256", HexBytes(result))
+        except Exception as e:
+            logger.error(f"Unable to retrieve {address} account balance: {e}")
+            return None
 
     fetch_balance = Decimal(w3.fromWei(fetch_balance, 'ether'))
     
     return fetch_balance
 
 async def get_pls_balance(cfg: TelliotConfig, address: str) -> Optional[Decimal]:
-    w3 = get_w3(cfg, int(os.getenv("NETWORK_ID", "943")))
-    balance_wei = w3.eth.getBalance(address)
+    w3 = await rpc_call(get_w3, cfg, int(os.getenv("NETWORK_ID", "943")))
+    with priority(Priority.BACKGROUND):
+        balance_wei = await rpc_batch_call(w3, "eth_getBalance", [Web3.toChecksumAddress(address), "latest"])
     balance = Decimal(w3.fromWei(balance_wei, 'ether'))
-    return balance
\ No newline at end of file
+    return balance
@@ -16,6 +16,8 @@ from fetch_disputables.utils import NewReport, NewDispute
 from fetch_disputables.handle_connect_endpoint import get_endpoint
 from fetch_disputables.utils import get_tx_explorer_url
 from fetch_disputables.data import parse_new_dispute_event
+from fetch_disputables.rpc import rpc_await
+from fetch_disputables.rpc import rpc_call
 
 logger = get_logger(__name__)
 
@@ -29,15 +31,7 @@ async def dispute(
         logger.info("Currently not auto-dispuing on any feeds. See ./disputer-config.yaml")
         return ""
     
-    disputable_query_ids = []
-    for feed in disp_cfg.monitored_feeds:
-        try:
-            disputable_query_id = feed.feed.query.query_id.hex()
-        except Exception:
-            pass
-        disputable_query_ids.append(disputable_query_id)
-
-    meant_to_dispute = new_report.query_id[2:] in disputable_query_ids
+    meant_to_dispute = disp_cfg.feed_index.is_monitored(new_report.query_id, new_report.query_type)
 
     if not meant_to_dispute:
         logger.info(
@@ -51,20 +45,21 @@ async def dispute(
         return ""
     
     try:
-        endpoint = get_endpoint(cfg, new_report.chain_id)
+        # connecting and checking endpoints blocks on the node
+        endpoint = await rpc_call(get_endpoint, cfg, new_report.chain_id)
         if not endpoint: raise ValueError
     except ValueError:
         logger.error(f"Unable to dispute: can't find an endpoint on chain id {new_report.chain_id}")
         return ""
     
     try:
-        endpoint.connect()
+        await rpc_call(endpoint.connect)
     except ValueError:
         logger.error(f"Unable to dispute: can't connect to endpoint on chain id {new_report.chain_id}")
         return ""
     w3 = endpoint.web3
-    token = get_contract(cfg, name="fetch-token", account=account)
-    governance = get_contract(cfg, name="fetch-governance", account=account)
+    token = await rpc_call(get_contract, cfg, name="fetch-token", account=account)
+    governance = await rpc_call(get_contract, cfg, name="fetch-governance", account=account)
 
     if token is None:
         logger.error(f"Unable to find token contract on chain_id {new_report.chain_id}")
@@ -75,7 +70,7 @@ async def dispute(
         return ""
     
     # read balance of user and log it
-    user_token_balance, status = await token.read("balanceOf", Web3.toChecksumAddress(account.address))
+    user_token_balance, status = await rpc_await(token.read("balanceOf", Web3.toChecksumAddress(account.address)))
 
     if not status.ok:
         logger.error("Unable to retrieve Disputer account balance")
@@ -99,20 +94,20 @@ async def dispute(
         return ""
     
     try:
-        acc_nonce = w3.eth.get_transaction_count(Web3.toChecksumAddress(account.address))
+        acc_nonce = await rpc_call(w3.eth.get_transaction_count, Web3.toChecksumAddress(account.address))
     except Exception as e:
         logger.error(f"Unable to dispute on chain_id {new_report.chain_id}: could not retrieve account nonce: {e}")
         return ""
     
     # write approve(governance contract, disputeFee) and log "token approved" if successful
-    tx_receipt, status = await token.write(
+    tx_receipt, status = await rpc_await(token.write(
         "approve",
         spender=governance.address,
         amount=dispute_fee * 100,
         gas_limit=60000,
-        legacy_gas_price=get_gas_price(w3, gas_multiplier),
+        legacy_gas_price=await get_gas_price(w3, gas_multiplier),
         acc_nonce=acc_nonce,
-    )
+    ))
 
     if not status.ok:
         logger.error(f"unable to approve tokens on chain_id {new_report.chain_id} for dispute fee: " + status.error)
@@ -128,7 +123,7 @@ async def dispute(
     try:
         msg = f"Unable to estimate gas usage for dispute on chain_id {new_report.chain_id}:"
         # Estimate gas usage amount
-        gas_limit: int = begin_dispute_tx.estimateGas({"from": Web3.toChecksumAddress(account.address)})
+        gas_limit: int = await rpc_call(begin_dispute_tx.estimateGas, {"from": Web3.toChecksumAddress(account.address)})
     except ContractLogicError as e:
         logger.error(f"{msg} {e}")
         return ""
@@ -136,14 +131,14 @@ async def dispute(
         logger.error(f"{msg} {e}")
         return ""
     
-    tx_receipt, status = await governance.write(
+    tx_receipt, status = await rpc_await(governance.write(
         func_name="beginDispute",
         _queryId=new_report.query_id,
         _timestamp=new_report.submission_timestamp,
         gas_limit=int(gas_limit * 1.2),
-        legacy_gas_price=get_gas_price(w3, gas_multiplier),
+        legacy_gas_price=await get_gas_price(w3, gas_multiplier),
         acc_nonce=acc_nonce + 1,
-    )
+    ))
 
     if not status.ok:
         logger.error(
@@ -171,7 +166,7 @@ async def dispute(
     logger.info("Dispute Tx Link: " + dispute_tx_link)
     return new_dispute
 
-def get_gas_price(web3, gas_multiplier) -> Optional[float]:
+async def get_gas_price(web3, gas_multiplier) -> Optional[float]:
     """Fetches the current gas price from an EVM network and returns
     an adjusted gas price.
 
@@ -180,7 +175,7 @@ def get_gas_price(web3, gas_multiplier) -> Optional[float]:
         None if the gas price could not be retrieved.
     """
     try:
-        price = web3.eth.gas_price
+        price = await rpc_call(lambda: web3.eth.gas_price)
         priceGwei = web3.fromWei(price, "gwei")
     except Exception as e:
         logger.error(f"Error fetching gas price: {e}")
@@ -192,8 +187,8 @@ def get_gas_price(web3, gas_multiplier) -> Optional[float]:
 async def get_dispute_fee(cfg: TelliotConfig, new_report: NewReport) -> Optional[int]:
     """Calculate dispute fee on a Fetch network"""
 
-    governance = get_contract(cfg, name="fetch-governance", account=None)
-    oracle = get_contract(cfg, name="fetchflex-oracle", account=None)
+    governance = await rpc_call(get_contract, cfg, name="fetch-governance", account=None)
+    oracle = await rpc_call(get_contract, cfg, name="fetchflex-oracle", account=None)
 
     if governance is None:
         logger.error(f"Unable to find governance contract on chain_id {new_report.chain_id}")
@@ -204,13 +199,13 @@ async def get_dispute_fee(cfg: TelliotConfig, new_report: NewReport) -> Optional
         return None
 
     # simple dispute fee
-    dispute_fee, status = await governance.read(func_name="getDisputeFee")
+    dispute_fee, status = await rpc_await(governance.read(func_name="getDisputeFee"))
 
     if not status.ok:
         logger.error(f"Unable to retrieve Dispute Fee on chain_id {new_report.chain_id}")
         return None
 
-    vote_rounds, status = await governance.read("getVoteRounds", _hash=new_report.query_id)
+    vote_rounds, status = await rpc_await(governance.read("getVoteRounds", _hash=new_report.query_id))
 
     if not status.ok:
         logger.error(
@@ -219,9 +214,9 @@ async def get_dispute_fee(cfg: TelliotConfig, new_report: NewReport) -> Optional
 
     if len(vote_rounds) == 1:
         # dispute fee with open disputes on the ID
-        open_disputes_on_id, status = await governance.read(
+        open_disputes_on_id, status = await rpc_await(governance.read(
             func_name="getOpenDisputesOnId", _queryId=new_report.query_id
-        )
+        ))
 
         if not status.ok:
             logger.error(
@@ -235,7 +230,7 @@ async def get_dispute_fee(cfg: TelliotConfig, new_report: NewReport) -> Optional
         multiplier = len(vote_rounds) - 1 if len(vote_rounds) > 0 else 0
         dispute_fee = dispute_fee * 2 ** (multiplier)
 
-    stake_amount, status = await oracle.read(func_name="getStakeAmount")
+    stake_amount, status = await rpc_await(oracle.read(func_name="getStakeAmount"))
 
     if not status.ok:
         logger.error(f"Unable to retrieve Stake Amount on chain_id {new_report.chain_id}")
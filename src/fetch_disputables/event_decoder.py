@@ -0,0 +1,94 @@
+"""Decoding of NewReport and NewDispute logs with decoders built once per event ABI.
+
+web3's get_event_data re-derives the ABI types, topic layout and decoders of
+an event for every log it decodes, and needs a connected Web3 instance for
+its codec. The decoders here are prepared at import and need no endpoint.
+"""
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from eth_abi.decoding import ContextFramesBytesIO
+from eth_abi.registry import registry
+from eth_utils import event_abi_to_log_topic
+from eth_utils import hexstr_if_str
+from eth_utils import to_bytes
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from web3.exceptions import LogTopicError
+from web3.exceptions import MismatchedABI
+from web3.types import LogReceipt
+
+from fetch_disputables import NEW_DISPUTE_ABI
+from fetch_disputables import NEW_REPORT_ABI
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _normalizer(abi_type: str) -> Callable[[Any], Any]:
+    """Get the normalizer web3 applies to decoded values of a type (checksummed addresses)."""
+    return to_checksum_address if abi_type == "address" else _identity
+
+
+class EventDecoder:
+    """Decode the logs of one event ABI like web3's get_event_data does."""
+
+    def __init__(self, event_abi: Dict[str, Any]) -> None:
+        self.name: str = event_abi["name"]
+        self.anonymous: bool = event_abi.get("anonymous", False)
+        self.topic = HexBytes(event_abi_to_log_topic(event_abi))
+
+        indexed_inputs = [i for i in event_abi["inputs"] if i["indexed"]]
+        data_inputs = [i for i in event_abi["inputs"] if not i["indexed"]]
+
+        self._topic_names: List[str] = [i["name"] for i in indexed_inputs]
+        self._topic_decoders = [registry.get_decoder(i["type"]) for i in indexed_inputs]
+        self._topic_normalizers = [_normalizer(i["type"]) for i in indexed_inputs]
+
+        self._data_names: List[str] = [i["name"] for i in data_inputs]
+        self._data_decoder = registry.get_decoder(f"({','.join(i['type'] for i in data_inputs)})")
+        self._data_normalizers = [_normalizer(i["type"]) for i in data_inputs]
+
+    def decode(self, log: LogReceipt) -> AttributeDict:
+        """Decode a log into an AttributeDict of its args and log fields."""
+        topics = log["topics"]
+        if not self.anonymous:
+            if not topics:
+                raise MismatchedABI("Expected non-anonymous event to have 1 or more topics")
+            if HexBytes(topics[0]) != self.topic:
+                raise MismatchedABI(f"The event signature did not match the {self.name} ABI")
+            topics = topics[1:]
+        if len(topics) != len(self._topic_decoders):
+            raise LogTopicError(f"Expected {len(self._topic_decoders)} log topics.  Got {len(topics)}")
+
+        args = {}
+        for name, decoder, normalize, topic in zip(
+            self._topic_names, self._topic_decoders, self._topic_normalizers, topics
+        ):
+            args[name] = normalize(decoder(ContextFramesBytesIO(HexBytes(topic))))
+
+        data = hexstr_if_str(to_bytes, log["data"])
+        values = self._data_decoder(ContextFramesBytesIO(data))
+        for name, normalize, value in zip(self._data_names, self._data_normalizers, values):
+            args[name] = normalize(value)
+
+        return AttributeDict(
+            {
+                "args": AttributeDict(args),
+                "event": self.name,
+                "logIndex": log["logIndex"],
+                "transactionIndex": log["transactionIndex"],
+                "transactionHash": log["transactionHash"],
+                "address": log["address"],
+                "blockHash": log["blockHash"],
+                "blockNumber": log["blockNumber"],
+            }
+        )
+
+
+new_report_decoder = EventDecoder(NEW_REPORT_ABI)
+new_dispute_decoder = EventDecoder(NEW_DISPUTE_ABI)
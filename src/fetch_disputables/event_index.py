@@ -0,0 +1,180 @@
+"""Bookkeeping of ingested event logs across ticks."""
+import heapq
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+EventKey = Tuple[int, bytes, int]  # (chain_id, blockHash, logIndex)
+
+
+class SeenEventIndex:
+    """Remember which logs were already ingested, until they can't be fetched again.
+
+    Logs are keyed on (chain_id, blockHash, logIndex), so the same log
+    re-read by an overlapping scan or pushed by a subscription is recognised
+    in O(1), whatever its topic. A log is forgotten once its block falls more
+    than reorg_depth blocks behind the highest block ingested for its chain:
+    no later scan starts that far back, so memory stays proportional to the
+    reorg window instead of growing with uptime.
+    """
+
+    def __init__(self, reorg_depth: int = 0) -> None:
+        self.reorg_depth = max(reorg_depth, 0)
+        self._seen: Dict[EventKey, int] = {}
+        self._heights: Dict[int, List[Tuple[int, EventKey]]] = {}
+        self._head: Dict[int, int] = {}
+        self._pinned: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    @staticmethod
+    def key(chain_id: int, event: Any) -> EventKey:
+        return chain_id, bytes(event.blockHash), int(event.logIndex)
+
+    def add(self, chain_id: int, event: Any) -> bool:
+        """Record a log, return False if it was already seen."""
+        key = self.key(chain_id, event)
+        if key in self._seen:
+            return False
+        block_number = int(event.blockNumber)
+        self._seen[key] = block_number
+        heapq.heappush(self._heights.setdefault(chain_id, []), (block_number, key))
+        if block_number > self._head.get(chain_id, -1):
+            self._head[chain_id] = block_number
+            self.evict(chain_id, block_number)
+        return True
+
+    def pin(self, chain_id: int, block_number: int) -> None:
+        """Keep the logs of chain_id from block_number on until unpin, however far the head moves."""
+        self._pinned[chain_id] = min(self._pinned.get(chain_id, block_number), block_number)
+
+    def unpin(self, chain_id: int) -> None:
+        self._pinned.pop(chain_id, None)
+
+    def evict(self, chain_id: int, head: int) -> None:
+        """Forget logs of chain_id deeper than the reorg window below head."""
+        heights = self._heights.get(chain_id)
+        if not heights:
+            return
+        floor = head - self.reorg_depth
+        if chain_id in self._pinned:
+            floor = min(floor, self._pinned[chain_id])
+        while heights and heights[0][0] < floor:
+            _, key = heapq.heappop(heights)
+            self._seen.pop(key, None)
+
+
+@dataclass
+class PendingEvent:
+    event: Any
+    alert_only: bool
+    # alert-only events are handed over at the alert depth, then kept until
+    # the full depth to notice if they are reorged out afterwards
+    released: bool = False
+
+
+@dataclass
+class Release:
+    """Outcome of ReorgBuffer.release for one chain."""
+
+    confirmed: List[Any] = field(default_factory=list)
+    # reorged out before being handed over, never acted on
+    orphaned: List[Any] = field(default_factory=list)
+    # reorged out after being handed over to an alert-only path
+    retracted: List[Any] = field(default_factory=list)
+
+
+class ReorgBuffer:
+    """Hold ingested logs per chain until enough blocks are built on top of them.
+
+    A log is handed over once its block is `confirmations` blocks deep, or
+    `alert_confirmations` deep for logs that only raise alerts, and only if
+    its block hash is still the canonical one at that height. Logs whose block
+    was reorged out are dropped (or reported as retracted when an alert was
+    already sent for them) instead of reaching evaluation and disputes.
+    """
+
+    def __init__(self, confirmations: int = 0, alert_confirmations: int = 0) -> None:
+        self.confirmations = max(confirmations, 0)
+        self.alert_confirmations = min(max(alert_confirmations, 0), self.confirmations)
+        self._pending: Dict[int, Dict[EventKey, PendingEvent]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(pending) for pending in self._pending.values())
+
+    def pending(self, chain_id: int) -> int:
+        """Get the number of logs of chain_id still held back or awaiting their final check."""
+        return len(self._pending.get(chain_id, {}))
+
+    def add(self, chain_id: int, event: Any, alert_only: bool = False) -> None:
+        self._pending.setdefault(chain_id, {}).setdefault(
+            SeenEventIndex.key(chain_id, event), PendingEvent(event, alert_only)
+        )
+
+    def remove(self, chain_id: int, event: Any) -> Optional[PendingEvent]:
+        """Drop a log reported as removed by the node, return its pending entry if any."""
+        return self._pending.get(chain_id, {}).pop(SeenEventIndex.key(chain_id, event), None)
+
+    def oldest_block(self, chain_id: int) -> Optional[int]:
+        """Get the lowest block with a log not yet handed over, None if there is none."""
+        blocks = [
+            int(pending.event.blockNumber)
+            for pending in self._pending.get(chain_id, {}).values()
+            if not pending.released
+        ]
+        return min(blocks) if blocks else None
+
+    def _depth(self, pending: PendingEvent) -> int:
+        if pending.alert_only and not pending.released:
+            return self.alert_confirmations
+        return self.confirmations
+
+    async def release(
+        self, chain_id: int, head: int, block_hash: Callable[[int], Awaitable[bytes]]
+    ) -> Release:
+        """Hand over the logs of chain_id that are deep enough below head.
+
+        block_hash(block_number) gets the canonical block hash at a height; it
+        is only called for heights with logs to check, once per height, and
+        not at all for a depth of 0. If it raises, the logs stay pending.
+        """
+        release = Release()
+        pending_events = self._pending.get(chain_id, {})
+        due = [
+            (key, pending)
+            for key, pending in pending_events.items()
+            if head - int(pending.event.blockNumber) >= self._depth(pending)
+        ]
+        due.sort(key=lambda item: (int(item[1].event.blockNumber), int(item[1].event.logIndex)))
+
+        # look up every hash before touching the buffer, so a failed lookup loses nothing
+        canonical: Dict[int, bytes] = {}
+        for _, pending in due:
+            block_number = int(pending.event.blockNumber)
+            if self._depth(pending) > 0 and block_number not in canonical:
+                canonical[block_number] = bytes(await block_hash(block_number))
+
+        for key, pending in due:
+            block_number = int(pending.event.blockNumber)
+            if self._depth(pending) > 0:
+                if canonical[block_number] != bytes(pending.event.blockHash):
+                    del pending_events[key]
+                    (release.retracted if pending.released else release.orphaned).append(pending.event)
+                    continue
+            if pending.released:
+                # final check of an alert-only log passed, nothing left to hand over
+                del pending_events[key]
+                continue
+            release.confirmed.append(pending.event)
+            if pending.alert_only and self.alert_confirmations < self.confirmations:
+                pending.released = True
+            else:
+                del pending_events[key]
+        return release
@@ -1,10 +1,26 @@
+import asyncio
 import logging
-from collections import defaultdict
+import os
+import time
+from collections import deque
 from logging.handlers import RotatingFileHandler
+from typing import Callable
+from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Set
+from typing import TypeVar
 
 from telliot_core.apps.telliot_config import TelliotConfig
 from telliot_core.model.endpoints import RPCEndpoint
+from web3 import Web3
+
+from fetch_disputables.rpc import add_rate_limit
+from fetch_disputables.rpc import is_rate_limit_error
+from fetch_disputables.rpc import rpc_call
+
+from dotenv import load_dotenv
+load_dotenv()
 
 def get_logger(name: str) -> logging.Logger:
     log_format = "%(asctime)s | %(levelname)-7s | %(name)s | %(message)s"
@@ -18,41 +34,269 @@ def get_logger(name: str) -> logging.Logger:
 
 logger = get_logger(__name__)
 
-connected_endpoints: dict[int, RPCEndpoint] = defaultdict(lambda: None)
+T = TypeVar("T")
+
+endpoint_health_ttl = float(os.getenv("ENDPOINT_HEALTH_TTL", 60))
+endpoint_probe_interval = float(os.getenv("ENDPOINT_PROBE_INTERVAL", 20))
+
+rpc_stats_window = int(os.getenv("RPC_STATS_WINDOW", 100))
+rpc_rate_limit_cooldown = float(os.getenv("RPC_RATE_LIMIT_COOLDOWN", 30))
+
+
+def is_request_error(e: Exception) -> bool:
+    """Check if an error is the node rejecting the request itself rather than failing to serve it.
+
+    web3 raises JSON-RPC error responses (invalid params, too many results,
+    reverts) as ValueError; another endpoint would answer the same.
+    """
+    return isinstance(e, ValueError) and not is_rate_limit_error(e)
+
+
+class EndpointStats:
+    """Latency and error rate of the last calls through one endpoint."""
+
+    def __init__(self, window: int = rpc_stats_window) -> None:
+        self.latencies: deque = deque(maxlen=window)
+        # 1 for a failed call, 0 for a successful one
+        self.failures: deque = deque(maxlen=window)
+        self.cooldown_until = 0.0
+        self.healthy_at: Optional[float] = None
+        self.down = False
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.latencies.append(latency)
+        self.failures.append(0 if ok else 1)
+        if ok:
+            self.healthy_at = time.monotonic()
+        else:
+            # check the connection again on the next lookup
+            self.healthy_at = None
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(0.5)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(0.99)
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.failures) / len(self.failures) if self.failures else 0.0
+
+    def score(self) -> float:
+        """Expected cost of a call, lower is better; unmeasured endpoints score 0 to get tried."""
+        return (self.p50 + self.p99) / 2 / max(1 - self.error_rate, 0.01)
+
+    def is_healthy(self) -> bool:
+        return self.healthy_at is not None and time.monotonic() - self.healthy_at < endpoint_health_ttl
+
+
+class RpcPool:
+    """The endpoints of one chain, ranked by their recent latency and error rate.
+
+    Calls go to the best ranked endpoint and fail over to the next ones.
+    Endpoints answering "Too Many Requests" are rotated out for
+    RPC_RATE_LIMIT_COOLDOWN seconds, and endpoints found disconnected are
+    left out until probe_endpoints sees them back.
+    """
 
-def handle_connect_endpoint(endpoint: RPCEndpoint, chain_id: int) -> None:
-    if chain_id in connected_endpoints and connected_endpoints[chain_id] is not None:
-        connected_endpoint = connected_endpoints[chain_id]
-        is_connected = connected_endpoint._web3.isConnected()
+    def __init__(self, chain_id: int, endpoints: List[RPCEndpoint]) -> None:
+        self.chain_id = chain_id
+        self.endpoints = list(endpoints)
+        self.stats: Dict[str, EndpointStats] = {endpoint.url: EndpointStats() for endpoint in self.endpoints}
 
-        if is_connected: return
+    def ranked(self) -> List[RPCEndpoint]:
+        """Get the connected endpoints, best first, rate limited ones only as a last resort."""
+        now = time.monotonic()
+        connected = [e for e in self.endpoints if e._web3 is not None and not self.stats[e.url].down]
+        ready = [e for e in connected if self.stats[e.url].cooldown_until <= now]
+        return sorted(ready or connected, key=lambda e: self.stats[e.url].score())
 
-        if not is_connected:
-            logger.info(f"endpoint {connected_endpoint.url} lost connection")
-            connected_endpoints[chain_id] = None
+    def best(self) -> Optional[RPCEndpoint]:
+        ranked = self.ranked()
+        return ranked[0] if ranked else None
 
+    def check(self, endpoint: RPCEndpoint) -> bool:
+        """Check an endpoint is connected, from the cached health when it is fresh.
+
+        A stale health is checked with the node, so async code looks endpoints
+        up off the event loop, with rpc_call(get_endpoint, ...).
+        """
+        stats = self.stats[endpoint.url]
+        if stats.is_healthy():
+            return True
+        try:
+            is_connected = endpoint._web3.isConnected()
+        except Exception:
+            is_connected = False
+        self.set_health(endpoint, is_connected)
+        return is_connected
+
+    def set_health(self, endpoint: RPCEndpoint, is_connected: bool) -> None:
+        stats = self.stats[endpoint.url]
+        if is_connected:
+            stats.healthy_at = time.monotonic()
+            stats.down = False
+        else:
+            stats.healthy_at = None
+            stats.down = True
+
+    async def _timed_call(self, endpoint: RPCEndpoint, fn: Callable[[Web3], T]) -> T:
+        stats = self.stats[endpoint.url]
+        start = time.monotonic()
+        try:
+            result = await rpc_call(fn, endpoint.web3)
+        except Exception as e:
+            stats.record(time.monotonic() - start, ok=is_request_error(e))
+            if is_rate_limit_error(e):
+                stats.cooldown_until = time.monotonic() + rpc_rate_limit_cooldown
+            raise
+        stats.record(time.monotonic() - start, ok=True)
+        return result
+
+    async def _hedged_call(
+        self,
+        fn: Callable[[Web3], T],
+        primary: RPCEndpoint,
+        backup: Optional[RPCEndpoint],
+        hedge_after: Optional[float],
+        tried: Set[str],
+    ) -> T:
+        first = asyncio.ensure_future(self._timed_call(primary, fn))
+        if backup is None or not hedge_after:
+            return await first
+        done, _ = await asyncio.wait({first}, timeout=hedge_after)
+        if done:
+            return first.result()
+
+        # the primary is slow, race it against the next best endpoint
+        tried.add(backup.url)
+        second = asyncio.ensure_future(self._timed_call(backup, fn))
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for task_left in pending:
+                        task_left.cancel()
+                    return task.result()
+                error = task.exception()
+        raise error  # type: ignore
+
+    async def call(self, fn: Callable[[Web3], T], hedge_after: Optional[float] = None) -> T:
+        """Run fn(web3) on the best endpoint, failing over to the next ones on errors.
+
+        Errors in the request itself (see is_request_error) are raised right
+        away, since failing over would not change the answer.
+
+        With hedge_after, a call still running after that many seconds is
+        sent to the next best endpoint as well and the first answer wins.
+        """
+        endpoints = self.ranked()
+        if not endpoints:
+            raise ConnectionError(f"no connected endpoint for chain_id {self.chain_id}")
+        tried: Set[str] = set()
+        error: Optional[Exception] = None
+        for endpoint in endpoints:
+            if endpoint.url in tried:
+                continue
+            tried.add(endpoint.url)
+            backup = next((e for e in endpoints if e.url not in tried), None)
+            try:
+                return await self._hedged_call(fn, endpoint, backup, hedge_after, tried)
+            except Exception as e:
+                if is_request_error(e):
+                    raise
+                logger.info(f"RPC call failed on {endpoint.url} for chain_id {self.chain_id}, failing over: {e}")
+                error = e
+        raise error  # type: ignore
+
+
+rpc_pools: Dict[int, RpcPool] = {}
+
+
+def get_rpc_pool(cfg: TelliotConfig, chain_id: int) -> Optional[RpcPool]:
+    """Get the endpoint pool of chain_id, None if no endpoint of the chain can connect.
+
+    Endpoints are connected the first time the pool is used, and again
+    whenever none of them is left connected.
+    """
+    if chain_id not in rpc_pools:
+        endpoints = [
+            endpoint
+            for endpoint in cfg.endpoints.find(chain_id=chain_id)
+            if not endpoint.url.endswith("{INFURA_API_KEY}")
+        ]
+        if not endpoints:
+            return None
+        rpc_pools[chain_id] = RpcPool(chain_id, endpoints)
+    pool = rpc_pools[chain_id]
+    if pool.ranked():
+        return pool
+
+    for endpoint in pool.endpoints:
+        handle_connect_endpoint(pool, endpoint)
+    if not pool.ranked():
+        logger.warning(f"unable to connect to endpoint for chain_id {chain_id}")
+        return None
+    return pool
+
+
+def handle_connect_endpoint(pool: RpcPool, endpoint: RPCEndpoint) -> bool:
+    """Connect an endpoint of a pool, or check it again if it was found disconnected."""
+    chain_id = pool.chain_id
+    was_down = pool.stats[endpoint.url].down
     try:
-        is_connected = endpoint.connect()
-        if not is_connected:
-            logger.warning(f"could not connect to {endpoint.url} for chain_id {chain_id}")
-            return
+        if endpoint._web3 is not None:
+            is_connected = endpoint._web3.isConnected()
+        else:
+            is_connected = endpoint.connect()
+    except Exception as e:
+        logger.warning(f"unable to connect to endpoint {endpoint.url} for chain_id {chain_id}: {e}")
+        is_connected = False
+    if is_connected:
+        add_rate_limit(endpoint.web3)
+    # only log changes, the prober calls this for every endpoint on every round
+    if is_connected and (was_down or pool.stats[endpoint.url].healthy_at is None):
         logger.info(f"Chain id {chain_id} connected to: {endpoint.url}")
-        connected_endpoints[chain_id] = endpoint
-    except ValueError as e:
-        logger.warning(f"unable to connect to endpoint for chain_id {chain_id}: {e}")
-        return
-    
+    elif not is_connected and not was_down:
+        logger.warning(f"could not connect to {endpoint.url} for chain_id {chain_id}")
+    pool.set_health(endpoint, is_connected)
+    return is_connected
+
+
 def get_endpoint(cfg: TelliotConfig, chain_id: int) -> Optional[RPCEndpoint]:
-    endpoints = cfg.endpoints.find(chain_id=chain_id)
-    for endpoint in endpoints:
-        chain_id = endpoint.chain_id
+    """Get the best ranked healthy endpoint of chain_id.
 
-        handle_connect_endpoint(endpoint, chain_id)
+    Health is cached (see ENDPOINT_HEALTH_TTL) and kept fresh by
+    probe_endpoints and by the outcome of calls through RpcPool.call, so
+    this only hits the node once the cached state went stale.
+    """
+    pool = get_rpc_pool(cfg, chain_id)
+    if pool is not None:
+        for endpoint in pool.ranked():
+            if pool.check(endpoint):
+                return endpoint
+    logger.warning(f"unable to connect to endpoint for chain_id {chain_id}")
+    return None
 
-        connected_endpoint = connected_endpoints[chain_id]
 
-        if connected_endpoint is None: continue
+async def probe_endpoints(interval: float = endpoint_probe_interval) -> None:
+    """Check every endpoint of every pool in the background, every interval seconds.
 
-        return connected_endpoint
-    logger.warning(f"unable to connect to endpoint for chain_id {chain_id}")
-    return None
\ No newline at end of file
+    Keeps the cached health fresh so get_endpoint doesn't need a round trip,
+    and brings endpoints that were found disconnected back into rotation.
+    """
+    while True:
+        for pool in list(rpc_pools.values()):
+            for endpoint in pool.endpoints:
+                await rpc_call(handle_connect_endpoint, pool, endpoint)
+        await asyncio.sleep(interval)
@@ -11,6 +11,8 @@ from fetch_disputables.handle_connect_endpoint import get_endpoint
 from fetch_disputables.utils import get_tx_explorer_url
 
 from fetch_disputables.disputer import get_gas_price
+from fetch_disputables.rpc import rpc_await
+from fetch_disputables.rpc import rpc_call
 
 logger = get_logger(__name__)
 
@@ -26,26 +28,27 @@ async def remove_report(
         return ""
     
     try:
-        endpoint = get_endpoint(cfg, new_report.chain_id)
+        # connecting and checking endpoints blocks on the node
+        endpoint = await rpc_call(get_endpoint, cfg, new_report.chain_id)
         if not endpoint: raise ValueError
     except ValueError:
         logger.error(f"Unable to remove value: can't find an endpoint on chain id {new_report.chain_id}")
         return ""
     
     try:
-        endpoint.connect()
+        await rpc_call(endpoint.connect)
     except ValueError:
         logger.error(f"Unable to remove value: can't connect to endpoint on chain id {new_report.chain_id}")
         return ""
     w3 = endpoint.web3
-    fetch_flex = get_contract(cfg, name="fetchflex-oracle", account=account)
+    fetch_flex = await rpc_call(get_contract, cfg, name="fetchflex-oracle", account=account)
 
     if fetch_flex is None:
         logger.error(f"Unable to find fetchflex-oracle contract on chain_id {new_report.chain_id}")
         return ""
     
     try:
-        acc_nonce = w3.eth.get_transaction_count(Web3.toChecksumAddress(account.address))
+        acc_nonce = await rpc_call(w3.eth.get_transaction_count, Web3.toChecksumAddress(account.address))
     except Exception as e:
         logger.error(f"Unable to remove value on chain_id {new_report.chain_id}: could not retrieve account nonce: {e}")
         return ""
@@ -58,7 +61,7 @@ async def remove_report(
 
     try:
         msg = f"Unable to estimate gas usage for remove value on chain_id {new_report.chain_id}:"
-        gas_limit: int = remove_value_tx.estimateGas({"from": Web3.toChecksumAddress(account.address)})
+        gas_limit: int = await rpc_call(remove_value_tx.estimateGas, {"from": Web3.toChecksumAddress(account.address)})
     except ContractLogicError as e:
         logger.error(f"{msg} {e}")
         return ""
@@ -66,14 +69,14 @@ async def remove_report(
         logger.error(f"{msg} {e}")
         return ""
     
-    tx_receipt, status = await fetch_flex.write(
+    tx_receipt, status = await rpc_await(fetch_flex.write(
         func_name="removeValue",
         _queryId=new_report.query_id,
         _timestamp=new_report.submission_timestamp,
         gas_limit=int(gas_limit * 1.2),
-        legacy_gas_price=get_gas_price(w3, gas_multiplier),
+        legacy_gas_price=await get_gas_price(w3, gas_multiplier),
         acc_nonce=acc_nonce,
-    )
+    ))
 
     if not status.ok:
         logger.error(
@@ -0,0 +1,139 @@
+"""Rolling statistics of recent reported values, to skip trusted value fetches for clearly fine reports."""
+import os
+import time
+from array import array
+from enum import Enum
+from statistics import median
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+
+from dotenv import load_dotenv
+load_dotenv()
+
+report_prefilter = os.getenv("REPORT_PREFILTER", "False").lower() in ("true", "1", "t")
+report_prefilter_window = int(os.getenv("REPORT_PREFILTER_WINDOW", 64))
+report_prefilter_min_samples = int(os.getenv("REPORT_PREFILTER_MIN_SAMPLES", 16))
+report_prefilter_fine_mads = float(os.getenv("REPORT_PREFILTER_FINE_MADS", 3))
+report_prefilter_bad_mads = float(os.getenv("REPORT_PREFILTER_BAD_MADS", 10))
+report_prefilter_tolerance = float(os.getenv("REPORT_PREFILTER_TOLERANCE", 0.5))
+report_prefilter_max_age = float(os.getenv("REPORT_PREFILTER_MAX_AGE", 300))
+report_prefilter_verify_every = int(os.getenv("REPORT_PREFILTER_VERIFY_EVERY", 8))
+
+# scales the MAD to the standard deviation of normally distributed values
+MAD_SCALE = 1.4826
+
+
+class ReportClass(Enum):
+    FINE = "fine"
+    SUSPICIOUS = "suspicious"
+    BAD = "bad"
+
+
+class ReportWindow:
+    """The last size values of one query, with the times they were recorded, in arrays."""
+
+    def __init__(self, size: int) -> None:
+        self.size = max(size, 1)
+        self.values = array("d")
+        self.times = array("d")
+        self._next = 0
+        # FINE classifications since the last value was added
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: float, timestamp: float) -> None:
+        if len(self.values) < self.size:
+            self.values.append(value)
+            self.times.append(timestamp)
+        else:
+            self.values[self._next] = value
+            self.times[self._next] = timestamp
+        self._next = (self._next + 1) % self.size
+        self.skipped = 0
+
+    def newest_time(self) -> float:
+        return max(self.times) if self.times else 0.0
+
+
+class ReportStats:
+    """Median and MAD of the recent verified values reported for each query.
+
+    A report is FINE if it is within fine_mads scaled MADs of the median and
+    within the given tolerance of it, BAD beyond bad_mads, and SUSPICIOUS
+    otherwise, or while there are fewer than min_samples values, or none
+    recorded within max_age seconds. Only values checked against a trusted
+    value should be recorded, so the median can't be dragged along by reports
+    that were never verified. To keep the median from freezing while all
+    reports are FINE, every verify_every-th report since the last recorded
+    value is SUSPICIOUS instead, so it gets verified (0 never forces one).
+    """
+
+    def __init__(
+        self,
+        window: int = report_prefilter_window,
+        min_samples: int = report_prefilter_min_samples,
+        fine_mads: float = report_prefilter_fine_mads,
+        bad_mads: float = report_prefilter_bad_mads,
+        max_age: float = report_prefilter_max_age,
+        verify_every: int = report_prefilter_verify_every,
+    ) -> None:
+        self.window = window
+        self.min_samples = max(min_samples, 1)
+        self.fine_mads = fine_mads
+        self.bad_mads = bad_mads
+        self.max_age = max_age
+        self.verify_every = verify_every
+        self._windows: Dict[Hashable, ReportWindow] = {}
+
+    def record(self, key: Hashable, value: float, timestamp: Optional[float] = None) -> None:
+        if key not in self._windows:
+            self._windows[key] = ReportWindow(self.window)
+        self._windows[key].add(float(value), time.time() if timestamp is None else timestamp)
+
+    def classify(
+        self,
+        key: Hashable,
+        value: float,
+        max_relative: Optional[float] = None,
+        max_absolute: Optional[float] = None,
+    ) -> ReportClass:
+        """Classify a reported value against the recent values of key.
+
+        max_relative and max_absolute bound the distance from the median of a
+        FINE value, as a fraction of the median and in value units.
+        """
+        window = self._windows.get(key)
+        if window is None or len(window) < self.min_samples:
+            return ReportClass.SUSPICIOUS
+        if time.time() - window.newest_time() > self.max_age:
+            return ReportClass.SUSPICIOUS
+
+        center = median(window.values)
+        spread = MAD_SCALE * median(abs(v - center) for v in window.values)
+        distance = abs(value - center)
+        if spread > 0:
+            score = distance / spread
+        else:
+            score = 0.0 if distance == 0 else float("inf")
+
+        if score >= self.bad_mads:
+            return ReportClass.BAD
+        if score > self.fine_mads:
+            return ReportClass.SUSPICIOUS
+        if max_relative is not None and distance > max_relative * abs(center):
+            return ReportClass.SUSPICIOUS
+        if max_absolute is not None and distance > max_absolute:
+            return ReportClass.SUSPICIOUS
+        if self.verify_every > 0 and window.skipped + 1 >= self.verify_every:
+            return ReportClass.SUSPICIOUS
+        window.skipped += 1
+        return ReportClass.FINE
+
+    def clear(self) -> None:
+        self._windows.clear()
+
+
+report_stats = ReportStats()
@@ -0,0 +1,78 @@
+"""Retrying coroutines with exponential backoff, without blocking the event loop."""
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+from typing import TypeVar
+
+from fetch_disputables.utils import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long to retry.
+
+    The n-th retry waits between half and all of base_delay * 2 ** (n - 1),
+    capped at max_delay, like the RPC backoff. deadline bounds the total
+    time spent, including the attempts themselves; None means no bound.
+    """
+
+    attempts: int = 3
+    base_delay: float = 1
+    max_delay: float = 60
+    deadline: Optional[float] = None
+
+    def delay(self, retry: int) -> float:
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+async def retry(
+    fn: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    retry_if: Callable[[T], bool] = lambda result: False,
+    description: str = "call",
+) -> T:
+    """Await fn() until it neither raises nor returns a result retry_if rejects.
+
+    Gives up after policy.attempts, or when the backoff would end after
+    policy.deadline, and then returns the last result or raises the last
+    exception. An attempt still running at the deadline is cancelled and
+    raises asyncio.TimeoutError. Cancelling the caller cancels the attempt
+    or backoff in progress.
+    """
+    started = time.monotonic()
+    attempts = max(policy.attempts, 1)
+    for attempt in range(1, attempts + 1):
+        error: Optional[Exception] = None
+        try:
+            if policy.deadline is None:
+                result = await fn()
+            else:
+                remaining = policy.deadline - (time.monotonic() - started)
+                result = await asyncio.wait_for(fn(), timeout=max(remaining, 0))
+        except Exception as e:
+            error = e
+            logger.warning(f"{description} attempt {attempt}/{attempts} failed: {e!r}")
+        else:
+            if not retry_if(result):
+                return result
+            logger.warning(f"{description} attempt {attempt}/{attempts} returned {result!r}")
+
+        delay = policy.delay(attempt)
+        out_of_time = policy.deadline is not None and time.monotonic() - started + delay >= policy.deadline
+        if attempt == attempts or out_of_time:
+            if out_of_time:
+                logger.warning(f"{description} gave up, no time left before the {policy.deadline}s deadline")
+            if error is not None:
+                raise error
+            return result
+        await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
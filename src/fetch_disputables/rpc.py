@@ -0,0 +1,337 @@
+"""Non-blocking access to the synchronous web3/telliot RPC calls.
+
+web3 5.x and telliot-core contracts only make blocking HTTP requests, even
+behind `async def`. Everything here runs those calls on a bounded thread pool
+so the event loop keeps serving other chains, evaluations and notification
+tasks while a request is in flight.
+
+Requests to each endpoint also go through a shared token bucket (see
+rate_limit_middleware), which lets the most urgent requests through first
+and backs off when the provider answers "Too Many Requests". Independent
+requests made concurrently can be coalesced into JSON-RPC batches with
+rpc_batch_call.
+"""
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any
+from typing import Callable
+from typing import Coroutine
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+from web3 import Web3
+from web3._utils.method_formatters import PYTHONIC_RESULT_FORMATTERS
+from web3._utils.request import make_post_request
+from web3.datastructures import AttributeDict
+from web3.providers.rpc import HTTPProvider
+
+from dotenv import load_dotenv
+load_dotenv()
+
+T = TypeVar("T")
+
+rpc_max_workers = int(os.getenv("RPC_MAX_WORKERS", 16))
+rpc_rate_limit = float(os.getenv("RPC_RATE_LIMIT", 20))
+rpc_rate_burst = float(os.getenv("RPC_RATE_BURST", 40))
+rpc_backoff_base = float(os.getenv("RPC_BACKOFF_BASE", 1))
+rpc_backoff_max = float(os.getenv("RPC_BACKOFF_MAX", 60))
+rpc_batch_max_size = int(os.getenv("RPC_BATCH_MAX_SIZE", 50))
+rpc_batch_flush_interval = float(os.getenv("RPC_BATCH_FLUSH_INTERVAL", 0.01))
+
+
+class Priority(IntEnum):
+    """Order in which requests waiting on a rate limited endpoint are let through."""
+
+    DISPUTE = 0
+    EVENTS = 1
+    BACKGROUND = 2
+
+
+rpc_priority: contextvars.ContextVar = contextvars.ContextVar("rpc_priority", default=Priority.EVENTS)
+
+_executor = ThreadPoolExecutor(max_workers=rpc_max_workers, thread_name_prefix="rpc")
+# dispute calls get their own threads, so requests waiting on the rate limiter
+# in the shared pool can't hold them up
+_priority_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rpc-priority")
+
+
+@contextmanager
+def priority(value: Priority) -> Iterator[None]:
+    """Send the RPC requests made in this block, in this task, with the given priority."""
+    token = rpc_priority.set(value)
+    try:
+        yield
+    finally:
+        rpc_priority.reset(token)
+
+
+async def rpc_call(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking RPC call, e.g. w3.eth.get_logs, on the RPC thread pool."""
+    loop = asyncio.get_running_loop()
+    executor = _priority_executor if rpc_priority.get() == Priority.DISPUTE else _executor
+    # carry the request priority over to the worker thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, functools.partial(context.run, fn, *args, **kwargs))
+
+
+async def rpc_await(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine that blocks on RPC internally on the RPC thread pool.
+
+    For telliot-core Contract.read/write, which are declared async but send
+    synchronous requests (and wait for receipts) without ever yielding.
+    """
+    return await rpc_call(asyncio.run, coro)
+
+
+def is_rate_limit_error(e: Any) -> bool:
+    msg = str(e).lower()
+    return any(hint in msg for hint in ("too many requests", "429 client error", "rate limit"))
+
+
+class TokenBucket:
+    """Thread-safe token bucket for the requests sent to one endpoint.
+
+    Refills at `rate` requests per second up to `burst`; a rate of 0 means
+    unlimited. Waiting requests are let through by Priority, so dispute
+    transactions overtake balance polling. After a "Too Many Requests" answer
+    every request waits out an exponential backoff with jitter, which resets
+    on the next successful request.
+    """
+
+    def __init__(self, rate: float = rpc_rate_limit, burst: float = rpc_rate_burst) -> None:
+        self.rate = max(rate, 0)
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._strikes = 0
+        self._waiting = {p: 0 for p in Priority}
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: Priority = Priority.EVENTS, cost: float = 1) -> None:
+        """Block until a request of the given priority may be sent.
+
+        cost is the number of calls the request carries, e.g. the size of a
+        JSON-RPC batch (capped to the burst size).
+        """
+        cost = min(max(cost, 1), self.burst)
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self.blocked_until - now
+                    if wait <= 0:
+                        overtaken = any(self._waiting[p] for p in Priority if p < priority)
+                        if self.rate == 0 and not overtaken:
+                            return
+                        if self.tokens >= cost and not overtaken:
+                            self.tokens -= cost
+                            return
+                        wait = (cost - self.tokens) / self.rate if self.rate and self.tokens < cost else 0.01
+                    self._cond.wait(timeout=max(wait, 0.001))
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def backoff(self) -> float:
+        """Hold all requests back after a rate limit answer, return the delay."""
+        with self._cond:
+            self._strikes += 1
+            ceiling = min(rpc_backoff_max, rpc_backoff_base * 2 ** (self._strikes - 1))
+            delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            return delay
+
+    def succeeded(self) -> None:
+        with self._cond:
+            self._strikes = 0
+
+
+_buckets: Dict[str, TokenBucket] = {}
+# connection checks, partly made synchronously from the event loop, must never wait on a backoff
+_unlimited_methods = {"web3_clientVersion", "net_version", "eth_chainId"}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(url: str) -> TokenBucket:
+    with _buckets_lock:
+        if url not in _buckets:
+            _buckets[url] = TokenBucket()
+        return _buckets[url]
+
+
+def rate_limit_middleware(make_request: Callable[[str, Any], Any], w3: Web3) -> Callable[[str, Any], Any]:
+    """web3 middleware sending every request through the bucket of the provider's endpoint."""
+    bucket = get_bucket(str(getattr(w3.provider, "endpoint_uri", w3.provider)))
+
+    def middleware(method: str, params: Any) -> Any:
+        if method in _unlimited_methods:
+            return make_request(method, params)
+        bucket.acquire(rpc_priority.get())
+        try:
+            response = make_request(method, params)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                bucket.backoff()
+            raise
+        if isinstance(response, dict) and is_rate_limit_error(response.get("error", "")):
+            bucket.backoff()
+        else:
+            bucket.succeeded()
+        return response
+
+    return middleware
+
+
+def add_rate_limit(w3: Web3) -> None:
+    """Rate limit the requests of a Web3 instance, once."""
+    if "rate_limit" not in w3.middleware_onion:
+        w3.middleware_onion.add(rate_limit_middleware, name="rate_limit")
+
+
+def format_result(method: str, result: Any) -> Any:
+    """Format a raw JSON-RPC result the way web3 returns it, e.g. ints and HexBytes in an AttributeDict."""
+    if result is None:
+        return None
+    formatter = PYTHONIC_RESULT_FORMATTERS.get(method)
+    if formatter is not None:
+        result = formatter(result)
+    return AttributeDict.recursive(result)
+
+
+class RpcBatcher:
+    """Coalesce independent JSON-RPC requests to one endpoint into batch requests.
+
+    Requests are queued for up to `flush_interval` seconds, or until
+    `max_size` are waiting, then sent as a single HTTP POST. Endpoints
+    that are not plain HTTP, or that refuse batches, get the requests one by
+    one through web3 instead.
+    """
+
+    def __init__(
+        self, w3: Web3, max_size: int = rpc_batch_max_size, flush_interval: float = rpc_batch_flush_interval
+    ) -> None:
+        self.w3 = w3
+        self.max_size = max(max_size, 1)
+        self.flush_interval = flush_interval
+        self._pending: List[Tuple[str, Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def request(self, method: str, params: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((method, params, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._send(batch))
+
+    async def _send(self, batch: List[Tuple[str, Any, asyncio.Future]]) -> None:
+        try:
+            results = await rpc_call(self._post, [(method, params) for method, params, _ in batch])
+        except Exception as e:
+            results = [(None, e)] * len(batch)
+        for (_, _, future), (result, error) in zip(batch, results):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _single(self, method: str, params: Any) -> Tuple[Any, Optional[Exception]]:
+        try:
+            return self.w3.manager.request_blocking(method, params), None
+        except Exception as e:
+            return None, e
+
+    def _post(self, requests: List[Tuple[str, Any]]) -> List[Tuple[Any, Optional[Exception]]]:
+        provider = self.w3.provider
+        if len(requests) == 1 or not isinstance(provider, HTTPProvider):
+            return [self._single(method, params) for method, params in requests]
+
+        bucket = get_bucket(str(provider.endpoint_uri))
+        bucket.acquire(rpc_priority.get(), cost=len(requests))
+        payload = [
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            for request_id, (method, params) in enumerate(requests)
+        ]
+        try:
+            raw_response = make_post_request(
+                provider.endpoint_uri, json.dumps(payload).encode(), **dict(provider.get_request_kwargs())
+            )
+        except Exception as e:
+            if is_rate_limit_error(e):
+                bucket.backoff()
+            raise
+        responses = json.loads(raw_response)
+        if not isinstance(responses, list):
+            # batches not supported by this endpoint
+            return [self._single(method, params) for method, params in requests]
+        bucket.succeeded()
+
+        responses_by_id = {response.get("id"): response for response in responses}
+        results: List[Tuple[Any, Optional[Exception]]] = []
+        for request_id, (method, _) in enumerate(requests):
+            response = responses_by_id.get(request_id)
+            if response is None:
+                results.append((None, ValueError(f"no response to batched {method} request")))
+            elif "error" in response:
+                if is_rate_limit_error(response["error"]):
+                    bucket.backoff()
+                results.append((None, ValueError(response["error"])))
+            else:
+                results.append((format_result(method, response.get("result")), None))
+        return results
+
+
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, RpcBatcher]]" = weakref.WeakKeyDictionary()
+
+
+def get_batcher(w3: Web3) -> RpcBatcher:
+    """Get the batcher of w3's endpoint for the running event loop."""
+    batchers = _batchers.setdefault(asyncio.get_running_loop(), {})
+    key = str(getattr(w3.provider, "endpoint_uri", id(w3)))
+    if key not in batchers:
+        batchers[key] = RpcBatcher(w3)
+    return batchers[key]
+
+
+async def rpc_batch_call(w3: Web3, method: str, params: Any) -> Any:
+    """Send a JSON-RPC request to w3's endpoint as part of the next batch.
+
+    Calls made concurrently, e.g. under asyncio.gather, share one HTTP
+    round trip. params are in JSON-RPC form (hex quantities); the result is
+    formatted like the matching web3 method's, with None for a missing block
+    or receipt instead of an exception.
+    """
+    return await get_batcher(w3).request(method, params)
@@ -0,0 +1,240 @@
+"""Push ingestion of NewReport/NewDispute logs through eth_subscribe on WebSocket endpoints."""
+import asyncio
+import json
+import time
+from typing import Any
+from typing import AsyncIterator
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import websockets
+from hexbytes import HexBytes
+from telliot_core.apps.telliot_config import TelliotConfig
+from web3 import Web3
+from web3.datastructures import AttributeDict
+
+from fetch_disputables.data import EventBatch
+from fetch_disputables.data import EventSource
+from fetch_disputables.data import confirm_events
+from fetch_disputables.data import get_events
+from fetch_disputables.data import rewound_chains
+from fetch_disputables.data import seen_events
+from fetch_disputables.data import start_block
+from fetch_disputables.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def format_log(log: Dict[str, Any]) -> AttributeDict:
+    """Format a raw JSON-RPC log like web3's eth.get_logs does."""
+    return AttributeDict(
+        {
+            "address": Web3.toChecksumAddress(log["address"]),
+            "topics": [HexBytes(topic) for topic in log["topics"]],
+            "data": log["data"],
+            "blockNumber": int(log["blockNumber"], 16),
+            "transactionHash": HexBytes(log["transactionHash"]),
+            "transactionIndex": int(log["transactionIndex"], 16),
+            "blockHash": HexBytes(log["blockHash"]),
+            "logIndex": int(log["logIndex"], 16),
+            "removed": log.get("removed", False),
+        }
+    )
+
+
+def is_ws_url(url: str) -> bool:
+    return url.startswith("ws://") or url.startswith("wss://")
+
+
+class LogSubscriber:
+    """Subscribe to logs on the WebSocket endpoints of the telliot endpoint config.
+
+    Each chain with a ws:// or wss:// endpoint gets a background task that
+    keeps an eth_subscribe("logs") open and queues one EventBatch per pushed
+    log. Every log after the head at the time the subscription went live is
+    pushed, so once a get_events scan has reached that block the range scan
+    skips the chain (see chains_to_skip), and pushed logs advance start_block
+    and the checkpoint. Until then they don't, so a restart or the next scan
+    still reads the blocks before them. On disconnect the next get_events
+    scan fills the gap from start_block or the last checkpoint, while the
+    subscription reconnects with exponential backoff.
+    """
+
+    def __init__(self, max_backoff: int = 60) -> None:
+        self.max_backoff = max_backoff
+        self.live_chain_ids: set[int] = set()
+        # count of successful subscriptions per chain, to tell reconnects apart
+        self.sessions: Dict[int, int] = {}
+        # head block when the current subscription of each chain went live
+        self.live_blocks: Dict[int, int] = {}
+        # highest block pushed per chain, whether covered by a scan or not
+        self.pushed_blocks: Dict[int, int] = {}
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, cfg: TelliotConfig, sources: List[EventSource]) -> int:
+        """Start a subscription task per WebSocket endpoint, return how many were started."""
+        subscribed_chain_ids = set()
+        for endpoint in cfg.endpoints.endpoints:
+            if not is_ws_url(endpoint.url):
+                continue
+            chain_id = endpoint.chain_id
+            if chain_id in subscribed_chain_ids:
+                continue
+            chain_sources = []
+            for source in sources:
+                addr = source.address(chain_id)
+                if not addr: continue
+                chain_sources.append((addr, source.topic))
+            if not chain_sources:
+                continue
+            logger.info(f"Subscribing to logs on chain_id {chain_id} through {endpoint.url}")
+            self._tasks.append(asyncio.create_task(self.run(endpoint.url, chain_id, chain_sources)))
+            subscribed_chain_ids.add(chain_id)
+        return len(self._tasks)
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self.live_chain_ids.clear()
+
+    async def run(self, url: str, chain_id: int, sources: list[tuple[str, str]]) -> None:
+        """Keep a subscription for chain_id open, reconnecting after failures."""
+        backoff = 1
+        while True:
+            try:
+                async for batch in self.subscribe(url, chain_id, sources):
+                    backoff = 1
+                    self.pushed_blocks[chain_id] = max(self.pushed_blocks.get(chain_id, 0), batch.to_block)
+                    if self.is_covered(chain_id):
+                        start_block[chain_id] = max(start_block.get(chain_id, 0), batch.to_block)
+                    else:
+                        batch.covered = False
+                    await self.queue.put(batch)
+                logger.warning(f"Log subscription closed on chain_id {chain_id}, falling back to polling")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Log subscription failed on chain_id {chain_id}, falling back to polling: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def subscribe(self, url: str, chain_id: int, sources: list[tuple[str, str]]) -> AsyncIterator[EventBatch]:
+        """Yield an EventBatch for every log pushed on one eth_subscribe connection."""
+        wanted = {(Web3.toChecksumAddress(addr), topic) for addr, topic in sources}
+        addresses = list(dict.fromkeys(addr for addr, _ in wanted))
+        topics = list(dict.fromkeys(topic for _, topic in sources))
+
+        async with websockets.connect(url) as ws:
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "eth_subscribe",
+                "params": ["logs", {"address": addresses, "topics": [topics]}],
+            }))
+            response = json.loads(await ws.recv())
+            if "error" in response:
+                raise ValueError(f"eth_subscribe rejected: {response['error']}")
+            subscription_id = response["result"]
+            # logs of blocks after the current head are pushed, those up to it must be scanned
+            self.live_blocks.pop(chain_id, None)
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "eth_blockNumber", "params": []}))
+            try:
+                async for message in ws:
+                    notification = json.loads(message)
+                    if notification.get("id") == 2:
+                        if "error" in notification:
+                            raise ValueError(f"eth_blockNumber failed: {notification['error']}")
+                        self.live_blocks[chain_id] = int(notification["result"], 16)
+                        self.sessions[chain_id] = self.sessions.get(chain_id, 0) + 1
+                        self.live_chain_ids.add(chain_id)
+                        continue
+                    params = notification.get("params", {})
+                    if params.get("subscription") != subscription_id:
+                        continue
+                    log = format_log(params["result"])
+                    if not log.topics:
+                        continue
+                    topic = Web3.toHex(log.topics[0])
+                    if (log.address, topic) not in wanted:
+                        continue
+                    if log.removed:
+                        # reorged out, retract it from the confirmation buffer
+                        yield EventBatch(
+                            chain_id=chain_id,
+                            to_block=log.blockNumber - 1,
+                            sources=sources,
+                            event_lists=[[] for _ in topics],
+                            removed=[(chain_id, log)],
+                        )
+                        continue
+                    if not seen_events.add(chain_id, log):
+                        continue
+                    yield EventBatch(
+                        chain_id=chain_id,
+                        to_block=log.blockNumber,
+                        sources=sources,
+                        event_lists=[[(chain_id, log)] if t == topic else [] for t in topics],
+                    )
+            finally:
+                self.live_chain_ids.discard(chain_id)
+                self.live_blocks.pop(chain_id, None)
+
+    def is_covered(self, chain_id: int) -> bool:
+        """Check if scans have read every block up to where the current subscription of chain_id went live.
+
+        A chain rewound after a reorg isn't covered until a scan picks up the rewind.
+        """
+        live_block = self.live_blocks.get(chain_id)
+        if chain_id in rewound_chains:
+            return False
+        return chain_id in self.live_chain_ids and live_block is not None and start_block.get(chain_id, -1) >= live_block
+
+    def chains_to_skip(self) -> set[int]:
+        """Get the chains a range scan can skip this tick.
+
+        A chain is only skipped once a scan has reached the block its current
+        subscription went live at, so logs emitted between the previous scan
+        and the subscription going live (or a reconnect) are still picked up.
+        """
+        return {chain_id for chain_id in self.live_chain_ids if self.is_covered(chain_id)}
+
+    async def batches(self, duration: float) -> AsyncIterator[EventBatch]:
+        """Yield pushed batches as they arrive, for duration seconds."""
+        deadline = time.monotonic() + duration
+        while True:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return
+            try:
+                batch = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return
+            yield batch
+
+
+async def ingest_events(
+    cfg: TelliotConfig, sources: List[EventSource], subscriber: Optional[LogSubscriber], wait: int
+) -> AsyncIterator[EventBatch]:
+    """Yield the confirmed events of one monitor tick.
+
+    Chains without a live subscription are range scanned; with a subscriber,
+    pushed events are then streamed for wait seconds instead of sleeping.
+    Events are held back until confirmed, see confirm_events.
+    """
+    async for batch in confirm_events(cfg, _ingest_events(cfg, sources, subscriber, wait)):
+        yield batch
+
+
+async def _ingest_events(
+    cfg: TelliotConfig, sources: List[EventSource], subscriber: Optional[LogSubscriber], wait: int
+) -> AsyncIterator[EventBatch]:
+    skip_chain_ids = subscriber.chains_to_skip() if subscriber is not None else set()
+    async for batch in get_events(cfg, sources, skip_chain_ids=skip_chain_ids):
+        yield batch
+    if subscriber is None:
+        return
+    async for batch in subscriber.batches(wait):
+        yield batch
@@ -0,0 +1,225 @@
+"""Trusted values shared by the reports of one query, and kept by the time they were fetched."""
+import asyncio
+import os
+import time
+from array import array
+from datetime import datetime
+from math import isnan
+from math import nan
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from dotenv import load_dotenv
+load_dotenv()
+
+trusted_value_max_age = float(os.getenv("TRUSTED_VALUE_MAX_AGE", 15))
+trusted_value_history_size = int(os.getenv("TRUSTED_VALUE_HISTORY_SIZE", 512))
+trusted_value_interpolate = os.getenv("TRUSTED_VALUE_INTERPOLATE", "False").lower() in ("true", "1", "t")
+
+Datapoint = Tuple[Any, Any]
+
+
+class TrustedValueCache:
+    """Datapoints fetched from trusted sources, reused within a time bucket.
+
+    A datapoint is kept for the time bucket of max_age seconds it was fetched
+    in, so several reporters submitting the same query within seconds cause
+    one fetch from the external APIs. Concurrent requests for a key share the
+    fetch in flight. Failed fetches, or datapoints without a value, are not
+    kept. A max_age of 0 disables caching.
+    """
+
+    def __init__(self, max_age: float = trusted_value_max_age) -> None:
+        self.max_age = max_age
+        self._datapoints: Dict[Hashable, Tuple[int, Datapoint]] = {}
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    def _bucket(self) -> int:
+        return int(time.time() // self.max_age)
+
+    def get_cached(self, key: Hashable) -> Optional[Datapoint]:
+        """Get the datapoint of key fetched in the current time bucket, if any."""
+        if self.max_age <= 0:
+            return None
+        entry = self._datapoints.get(key)
+        if entry is None or entry[0] != self._bucket():
+            return None
+        return entry[1]
+
+    def put(self, key: Hashable, datapoint: Datapoint) -> None:
+        if self.max_age <= 0 or datapoint is None or datapoint[0] is None:
+            return
+        bucket = self._bucket()
+        # drop datapoints of past buckets
+        self._datapoints = {k: entry for k, entry in self._datapoints.items() if entry[0] == bucket}
+        self._datapoints[key] = (bucket, datapoint)
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Datapoint]]) -> Datapoint:
+        """Get the datapoint of key, fetching it unless cached or already being fetched."""
+        datapoint = self.get_cached(key)
+        if datapoint is not None:
+            return datapoint
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(fetch())
+            self._in_flight[key] = in_flight
+
+            def done(future: asyncio.Future) -> None:
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+                if not future.cancelled() and future.exception() is None:
+                    self.put(key, future.result())
+
+            in_flight.add_done_callback(done)
+
+        # a waiter being cancelled doesn't cancel the fetch the others wait for
+        return await asyncio.shield(in_flight)
+
+    def clear(self) -> None:
+        self._datapoints.clear()
+
+
+trusted_values = TrustedValueCache()
+
+
+class SampleRing:
+    """Fixed-size ring of (timestamp, datapoint) samples in time order.
+
+    Timestamps, and values when they are floats, are kept in arrays, so
+    lookups by time are a binary search over the ring. Appending to a full
+    ring drops the oldest sample.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = max(size, 1)
+        self._times = array("d", [0.0]) * self.size
+        # float values, for interpolation, NaN otherwise
+        self._values = array("d", [nan]) * self.size
+        self._datapoints: List[Optional[Datapoint]] = [None] * self.size
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _slot(self, i: int) -> int:
+        return (self._start + i) % self.size
+
+    def time(self, i: int) -> float:
+        return self._times[self._slot(i)]
+
+    def datapoint(self, i: int) -> Datapoint:
+        return self._datapoints[self._slot(i)]  # type: ignore[return-value]
+
+    def append(self, timestamp: float, datapoint: Datapoint) -> bool:
+        """Add a sample newer than the others, return whether it was added."""
+        if self._count and timestamp < self.time(self._count - 1):
+            return False
+        if self._count == self.size:
+            slot = self._start
+            self._start = (self._start + 1) % self.size
+        else:
+            slot = self._slot(self._count)
+            self._count += 1
+        value = datapoint[0]
+        self._times[slot] = timestamp
+        self._values[slot] = value if isinstance(value, float) else nan
+        self._datapoints[slot] = datapoint
+        return True
+
+    def bisect(self, timestamp: float) -> int:
+        """Get the index of the first sample at or after timestamp (len if none)."""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.time(mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def nearest(self, timestamp: float, max_distance: float) -> Optional[Datapoint]:
+        """Get the datapoint sampled closest to timestamp, if within max_distance seconds of it."""
+        i = self.bisect(timestamp)
+        candidates = [j for j in (i - 1, i) if 0 <= j < self._count]
+        if not candidates:
+            return None
+        j = min(candidates, key=lambda j: abs(self.time(j) - timestamp))
+        if abs(self.time(j) - timestamp) > max_distance:
+            return None
+        return self.datapoint(j)
+
+    def interpolate(self, timestamp: float, max_distance: float) -> Optional[Datapoint]:
+        """Get the value at timestamp, linearly interpolated between the samples around it.
+
+        Falls back to nearest if there is no float sample within max_distance
+        seconds on both sides.
+        """
+        i = self.bisect(timestamp)
+        if 0 < i < self._count:
+            t0, t1 = self.time(i - 1), self.time(i)
+            v0, v1 = self._values[self._slot(i - 1)], self._values[self._slot(i)]
+            if timestamp - t0 <= max_distance and t1 - timestamp <= max_distance and not (isnan(v0) or isnan(v1)):
+                if t1 == t0:
+                    return self.datapoint(i)
+                return v0 + (v1 - v0) * (timestamp - t0) / (t1 - t0), None
+        return self.nearest(timestamp, max_distance)
+
+
+def datapoint_time(datapoint: Datapoint) -> float:
+    """Get the time a datapoint was fetched at, or now if it has no datetime."""
+    fetched_at = datapoint[1] if len(datapoint) > 1 else None
+    if isinstance(fetched_at, datetime):
+        return fetched_at.timestamp()
+    return time.time()
+
+
+class TrustedValueHistory:
+    """Recent datapoints per key, by the time they were fetched.
+
+    Filled by live fetches and the trusted value prefetcher, so a report can
+    be compared with the value of its own submission time when one was
+    fetched close enough to it, also during catch-up without refetching.
+    Keeps the latest max_samples per key in a SampleRing. With interpolate,
+    float values between two samples are interpolated linearly.
+    """
+
+    def __init__(
+        self, max_samples: int = trusted_value_history_size, interpolate: bool = trusted_value_interpolate
+    ) -> None:
+        self.max_samples = max_samples
+        self.interpolate = interpolate
+        self._samples: Dict[Hashable, SampleRing] = {}
+
+    def record(self, key: Hashable, datapoint: Datapoint, timestamp: Optional[float] = None) -> None:
+        """Add a fetched datapoint, at timestamp or else the time of the datapoint itself."""
+        if self.max_samples <= 0 or datapoint is None or datapoint[0] is None:
+            return
+        if timestamp is None:
+            timestamp = datapoint_time(datapoint)
+        if key not in self._samples:
+            self._samples[key] = SampleRing(self.max_samples)
+        # samples older than the newest one are ignored, to keep the ring in time order
+        self._samples[key].append(timestamp, datapoint)
+
+    def nearest(self, key: Hashable, timestamp: float, max_distance: float) -> Optional[Datapoint]:
+        """Get the datapoint at timestamp, from samples within max_distance seconds of it."""
+        samples = self._samples.get(key)
+        if samples is None:
+            return None
+        if self.interpolate:
+            return samples.interpolate(timestamp, max_distance)
+        return samples.nearest(timestamp, max_distance)
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+
+trusted_value_history = TrustedValueHistory()
@@ -19,14 +19,15 @@ from chained_accounts import find_accounts
 from telliot_core.apps.telliot_config import TelliotConfig
 from telliot_core.model.endpoints import RPCEndpoint
 from telliot_feeds.utils.cfg import setup_account
-from fetch_disputables.handle_connect_endpoint import get_endpoint
 
 from dotenv import load_dotenv
 load_dotenv()
 
 def get_tx_explorer_url(tx_hash: str, cfg: TelliotConfig) -> str:
     """Get transaction explorer URL."""
-    explorer: str = get_endpoint(cfg, cfg.main.chain_id).explorer
+    # from the config, looking up a connected endpoint would block on the node
+    endpoints = cfg.endpoints.find(chain_id=cfg.main.chain_id)
+    explorer: Optional[str] = next((e.explorer for e in endpoints if e.explorer), None)
     if explorer is not None and explorer[-1] != "/": explorer += "/"
     if explorer is not None:
         return explorer + "tx/" + tx_hash
@@ -264,10 +265,11 @@ class NotificationSources:
     DISPUTER_BALANCE_THRESHOLD = "Disputer balance threshold"
     REMOVE_REPORT = "Remove Report"
     TRANSACTION_REVERTED = "Transaction Reverted"
+    REORGED_EVENT = "Reorged Event"
 
 class EnvironmentAlerts:
     CRITICAL_DEFAULT = '["DISPUTE_AGAINST_REPORTER", "ALL_REPORTERS_STOP"]'
-    HIGH_DEFAULT = '["DISPUTE_AGAINST_REPORTER", "BEGAN_DISPUTE", "REMOVE_REPORT", "ALL_REPORTERS_STOP"]'
+    HIGH_DEFAULT = '["DISPUTE_AGAINST_REPORTER", "BEGAN_DISPUTE", "REMOVE_REPORT", "ALL_REPORTERS_STOP", "REORGED_EVENT"]'
     MID_DEFAULT = '["DISPUTABLE_REPORT", "REPORTER_STOP"]'
     LOW_DEFAULT = '["REPORTER_BALANCE", "DISPUTER_BALANCE"]'
 
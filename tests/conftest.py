@@ -13,7 +13,12 @@ from twilio.base.exceptions import TwilioException
 from web3 import Web3
 from web3.datastructures import AttributeDict
 
+from fetch_disputables import block_index
+from fetch_disputables import data
 from fetch_disputables.alerts import get_twilio_client
+from fetch_disputables.block_cache import block_cache
+from fetch_disputables.trusted_values import trusted_value_history
+from fetch_disputables.trusted_values import trusted_values
 
 load_dotenv()
 
@@ -30,6 +35,27 @@ def reset_chain():
     w3.provider.make_request("evm_revert", [snapshot_id["result"]])
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_trusted_values():
+    """Don't let tests see trusted values fetched (or mocked) by other tests"""
+    trusted_values.clear()
+    trusted_value_history.clear()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def clear_block_cache():
+    """Don't let tests see blocks of chains reverted by other tests"""
+    block_cache.clear()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def fresh_block_index(tmp_path, monkeypatch):
+    """Don't let tests see block timestamps of other tests, or persist them to the working directory"""
+    index = block_index.BlockTimestampIndex(str(tmp_path / "block_index.json"))
+    monkeypatch.setattr(block_index, "block_index", index)
+    monkeypatch.setattr(data, "block_index", index)
+
+
 @pytest.fixture
 def eth_usd_report_log():
     return AttributeDict(
@@ -0,0 +1,41 @@
+"""Tests for batch threshold evaluation."""
+import math
+
+from fetch_disputables.batch_evaluation import evaluate_batch
+from fetch_disputables.batch_evaluation import evaluate_one
+from fetch_disputables.data import Metrics
+from fetch_disputables.data import Threshold
+
+
+def test_batch_matches_single_report_verdicts():
+    values = [0, 0.0, 1, 100, 99.5, 104.9, 105.1, True, 2**60, "0xAB", "0xab", "abc", b"\x01", (1, 2), None]
+    thresholds = [
+        Threshold(Metrics.Percentage, 0.05),
+        Threshold(Metrics.Range, 5),
+        Threshold(Metrics.Equality, None),
+    ]
+    rows = [(r, t, th) for r in values for t in values for th in thresholds]
+
+    result = evaluate_batch([r for r, _, _ in rows], [t for _, t, _ in rows], [th for _, _, th in rows])
+
+    assert len(result) == len(rows)
+    for verdict, diff, (r, t, th) in zip(result.verdicts(), result.percent_diff, rows):
+        expected_verdict, expected_diff = evaluate_one(r, t, th)
+        assert verdict == expected_verdict, (r, t, th)
+        assert math.isnan(diff) if expected_diff is None else diff == expected_diff
+
+
+def test_percentage_verdicts_and_differences():
+    threshold = Threshold(Metrics.Percentage, 0.05)
+
+    result = evaluate_batch([105.0, 104.0, 1.0, "0x01"], [100.0, 100.0, 0.0, "0x01"], threshold)
+
+    assert result.verdicts() == [True, False, None, None]
+    assert result.percent_diff[:2].tolist() == [0.05, 0.04]
+    assert math.isnan(result.percent_diff[2])
+
+
+def test_equality_of_hex_strings_ignores_case():
+    result = evaluate_batch(["0xAB", "0xab", 2**60 + 1], ["0xab", "0xac", 2**60], Threshold(Metrics.Equality, None))
+
+    assert result.verdicts() == [False, True, True]
@@ -0,0 +1,103 @@
+"""Tests for the shared block cache."""
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from fetch_disputables.block_cache import BlockCache
+
+
+class Chain:
+    def __init__(self, head: int) -> None:
+        self.head = head
+        self.forks = {}
+        self.requests = []
+
+    def block(self, number: int, full_transactions: bool) -> SimpleNamespace:
+        fork = self.forks.get(number, "")
+        return SimpleNamespace(
+            number=number,
+            hash=f"0x{number}{fork}",
+            parentHash=f"0x{number - 1}{self.forks.get(number - 1, '')}",
+            transactions=["tx"] if full_transactions else ["0xtx"],
+        )
+
+    async def fetch(self, block_ids, full_transactions):
+        self.requests.append((list(block_ids), full_transactions))
+        numbers = [self.head if block_id == "latest" else block_id for block_id in block_ids]
+        return [self.block(n, full_transactions) for n in numbers]
+
+
+@pytest.mark.asyncio
+async def test_final_blocks_are_served_from_cache():
+    chain = Chain(head=1000)
+    cache = BlockCache(max_blocks=100, finality_depth=10)
+    await cache.get_blocks(943, ["latest", 500, 501], chain.fetch)
+
+    chain.requests.clear()
+    blocks = await cache.get_blocks(943, [500, 501, 502], chain.fetch)
+
+    assert [block.number for block in blocks] == [500, 501, 502]
+    assert chain.requests == [([502], False)]
+
+
+@pytest.mark.asyncio
+async def test_blocks_with_transactions_serve_header_requests():
+    chain = Chain(head=1000)
+    cache = BlockCache(max_blocks=100, finality_depth=10)
+    await cache.get_blocks(943, ["latest", 500], chain.fetch, full_transactions=True)
+
+    chain.requests.clear()
+    (block,) = await cache.get_blocks(943, [500], chain.fetch)
+
+    assert block.transactions == ["tx"]
+    assert chain.requests == []
+
+
+@pytest.mark.asyncio
+async def test_near_head_blocks_are_revalidated_by_hash():
+    chain = Chain(head=1000)
+    cache = BlockCache(max_blocks=100, finality_depth=10)
+    await cache.get_blocks(943, [995, 996], chain.fetch, full_transactions=True)
+
+    chain.requests.clear()
+    chain.forks[996] = "b"
+    blocks = await cache.get_blocks(943, [995, 996], chain.fetch, full_transactions=True)
+
+    # the unchanged block only cost a header, the reorged one is fetched again
+    assert chain.requests == [([995, 996], False), ([996], True)]
+    assert [block.hash for block in blocks] == ["0x995", "0x996b"]
+    assert blocks[1].transactions == ["tx"]
+
+
+def test_least_recently_used_blocks_are_evicted():
+    chain = Chain(head=1000)
+    cache = BlockCache(max_blocks=2, finality_depth=10)
+    for number in (1, 2, 3):
+        cache.put(943, chain.block(number, False))
+
+    assert cache.get_cached(943, 1) is None
+    assert cache.get_cached(943, 3).number == 3
+
+
+def test_cache_is_shared_between_threads():
+    chain = Chain(head=1000)
+    cache = BlockCache(max_blocks=8, finality_depth=10)
+    errors = []
+
+    def use_cache(offset: int) -> None:
+        try:
+            for number in range(offset, offset + 2000):
+                cache.put(943, chain.block(number % 50, False))
+                cache.get_cached(943, (number + 1) % 50)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=use_cache, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache._blocks[943]) <= 8
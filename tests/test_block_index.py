@@ -0,0 +1,75 @@
+"""Tests for the block timestamp index."""
+from types import SimpleNamespace
+
+import pytest
+
+from fetch_disputables.block_index import BlockTimestampIndex
+
+
+class Chain:
+    """Blocks 0..head, starting at genesis_time with block_time seconds between them."""
+
+    def __init__(self, head: int, genesis_time: int = 1_000_000, block_time: int = 10) -> None:
+        self.head = head
+        self.genesis_time = genesis_time
+        self.block_time = block_time
+        self.round_trips = 0
+
+    def timestamp(self, number: int) -> int:
+        return self.genesis_time + number * self.block_time
+
+    async def get_blocks(self, block_ids):
+        self.round_trips += 1
+        numbers = [self.head if block_id == "latest" else block_id for block_id in block_ids]
+        return [SimpleNamespace(number=n, timestamp=self.timestamp(n)) if n <= self.head else None for n in numbers]
+
+
+@pytest.mark.asyncio
+async def test_block_at_timestamp(tmp_path):
+    chain = Chain(head=25_000_000)
+    index = BlockTimestampIndex(str(tmp_path / "block_index.json"))
+
+    assert await index.find_block(943, chain.timestamp(1_234_567), chain.get_blocks) == 1_234_567
+    # between two blocks: the one before
+    assert await index.find_block(943, chain.timestamp(7_654_321) + 5, chain.get_blocks) == 7_654_321
+    assert await index.find_block(943, chain.genesis_time - 1, chain.get_blocks) == 0
+    assert await index.find_block(943, chain.timestamp(chain.head) + 60, chain.get_blocks) == chain.head
+
+
+@pytest.mark.asyncio
+async def test_lookups_take_few_round_trips_and_are_memoized(tmp_path):
+    chain = Chain(head=25_000_000)
+    index = BlockTimestampIndex(str(tmp_path / "block_index.json"))
+    await index.find_block(943, chain.timestamp(1_000), chain.get_blocks)
+
+    chain.round_trips = 0
+    assert await index.find_block(943, chain.timestamp(20_000_000), chain.get_blocks) == 20_000_000
+    assert chain.round_trips == 1
+
+    chain.round_trips = 0
+    assert await index.find_block(943, chain.timestamp(20_000_000), chain.get_blocks) == 20_000_000
+    assert chain.round_trips == 0
+
+
+@pytest.mark.asyncio
+async def test_irregular_block_times_still_converge(tmp_path):
+    chain = Chain(head=100_000)
+    # a stall of a day after block 50_000
+    chain.timestamp = lambda n: 1_000_000 + n * 10 + (86_400 if n > 50_000 else 0)
+    index = BlockTimestampIndex(str(tmp_path / "block_index.json"))
+
+    assert await index.find_block(943, 1_000_000 + 50_000 * 10 + 3_600, chain.get_blocks) == 50_000
+    assert await index.find_block(943, chain.timestamp(75_000), chain.get_blocks) == 75_000
+
+
+@pytest.mark.asyncio
+async def test_anchors_survive_restart(tmp_path):
+    path = str(tmp_path / "block_index.json")
+    chain = Chain(head=25_000_000)
+    await BlockTimestampIndex(path).find_block(943, chain.timestamp(1_234_567), chain.get_blocks)
+
+    # the head advanced, but the timestamp is within the known range
+    chain.head += 100
+    chain.round_trips = 0
+    assert await BlockTimestampIndex(path).find_block(943, chain.timestamp(2_000_000), chain.get_blocks) == 2_000_000
+    assert chain.round_trips == 1
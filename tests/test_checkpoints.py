@@ -0,0 +1,37 @@
+"""Test persistent block checkpoints."""
+from fetch_disputables.checkpoints import CheckpointStore
+
+
+def test_checkpoints_survive_restart(tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+    store = CheckpointStore(path)
+    keys = [(943, "0xAbC", "0x48e9"), (943, "0xDeF", "0xfbfe")]
+
+    assert store.resume_block(keys) is None
+
+    store.commit(keys, 100)
+    store.commit(keys[:1], 150)
+
+    restarted = CheckpointStore(path)
+    assert restarted.get(943, "0xabc", "0x48e9") == 150
+    # resume from the oldest checkpoint so no topic skips history
+    assert restarted.resume_block(keys) == 100
+
+
+def test_checkpoints_never_move_backwards(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"))
+    key = (369, "0xabc", "transactions")
+
+    store.commit([key], 200)
+    store.commit([key], 150)
+
+    assert store.get(*key) == 200
+
+
+def test_unreadable_checkpoint_file_is_ignored(tmp_path):
+    path = tmp_path / "checkpoints.json"
+    path.write_text("{not json")
+
+    store = CheckpointStore(str(path))
+
+    assert store.resume_block([(943, "0xabc", "0x48e9")]) is None
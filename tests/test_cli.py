@@ -0,0 +1,94 @@
+"""Tests for handing evaluated reports to the dispute and notify stage in chain order."""
+import asyncio
+
+import pytest
+
+from fetch_disputables.cli import ChainDispatcher
+from fetch_disputables.data import EventBatch
+
+
+def evaluation(report: str, delay: float):
+    async def evaluate():
+        await asyncio.sleep(delay)
+        return report
+
+    return evaluate
+
+
+class Batch(EventBatch):
+    def __init__(self, events: list) -> None:
+        self.events = events
+
+    def commit(self) -> None:
+        self.events.append("commit")
+
+
+@pytest.mark.asyncio
+async def test_reports_are_handled_in_chain_order():
+    handled = []
+
+    async def handle(chain_id, report):
+        handled.append((chain_id, report))
+
+    dispatcher = ChainDispatcher(943, handle)
+    # evaluations finish in reverse order
+    await dispatcher.submit(evaluation("a", 0.03))
+    await dispatcher.submit(evaluation("b", 0.02))
+    dispatcher.commit(Batch(handled))
+    await dispatcher.submit(evaluation("c", 0.01))
+    await asyncio.sleep(0.1)
+
+    dispatcher.close()
+    assert handled == [(943, "a"), (943, "b"), "commit", (943, "c")]
+
+
+@pytest.mark.asyncio
+async def test_slow_handling_on_one_chain_does_not_block_others():
+    handled = []
+    release = asyncio.Event()
+
+    async def handle(chain_id, report):
+        if chain_id == 1:
+            await release.wait()
+        handled.append(report)
+
+    slow, fast = ChainDispatcher(1, handle), ChainDispatcher(2, handle)
+    await slow.submit(evaluation("slow dispute", 0))
+    await fast.submit(evaluation("alert", 0))
+    await asyncio.sleep(0.01)
+    assert handled == ["alert"]
+
+    release.set()
+    await asyncio.sleep(0.01)
+    slow.close()
+    fast.close()
+    assert handled == ["alert", "slow dispute"]
+
+
+@pytest.mark.asyncio
+async def test_submit_waits_for_room():
+    started = []
+    release = asyncio.Event()
+
+    async def handle(chain_id, report):
+        await release.wait()
+
+    def tracked(report):
+        async def evaluate():
+            started.append(report)
+            return report
+
+        return evaluate
+
+    dispatcher = ChainDispatcher(943, handle, max_pending=2)
+    await dispatcher.submit(tracked("a"))
+    await dispatcher.submit(tracked("b"))
+    third = asyncio.ensure_future(dispatcher.submit(tracked("c")))
+    await asyncio.sleep(0.01)
+    assert started == ["a", "b"] and not third.done()
+
+    release.set()
+    await asyncio.wait_for(third, 1)
+    await asyncio.sleep(0.01)
+    dispatcher.close()
+    assert started == ["a", "b", "c"]
@@ -95,3 +95,28 @@ def test_form_evm_call_feed_from_yaml():
 
     threshold = Threshold(Metrics.Equality, amount=None)
     assert auto_disp_cfg.monitored_feeds[0] == MonitoredFeed(evm_call_feed, threshold)
+
+
+def test_feed_index_from_yaml():
+    """test that feeds are indexed by query id, and generic feeds by query type"""
+
+    yaml_content = """
+    feeds: # please reference https://github.com/fetch-io/dataSpecs/tree/main/types
+    - query_id: "0x83a7f3d48786ac2667503a61e8c415438ed2922eb86a2906e4ee66d9a2ce4992"
+      threshold:
+        type: Percentage
+        amount: 0.95 # 95%
+    - query_type: "EVMCall"
+      threshold:
+        type: Equality
+    """
+
+    with mock.patch("builtins.open", mock.mock_open(read_data=yaml_content)):
+        auto_disp_cfg = AutoDisputerConfig()
+
+    feed_index = auto_disp_cfg.feed_index
+    assert len(feed_index) == 2
+    spot_price_feed = feed_index.find("0x83a7f3d48786ac2667503a61e8c415438ed2922eb86a2906e4ee66d9a2ce4992")
+    assert spot_price_feed is auto_disp_cfg.monitored_feeds[0]
+    assert feed_index.find_generic("EVMCall") is auto_disp_cfg.monitored_feeds[1]
+    assert feed_index.find_generic("SpotPrice") is None
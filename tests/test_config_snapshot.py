@@ -0,0 +1,56 @@
+"""Tests for config files reloaded on change."""
+import os
+
+import pytest
+
+from fetch_disputables.config_snapshot import ConfigSnapshot
+
+
+def make_snapshot(path):
+    loads = []
+
+    def load():
+        loads.append(path.read_text())
+        return {"content": loads[-1]}
+
+    return ConfigSnapshot(path, load), loads
+
+
+def test_snapshot_is_reused_until_file_changes(tmp_path):
+    path = tmp_path / "disputer-config.yaml"
+    path.write_text("feeds: []")
+    snapshot, loads = make_snapshot(path)
+
+    first = snapshot.get()
+    assert snapshot.get() is first
+
+    # touching the file without changing it keeps the snapshot
+    os.utime(path, ns=(0, 0))
+    assert snapshot.get() is first
+
+    path.write_text("feeds: [1]")
+    os.utime(path, ns=(1, 1))
+    assert snapshot.get() == {"content": "feeds: [1]"}
+    assert loads == ["feeds: []", "feeds: [1]"]
+
+
+def test_failed_reload_keeps_previous_snapshot(tmp_path):
+    path = tmp_path / "managed-feeds.yaml"
+    path.write_text("managed_feeds: []")
+    errors = [ValueError("bad yaml")]
+
+    def load():
+        if errors:
+            raise errors.pop()
+        return "loaded"
+
+    snapshot = ConfigSnapshot(path, load)
+
+    with pytest.raises(ValueError):
+        snapshot.get()
+    assert snapshot.get() == "loaded"
+
+    errors.append(ValueError("bad yaml"))
+    path.write_text("managed_feeds: [")
+    os.utime(path, ns=(1, 1))
+    assert snapshot.get() == "loaded"
@@ -0,0 +1,323 @@
+"""Tests for report parsing helpers in fetch_disputables.data"""
+import asyncio
+from datetime import datetime
+from datetime import timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.datastructures import AttributeDict
+from telliot_core.apps.telliot_config import TelliotConfig
+from telliot_feeds.feeds import CATALOG_FEEDS
+from telliot_feeds.queries.query_catalog import query_catalog
+
+from fetch_disputables import data
+from fetch_disputables import trusted_values as trusted_values_module
+from fetch_disputables.block_index import BlockTimestampIndex
+from fetch_disputables.checkpoints import CheckpointStore
+from fetch_disputables.data import cfg_for_chain
+from fetch_disputables.data import decode_query_data
+from fetch_disputables.data import find_catalog_entry
+from fetch_disputables.data import get_query_from_data
+from fetch_disputables.data import get_source_from_data
+from fetch_disputables.event_index import SeenEventIndex
+from fetch_disputables.trusted_values import TrustedValueCache
+from fetch_disputables.trusted_values import TrustedValueHistory
+from fetch_disputables.utils import Topics
+
+# SpotPrice eth/usd
+SPOT_PRICE_QUERY_DATA = HexBytes(
+    "0x00000000000000000000000000000000000000000000000000000000000000400000000000000000000000000000000000000000000000000000000000000080000000000000000000000000000000000000000000000000000000000000000953706f745072696365000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000c0000000000000000000000000000000000000000000000000000000000000004000000000000000000000000000000000000000000000000000000000000000800000000000000000000000000000000000000000000000000000000000000003657468000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000037573640000000000000000000000000000000000000000000000000000000000"  # noqa: E501
+)
+
+
+def test_query_data_is_decoded_once():
+    decode_query_data.cache_clear()
+
+    query = get_query_from_data(SPOT_PRICE_QUERY_DATA)
+    source = get_source_from_data(SPOT_PRICE_QUERY_DATA)
+
+    assert query.asset == "eth" and query.currency == "usd"
+    assert decode_query_data(bytes(SPOT_PRICE_QUERY_DATA)).query_type == "SpotPrice"
+    assert decode_query_data.cache_info().misses == 1
+    assert source.asset == "eth" and source.currency == "usd"
+
+
+def test_sources_are_not_shared():
+    first = get_source_from_data(SPOT_PRICE_QUERY_DATA)
+    second = get_source_from_data(SPOT_PRICE_QUERY_DATA)
+
+    assert first is not second
+
+
+def test_undecodable_query_data():
+    decoded = decode_query_data(b"\x01\x02")
+
+    assert decoded.params is None
+    assert get_source_from_data(b"\x01\x02") is None
+
+
+def test_catalog_entry_by_query_id():
+    catalog_entry = query_catalog.find(tag="eth-usd-spot")[0]
+
+    tag, feed = find_catalog_entry("0x" + catalog_entry.query_id.upper())
+
+    assert tag == "eth-usd-spot"
+    assert feed is CATALOG_FEEDS["eth-usd-spot"]
+    assert find_catalog_entry(catalog_entry.query_id) == (tag, feed)
+    assert find_catalog_entry("0x" + "00" * 32) is None
+
+
+def test_cfg_for_chain_leaves_cfg_untouched():
+    cfg = TelliotConfig()
+    cfg.main.chain_id = 943
+
+    chain_cfg = cfg_for_chain(cfg, 369)
+
+    assert chain_cfg.main.chain_id == 369
+    assert cfg.main.chain_id == 943
+    assert chain_cfg.endpoints is cfg.endpoints
+
+
+@pytest.mark.asyncio
+async def test_resumed_scan_starts_after_checkpoint(tmp_path, monkeypatch):
+    sources = [("0x" + "11" * 20, "0x48e9e2a1")]
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"))
+    store.commit([(943, *sources[0])], 100)
+    monkeypatch.setattr(data, "checkpoint_store", store)
+    monkeypatch.setattr(data, "start_block", {})
+    monkeypatch.setattr(data, "range_walkers", {})
+    monkeypatch.setattr(data, "chain_reorg", 5)
+    ranges = []
+
+    class Pool:
+        async def call(self, fn, hedge_after=None):
+            w3 = MagicMock()
+            w3.eth.get_block_number.return_value = 110
+            w3.eth.get_logs.side_effect = lambda log_filter: ranges.append(
+                (log_filter["fromBlock"], log_filter["toBlock"])
+            ) or []
+            return fn(w3)
+
+    batches = [batch async for batch in data.log_loop(Pool(), 943, sources)]
+
+    # the checkpointed block and the reorg overlap before it were processed by the previous run
+    assert ranges == [(101, 110)]
+    assert batches[-1].to_block == 110
+
+
+@pytest.mark.asyncio
+async def test_reorg_rewind_stops_running_scan(monkeypatch):
+    sources = [("0x" + "11" * 20, "0x48e9e2a1")]
+    monkeypatch.setattr(data, "start_block", {943: 100})
+    monkeypatch.setattr(data, "rewound_chains", set())
+    monkeypatch.setattr(data, "range_walkers", {943: data.BlockRangeWalker(chunk_size=10, min_chunk_size=10, max_chunk_size=10)})
+    monkeypatch.setattr(data, "chain_reorg", 0)
+    ranges = []
+
+    class Pool:
+        async def call(self, fn, hedge_after=None):
+            w3 = MagicMock()
+            w3.eth.get_block_number.return_value = 130
+            w3.eth.get_logs.side_effect = lambda log_filter: ranges.append(
+                (log_filter["fromBlock"], log_filter["toBlock"])
+            ) or []
+            return fn(w3)
+
+    async for batch in data.log_loop(Pool(), 943, sources):
+        # an event of block 105 is found reorged out while the scan goes on
+        data.start_block[943] = 104
+        data.rewound_chains.add(943)
+
+    assert ranges == [(100, 109), (110, 119)]
+    assert data.start_block[943] == 104
+
+    ranges.clear()
+    [batch async for batch in data.log_loop(Pool(), 943, sources)]
+    assert ranges == [(105, 114), (115, 124), (125, 130)]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_skips_feeds_checked_per_report(monkeypatch):
+    def feed(query_type: str, query_id: bytes) -> SimpleNamespace:
+        return SimpleNamespace(query=type(query_type, (), {"query_id": query_id})(), source=object())
+
+    feeds = [feed("SpotPrice", b"\x01"), feed("EVMCall", b"\x02"), feed("FetchRNG", b"\x03"), feed("FetchRNGCustom", b"\x04")]
+    fetched = []
+
+    async def fetch_trusted_value(feed):
+        fetched.append(type(feed.query).__name__)
+
+    monkeypatch.setattr(data, "fetch_trusted_value", fetch_trusted_value)
+    task = asyncio.ensure_future(data.prefetch_trusted_values(lambda: feeds, 60))
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+    assert fetched == ["SpotPrice"]
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_are_not_recorded_as_samples(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(trusted_values_module.time, "time", lambda: now[0])
+    monkeypatch.setattr(data, "trusted_values", TrustedValueCache(max_age=60))
+    monkeypatch.setattr(data, "trusted_value_history", TrustedValueHistory(max_samples=4))
+    fetches = []
+
+    async def general_fetch_new_datapoint(feed):
+        fetches.append(now[0])
+        return 1.0, datetime.fromtimestamp(now[0], tz=timezone.utc)
+
+    monkeypatch.setattr(data, "general_fetch_new_datapoint", general_fetch_new_datapoint)
+    feed = SimpleNamespace(query=SimpleNamespace(query_id=b"\x01"), source=object())
+    key = data.trusted_value_key(feed)
+
+    await data.fetch_trusted_value(feed)
+    now[0] = 1015.0
+    assert (await data.fetch_trusted_value(feed))[0] == 1.0
+
+    assert fetches == [1000.0]
+    # the sample is at the time it was fetched, not at the cache hit
+    assert data.trusted_value_history.nearest(key, 1000, max_distance=1)[0] == 1.0
+    assert data.trusted_value_history.nearest(key, 1015, max_distance=10) is None
+
+
+@pytest.mark.asyncio
+async def test_block_at_timestamp_uses_endpoint_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, "block_index", BlockTimestampIndex(str(tmp_path / "block_index.json")))
+    calls = []
+
+    def get_block(block_id, full_transactions):
+        number = 100 if block_id == "latest" else block_id
+        return SimpleNamespace(
+            number=number, timestamp=1000 + 10 * number, hash=f"0x{number}", parentHash=f"0x{number - 1}"
+        )
+
+    class Pool:
+        async def call(self, fn, hedge_after=None):
+            calls.append(fn)
+            w3 = MagicMock()
+            w3.eth.get_block.side_effect = get_block
+            return fn(w3)
+
+    cfg = MagicMock()
+    cfg.main.chain_id = 943
+    monkeypatch.setattr(data, "get_rpc_pool", lambda cfg, chain_id: Pool())
+    assert await data.get_block_number_at_timestamp(cfg, 1055) == 5
+    assert calls
+
+    monkeypatch.setattr(data, "get_rpc_pool", lambda cfg, chain_id: None)
+    assert await data.get_block_number_at_timestamp(cfg, 1255) is None
+
+
+@pytest.mark.asyncio
+async def test_one_get_logs_call_per_range_split_by_topic(monkeypatch):
+    oracle = "0x" + "11" * 20
+    governance = "0x" + "22" * 20
+    sources = [(oracle, Topics.NEW_REPORT), (governance, Topics.NEW_DISPUTE)]
+    monkeypatch.setattr(data, "start_block", {943: 100})
+    monkeypatch.setattr(data, "rewound_chains", set())
+    monkeypatch.setattr(data, "seen_events", SeenEventIndex())
+    monkeypatch.setattr(data, "range_walkers", {943: data.BlockRangeWalker(chunk_size=10, min_chunk_size=10, max_chunk_size=10)})
+    monkeypatch.setattr(data, "chain_reorg", 0)
+
+    def log(address: str, topic: str, block_number: int, log_index: int = 0) -> AttributeDict:
+        return AttributeDict({
+            "address": address,
+            "topics": [HexBytes(topic)],
+            "blockNumber": block_number,
+            "blockHash": HexBytes(block_number.to_bytes(32, "big")),
+            "logIndex": log_index,
+        })
+
+    logs = [
+        log(oracle, Topics.NEW_REPORT, 101),
+        log(governance, Topics.NEW_DISPUTE, 102),
+        # a NewReport topic from the governance contract was not asked for
+        log(governance, Topics.NEW_REPORT, 103),
+        log(oracle, Topics.NEW_REPORT, 112, log_index=1),
+    ]
+    filters = []
+
+    def get_logs(log_filter):
+        filters.append(log_filter)
+        return [l for l in logs if log_filter["fromBlock"] <= l.blockNumber <= log_filter["toBlock"]]
+
+    class Pool:
+        async def call(self, fn, hedge_after=None):
+            w3 = MagicMock()
+            w3.eth.get_block_number.return_value = 119
+            w3.eth.get_logs.side_effect = get_logs
+            return fn(w3)
+
+    batches = [batch async for batch in data.log_loop(Pool(), 943, sources)]
+
+    # one request per block range, for every address and topic at once
+    assert [(f["fromBlock"], f["toBlock"]) for f in filters] == [(100, 109), (110, 119)]
+    assert sorted(filters[0]["address"]) == sorted(Web3.toChecksumAddress(addr) for addr in (oracle, governance))
+    assert filters[0]["topics"] == [[Topics.NEW_REPORT, Topics.NEW_DISPUTE]]
+
+    new_reports, new_disputes = batches[0].event_lists
+    assert [event.blockNumber for _, event in new_reports] == [101]
+    assert [event.blockNumber for _, event in new_disputes] == [102]
+    assert [[event.blockNumber for _, event in events] for events in batches[1].event_lists] == [[112], []]
+
+
+def covered(ranges):
+    """Check ranges are consecutive, without gaps or overlaps, and return the blocks they span."""
+    for (_, previous_to), (next_from, _) in zip(ranges, ranges[1:]):
+        assert next_from == previous_to + 1
+    return ranges[0][0], ranges[-1][1]
+
+
+async def walk_ranges(walker, from_block, to_block, max_span=None):
+    async def get_logs(chunk_from, chunk_to):
+        if max_span is not None and chunk_to - chunk_from + 1 > max_span:
+            raise ValueError("query returned more than 10000 results")
+        return []
+
+    return [(chunk_from, chunk_to) async for chunk_from, chunk_to, _ in walker.walk(get_logs, from_block, to_block)]
+
+
+@pytest.mark.asyncio
+async def test_range_walker_shrinks_on_range_errors():
+    walker = data.BlockRangeWalker(chunk_size=100, min_chunk_size=10, max_chunk_size=1000)
+
+    ranges = await walk_ranges(walker, 0, 199, max_span=30)
+
+    assert covered(ranges) == (0, 199)
+    assert all(chunk_to - chunk_from + 1 <= 30 for chunk_from, chunk_to in ranges)
+    assert ranges[0] == (0, 24)
+
+
+@pytest.mark.asyncio
+async def test_range_walker_grows_back_up_to_max():
+    walker = data.BlockRangeWalker(chunk_size=10, min_chunk_size=10, max_chunk_size=40)
+
+    ranges = await walk_ranges(walker, 0, 299)
+
+    assert covered(ranges) == (0, 299)
+    sizes = [chunk_to - chunk_from + 1 for chunk_from, chunk_to in ranges]
+    assert sizes[:6] == [10, 10, 20, 20, 40, 40]
+    assert max(sizes) == 40
+    assert walker.chunk_size == 40
+
+
+@pytest.mark.asyncio
+async def test_range_walker_stops_at_min_chunk_size():
+    walker = data.BlockRangeWalker(chunk_size=80, min_chunk_size=10, max_chunk_size=1000)
+
+    with pytest.raises(ValueError):
+        await walk_ranges(walker, 0, 199, max_span=5)
+    assert walker.chunk_size == 10
+
+    # other errors are raised without shrinking
+    async def failing(chunk_from, chunk_to):
+        raise ValueError("429 Client Error: Too Many Requests")
+
+    walker = data.BlockRangeWalker(chunk_size=80, min_chunk_size=10, max_chunk_size=1000)
+    with pytest.raises(ValueError):
+        [chunk async for chunk in walker.walk(failing, 0, 199)]
+    assert walker.chunk_size == 80
@@ -0,0 +1,65 @@
+"""Tests for the precompiled NewReport/NewDispute decoders."""
+import pytest
+from eth_abi import encode_abi
+from eth_abi import encode_single
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.events import get_event_data
+from web3.exceptions import MismatchedABI
+
+from fetch_disputables import NEW_DISPUTE_ABI
+from fetch_disputables import NEW_REPORT_ABI
+from fetch_disputables.event_decoder import new_dispute_decoder
+from fetch_disputables.event_decoder import new_report_decoder
+
+REPORTER = "0xd5f1cc896542c111c7aa7d7fae2c3d654f34b927"
+
+
+def make_log(topics: list, data: bytes) -> dict:
+    return {
+        "address": "0x41b66dd93b03e89D29114a7613A6f9f0d4F40178",
+        "blockHash": HexBytes(b"\x01" * 32),
+        "blockNumber": 25541322,
+        "logIndex": 101,
+        "transactionIndex": 1,
+        "transactionHash": HexBytes(b"\x02" * 32),
+        "topics": topics,
+        "data": Web3.toHex(data),
+    }
+
+
+def test_new_report_decodes_like_web3():
+    log = make_log(
+        [
+            new_report_decoder.topic,
+            HexBytes(b"\x03" * 32),
+            HexBytes(encode_single("uint256", 1647451884)),
+            HexBytes(encode_single("address", REPORTER)),
+        ],
+        encode_abi(["bytes", "uint256", "bytes"], [b"\x00" * 32, 58, b"query data"]),
+    )
+
+    event_data = new_report_decoder.decode(log)
+
+    assert event_data == get_event_data(Web3().codec, NEW_REPORT_ABI, log)
+    assert event_data.args._reporter == Web3.toChecksumAddress(REPORTER)
+    assert event_data.args._nonce == 58
+
+
+def test_new_dispute_decodes_like_web3():
+    log = make_log(
+        [new_dispute_decoder.topic],
+        encode_abi(
+            ["uint256", "bytes32", "uint256", "address", "address", "uint256", "uint256", "uint256", "uint256"],
+            [7, b"\x03" * 32, 1647451884, REPORTER, REPORTER, 1647452000, 1, 10**18, 86400],
+        ),
+    )
+
+    assert new_dispute_decoder.decode(log) == get_event_data(Web3().codec, NEW_DISPUTE_ABI, log)
+
+
+def test_other_event_is_rejected():
+    log = make_log([new_dispute_decoder.topic], b"")
+
+    with pytest.raises(MismatchedABI):
+        new_report_decoder.decode(log)
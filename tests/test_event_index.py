@@ -0,0 +1,100 @@
+"""Tests for the seen event index and the reorg buffer."""
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+
+from fetch_disputables.event_index import ReorgBuffer
+from fetch_disputables.event_index import SeenEventIndex
+
+
+def make_log(block_number: int, log_index: int = 0) -> AttributeDict:
+    return AttributeDict(
+        {
+            "blockNumber": block_number,
+            "blockHash": HexBytes(block_number.to_bytes(32, "big")),
+            "logIndex": log_index,
+        }
+    )
+
+
+def test_add_rejects_duplicates_per_chain():
+    index = SeenEventIndex(reorg_depth=5)
+
+    assert index.add(1, make_log(100))
+    assert not index.add(1, make_log(100))
+    assert index.add(1, make_log(100, log_index=1))
+    # same log coordinates on another chain are a different log
+    assert index.add(5, make_log(100))
+
+
+def test_entries_are_evicted_outside_reorg_window():
+    index = SeenEventIndex(reorg_depth=5)
+    for block_number in range(100, 110):
+        index.add(1, make_log(block_number))
+
+    # only blocks 104..109 can still be re-read by a scan
+    assert len(index) == 6
+    assert index.add(1, make_log(100))
+
+    index.evict(1, 200)
+    assert len(index) == 0
+
+
+def test_pinned_entries_outlive_the_reorg_window():
+    index = SeenEventIndex(reorg_depth=5)
+    for block_number in range(100, 110):
+        index.add(1, make_log(block_number))
+    index.pin(1, 106)
+
+    index.evict(1, 200)
+    assert not index.add(1, make_log(106))
+    assert index.add(1, make_log(105))
+
+    index.unpin(1)
+    index.evict(1, 200)
+    assert len(index) == 0
+
+
+def canonical_hashes(overrides: dict):
+    async def block_hash(block_number: int) -> bytes:
+        return overrides.get(block_number, make_log(block_number).blockHash)
+
+    return block_hash
+
+
+@pytest.mark.asyncio
+async def test_reorg_buffer_releases_at_confirmation_depth():
+    buffer = ReorgBuffer(confirmations=3, alert_confirmations=1)
+    report, alert = make_log(100), make_log(100, log_index=1)
+    buffer.add(1, report)
+    buffer.add(1, alert, alert_only=True)
+
+    release = await buffer.release(1, 100, canonical_hashes({}))
+    assert release.confirmed == []
+
+    # alerts go out first, reports once deep enough to dispute
+    release = await buffer.release(1, 101, canonical_hashes({}))
+    assert release.confirmed == [alert]
+    assert buffer.oldest_block(1) == 100
+
+    release = await buffer.release(1, 103, canonical_hashes({}))
+    assert release.confirmed == [report]
+    assert buffer.pending(1) == 0
+
+
+@pytest.mark.asyncio
+async def test_reorg_buffer_drops_orphaned_events():
+    buffer = ReorgBuffer(confirmations=2, alert_confirmations=0)
+    report, alert = make_log(100), make_log(100, log_index=1)
+    buffer.add(1, report)
+    buffer.add(1, alert, alert_only=True)
+
+    release = await buffer.release(1, 100, canonical_hashes({}))
+    assert release.confirmed == [alert]
+
+    # block 100 got replaced before the report was confirmed
+    release = await buffer.release(1, 102, canonical_hashes({100: HexBytes(b"\x01" * 32)}))
+    assert release.confirmed == []
+    assert release.orphaned == [report]
+    assert release.retracted == [alert]
+    assert buffer.pending(1) == 0
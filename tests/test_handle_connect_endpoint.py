@@ -0,0 +1,89 @@
+"""Tests for endpoint health caching and the per-chain RPC pool."""
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from fetch_disputables import handle_connect_endpoint as hce
+from fetch_disputables.handle_connect_endpoint import RpcPool
+from fetch_disputables.rpc import rpc_call
+
+
+def make_endpoint(url: str) -> MagicMock:
+    endpoint = MagicMock(url=url, chain_id=1337)
+    endpoint._web3 = endpoint.web3
+    endpoint.web3.url = url
+    return endpoint
+
+
+def test_healthy_endpoint_lookup_skips_rpc(monkeypatch):
+    endpoint = make_endpoint("http://a")
+    endpoint._web3 = None
+    endpoint.connect.side_effect = lambda: setattr(endpoint, "_web3", endpoint.web3) or True
+    cfg = MagicMock()
+    cfg.endpoints.find.return_value = [endpoint]
+    monkeypatch.setattr(hce, "rpc_pools", {})
+
+    assert hce.get_endpoint(cfg, 1337) is endpoint
+    assert hce.get_endpoint(cfg, 1337) is endpoint
+    endpoint.web3.isConnected.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_endpoint_is_rotated_out():
+    slow, fast = make_endpoint("http://slow"), make_endpoint("http://fast")
+    pool = RpcPool(1337, [slow, fast])
+
+    def get_block_number(w3):
+        if w3.url == "http://slow":
+            raise ConnectionError("429 Client Error: Too Many Requests")
+        return 100
+
+    assert await pool.call(get_block_number) == 100
+    assert pool.ranked() == [fast]
+    assert pool.stats["http://slow"].error_rate == 1
+
+
+@pytest.mark.asyncio
+async def test_request_errors_are_not_failed_over():
+    first, second = make_endpoint("http://a"), make_endpoint("http://b")
+    pool = RpcPool(1337, [first, second])
+    called = []
+
+    def get_logs(w3):
+        called.append(w3.url)
+        raise ValueError({"code": -32005, "message": "query returned more than 10000 results"})
+
+    with pytest.raises(ValueError):
+        await pool.call(get_logs)
+    assert called == ["http://a"]
+    assert pool.stats["http://a"].error_rate == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_to_next_endpoint():
+    slow, fast = make_endpoint("http://slow"), make_endpoint("http://fast")
+    pool = RpcPool(1337, [slow, fast])
+
+    def get_logs(w3):
+        if w3.url == "http://slow":
+            time.sleep(0.5)
+        return [w3.url]
+
+    start = time.monotonic()
+    assert await pool.call(get_logs, hedge_after=0.05) == ["http://fast"]
+    assert time.monotonic() - start < 0.4
+
+
+@pytest.mark.asyncio
+async def test_stale_health_is_checked_off_the_event_loop(monkeypatch):
+    endpoint = make_endpoint("http://a")
+    cfg = MagicMock()
+    cfg.endpoints.find.return_value = [endpoint]
+    monkeypatch.setattr(hce, "rpc_pools", {})
+    threads = []
+    endpoint.web3.isConnected.side_effect = lambda: threads.append(threading.current_thread()) or True
+
+    assert await rpc_call(hce.get_endpoint, cfg, 1337) is endpoint
+    assert threads and threading.main_thread() not in threads
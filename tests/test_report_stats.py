@@ -0,0 +1,61 @@
+"""Tests for the reported value pre-filter."""
+import time
+
+from fetch_disputables.report_stats import ReportClass
+from fetch_disputables.report_stats import ReportStats
+
+
+def stats_with(values, **kwargs) -> ReportStats:
+    stats = ReportStats(window=8, min_samples=4, **kwargs)
+    for value in values:
+        stats.record("eth-usd", value)
+    return stats
+
+
+def test_reports_are_classified_by_distance_from_median():
+    stats = stats_with([100.0, 101.0, 99.0, 100.5, 99.5, 100.0])
+
+    assert stats.classify("eth-usd", 100.2) == ReportClass.FINE
+    assert stats.classify("eth-usd", 103.0) == ReportClass.SUSPICIOUS
+    assert stats.classify("eth-usd", 150.0) == ReportClass.BAD
+
+
+def test_fine_reports_stay_within_the_feed_tolerance():
+    stats = stats_with([100.0, 110.0, 90.0, 105.0, 95.0, 100.0])
+
+    assert stats.classify("eth-usd", 104.0) == ReportClass.FINE
+    assert stats.classify("eth-usd", 104.0, max_relative=0.02) == ReportClass.SUSPICIOUS
+    assert stats.classify("eth-usd", 104.0, max_absolute=2) == ReportClass.SUSPICIOUS
+
+
+def test_too_few_or_stale_values_are_suspicious():
+    assert stats_with([100.0, 100.0]).classify("eth-usd", 100.0) == ReportClass.SUSPICIOUS
+    assert stats_with([100.0] * 4).classify("btc-usd", 100.0) == ReportClass.SUSPICIOUS
+
+    stale = ReportStats(window=8, min_samples=4, max_age=60)
+    for _ in range(4):
+        stale.record("eth-usd", 100.0, timestamp=time.time() - 120)
+    assert stale.classify("eth-usd", 100.0) == ReportClass.SUSPICIOUS
+
+
+def test_window_keeps_the_latest_values():
+    stats = stats_with([1.0] * 8 + [100.0] * 8)
+
+    assert stats.classify("eth-usd", 100.0) == ReportClass.FINE
+    assert stats.classify("eth-usd", 1.0) == ReportClass.BAD
+
+
+def test_drifted_window_forces_verification():
+    stats = stats_with([100.0, 101.0, 99.0, 100.5, 99.5, 100.0], verify_every=3)
+
+    # the price drifted away, but the reports are still close to the old median
+    assert stats.classify("eth-usd", 100.8) == ReportClass.FINE
+    assert stats.classify("eth-usd", 100.9) == ReportClass.FINE
+    assert stats.classify("eth-usd", 101.0) == ReportClass.SUSPICIOUS
+    assert stats.classify("eth-usd", 101.0) == ReportClass.SUSPICIOUS
+
+    # until a verified value is recorded
+    stats.record("eth-usd", 101.0)
+    assert stats.classify("eth-usd", 101.0) == ReportClass.FINE
+
+    assert stats_with([100.0] * 8, verify_every=0).classify("eth-usd", 100.0) == ReportClass.FINE
@@ -0,0 +1,86 @@
+"""Tests for the async retry policy."""
+import asyncio
+
+import pytest
+
+from fetch_disputables.retry import retry
+from fetch_disputables.retry import RetryPolicy
+
+fast = RetryPolicy(attempts=3, base_delay=0.01, max_delay=0.01)
+
+
+@pytest.mark.asyncio
+async def test_retries_until_a_value_is_returned():
+    results = [(None, None), ValueError("api down"), (1.0, "now")]
+
+    async def fetch():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert await retry(fetch, fast, retry_if=lambda datapoint: datapoint[0] is None) == (1.0, "now")
+    assert results == []
+
+
+@pytest.mark.asyncio
+async def test_last_outcome_is_kept_after_the_last_attempt():
+    calls = []
+
+    async def missing():
+        calls.append(1)
+        return None, None
+
+    async def failing():
+        raise ValueError("api down")
+
+    assert await retry(missing, fast, retry_if=lambda datapoint: datapoint[0] is None) == (None, None)
+    assert len(calls) == 3
+    with pytest.raises(ValueError):
+        await retry(failing, fast)
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_total_time():
+    async def slow():
+        await asyncio.sleep(1)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with pytest.raises(asyncio.TimeoutError):
+        await retry(slow, RetryPolicy(attempts=5, base_delay=0.01, deadline=0.05))
+    assert loop.time() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_backoff_does_not_block_other_tasks():
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    async def missing():
+        return None
+
+    policy = RetryPolicy(attempts=2, base_delay=0.1)
+    await asyncio.gather(retry(missing, policy, retry_if=lambda result: result is None), ticker())
+
+    assert len(ticks) == 5
+
+
+@pytest.mark.asyncio
+async def test_cancellation_stops_retrying():
+    calls = []
+
+    async def missing():
+        calls.append(1)
+        return None
+
+    task = asyncio.ensure_future(retry(missing, RetryPolicy(attempts=5, base_delay=10), retry_if=lambda r: r is None))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert calls == [1]
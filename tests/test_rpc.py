@@ -0,0 +1,89 @@
+"""Tests for the RPC rate limiter and request batching."""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from web3 import Web3
+
+from fetch_disputables import rpc
+from fetch_disputables.rpc import Priority
+from fetch_disputables.rpc import RpcBatcher
+from fetch_disputables.rpc import rpc_batch_call
+from fetch_disputables.rpc import TokenBucket
+
+
+def test_bucket_lets_higher_priority_through_first():
+    bucket = TokenBucket(rate=20, burst=1)
+    bucket.acquire()
+    order = []
+
+    def request(priority: Priority) -> None:
+        bucket.acquire(priority)
+        order.append(priority)
+
+    background = threading.Thread(target=request, args=(Priority.BACKGROUND,))
+    background.start()
+    time.sleep(0.01)
+    dispute = threading.Thread(target=request, args=(Priority.DISPUTE,))
+    dispute.start()
+    background.join(1)
+    dispute.join(1)
+
+    assert order == [Priority.DISPUTE, Priority.BACKGROUND]
+
+
+def test_bucket_backs_off_exponentially_after_rate_limit():
+    bucket = TokenBucket(rate=0)
+    first = bucket.backoff()
+    second = bucket.backoff()
+    third = bucket.backoff()
+
+    assert bucket.blocked_until > time.monotonic()
+    # each delay is jittered within [ceiling / 2, ceiling] of a doubling ceiling
+    assert first <= 1 and 1 <= second <= 2 and 2 <= third <= 4
+
+    bucket.succeeded()
+    assert bucket.backoff() <= 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_batch_request(monkeypatch):
+    posts = []
+
+    def make_post_request(url, data, **kwargs):
+        requests = json.loads(data)
+        posts.append(requests)
+        return json.dumps([
+            {"jsonrpc": "2.0", "id": r["id"], "result": hex(int(r["params"][0], 16) + 1)} for r in reversed(requests)
+        ]).encode()
+
+    monkeypatch.setattr(rpc, "make_post_request", make_post_request)
+    w3 = Web3(Web3.HTTPProvider("http://batch-test"))
+
+    balances = await asyncio.gather(*(rpc_batch_call(w3, "eth_getBalance", [hex(i), "latest"]) for i in range(5)))
+
+    assert balances == [1, 2, 3, 4, 5]
+    assert len(posts) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_fail_only_their_call(monkeypatch):
+    def make_post_request(url, data, **kwargs):
+        return json.dumps([
+            {"jsonrpc": "2.0", "id": 0, "result": None},
+            {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "execution reverted"}},
+        ]).encode()
+
+    monkeypatch.setattr(rpc, "make_post_request", make_post_request)
+    batcher = RpcBatcher(Web3(Web3.HTTPProvider("http://batch-errors")))
+
+    block, receipt = await asyncio.gather(
+        batcher.request("eth_getBlockByNumber", ["0x1", False]),
+        batcher.request("eth_getTransactionReceipt", ["0x01"]),
+        return_exceptions=True,
+    )
+
+    assert block is None
+    assert isinstance(receipt, ValueError)
@@ -0,0 +1,129 @@
+"""Test WebSocket log subscriptions against a local stand-in node."""
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from fetch_disputables import subscriptions
+from fetch_disputables.subscriptions import LogSubscriber
+from fetch_disputables.utils import Topics
+
+ORACLE = "0xB3B662644F8d3138df63D2F43068ea621e2981f9"
+GOVERNANCE = "0x02803dcFD7Cb32E97320CFe7449BFb45b6C931b8"
+
+
+def raw_log(address: str, topic: str, block_number: int, removed: bool = False) -> dict:
+    return {
+        "address": address.lower(),
+        "topics": [topic],
+        "data": "0x",
+        "blockNumber": hex(block_number),
+        "transactionHash": "0x" + "ab" * 32,
+        "transactionIndex": "0x1",
+        "blockHash": "0x" + f"{block_number:064x}",
+        "logIndex": "0x3",
+        "removed": removed,
+    }
+
+
+def stand_in_node(logs: list[dict], head: int = 99):
+    """Accept one eth_subscribe, answer eth_blockNumber with head, push logs, then drop the connection."""
+
+    async def handler(ws, path=None):
+        request = json.loads(await ws.recv())
+        assert request["method"] == "eth_subscribe"
+        assert request["params"][0] == "logs"
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": "0x1"}))
+        request = json.loads(await ws.recv())
+        assert request["method"] == "eth_blockNumber"
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": hex(head)}))
+        for log in logs:
+            await ws.send(
+                json.dumps(
+                    {"jsonrpc": "2.0", "method": "eth_subscription", "params": {"subscription": "0x1", "result": log}}
+                )
+            )
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_subscription_yields_pushed_logs():
+    logs = [
+        raw_log(ORACLE, Topics.NEW_REPORT, 100),
+        # reorged out
+        raw_log(ORACLE, Topics.NEW_REPORT, 101, removed=True),
+        # address/topic pair that was not subscribed
+        raw_log(GOVERNANCE, Topics.NEW_REPORT, 102),
+        raw_log(GOVERNANCE, Topics.NEW_DISPUTE, 103),
+    ]
+    sources = [(ORACLE, Topics.NEW_REPORT), (GOVERNANCE, Topics.NEW_DISPUTE)]
+    subscriber = LogSubscriber()
+
+    async with websockets.serve(stand_in_node(logs), "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        batches = [batch async for batch in subscriber.subscribe(f"ws://127.0.0.1:{port}", 1337, sources)]
+
+    assert [batch.to_block for batch in batches] == [100, 100, 103]
+    report_events, dispute_events = batches[0].event_lists
+    assert dispute_events == []
+    chain_id, log = report_events[0]
+    assert chain_id == 1337
+    assert log.address == ORACLE
+    assert log.blockNumber == 100 and log.logIndex == 3
+    # removed logs are passed on for retraction only
+    assert batches[1].event_lists == [[], []]
+    assert batches[1].removed[0][1].blockNumber == 101
+    assert batches[2].event_lists[1][0][1].address == GOVERNANCE
+
+
+@pytest.mark.asyncio
+async def test_disconnect_falls_back_to_polling():
+    subscriber = LogSubscriber()
+
+    async with websockets.serve(stand_in_node([]), "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        async for _ in subscriber.subscribe(f"ws://127.0.0.1:{port}", 1337, [(ORACLE, Topics.NEW_REPORT)]):
+            pass
+
+    assert 1337 not in subscriber.live_chain_ids
+    assert subscriber.sessions[1337] == 1
+
+
+def test_scan_skips_chain_only_after_covering_subscription_start(monkeypatch):
+    blocks = {}
+    monkeypatch.setattr(subscriptions, "start_block", blocks)
+    subscriber = LogSubscriber()
+    subscriber.sessions[1337] = 1
+    subscriber.live_chain_ids.add(1337)
+    subscriber.live_blocks[1337] = 100
+
+    # the scans have yet to cover the gap before the subscription
+    blocks[1337] = 90
+    assert subscriber.chains_to_skip() == set()
+    blocks[1337] = 100
+    assert subscriber.chains_to_skip() == {1337}
+
+    # a reconnect went live at a later block, scan once more
+    subscriber.live_blocks[1337] = 120
+    assert subscriber.chains_to_skip() == set()
+
+
+@pytest.mark.asyncio
+async def test_pushed_logs_before_covering_scan_do_not_advance_progress(monkeypatch):
+    blocks = {1337: 50}
+    monkeypatch.setattr(subscriptions, "start_block", blocks)
+    subscriber = LogSubscriber(max_backoff=1)
+    logs = [raw_log(ORACLE, Topics.NEW_REPORT, 101)]
+
+    async with websockets.serve(stand_in_node(logs, head=100), "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        task = asyncio.create_task(subscriber.run(f"ws://127.0.0.1:{port}", 1337, [(ORACLE, Topics.NEW_REPORT)]))
+        batch = await asyncio.wait_for(subscriber.queue.get(), 5)
+        task.cancel()
+
+    assert batch.to_block == 101
+    assert not batch.covered
+    assert blocks[1337] == 50
+    assert subscriber.pushed_blocks[1337] == 101
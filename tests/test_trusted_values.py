@@ -0,0 +1,89 @@
+"""Tests for the trusted value cache."""
+import asyncio
+
+import pytest
+
+from fetch_disputables.trusted_values import TrustedValueCache
+from fetch_disputables.trusted_values import TrustedValueHistory
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_fetch():
+    cache = TrustedValueCache(max_age=60)
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        await asyncio.sleep(0.01)
+        return 1234.5, "now"
+
+    datapoints = await asyncio.gather(*(cache.get("eth-usd", fetch) for _ in range(5)))
+
+    assert datapoints == [(1234.5, "now")] * 5
+    assert len(fetches) == 1
+    # and later requests in the same time bucket reuse it
+    assert await cache.get("eth-usd", fetch) == (1234.5, "now")
+    assert len(fetches) == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_values_are_fetched_again():
+    cache = TrustedValueCache(max_age=60)
+    datapoints = [(None, None), (1.0, "now")]
+
+    async def fetch():
+        return datapoints.pop(0)
+
+    assert await cache.get("eth-usd", fetch) == (None, None)
+    assert await cache.get("eth-usd", fetch) == (1.0, "now")
+
+
+@pytest.mark.asyncio
+async def test_zero_max_age_disables_caching():
+    cache = TrustedValueCache(max_age=0)
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        return 1.0, "now"
+
+    await cache.get("eth-usd", fetch)
+    await cache.get("eth-usd", fetch)
+
+    assert len(fetches) == 2
+
+
+def test_history_returns_sample_nearest_report_time():
+    history = TrustedValueHistory(max_samples=3)
+    for timestamp, price in [(100, 1.0), (110, 2.0), (120, 3.0), (130, 4.0)]:
+        history.record("eth-usd", (price, None), timestamp=timestamp)
+
+    assert history.nearest("eth-usd", 124, max_distance=15) == (3.0, None)
+    assert history.nearest("eth-usd", 127, max_distance=15) == (4.0, None)
+    # the oldest sample was dropped, the nearest kept one is too far
+    assert history.nearest("eth-usd", 95, max_distance=10) is None
+    assert history.nearest("btc-usd", 124, max_distance=15) is None
+
+
+def test_history_ignores_out_of_order_samples():
+    history = TrustedValueHistory(max_samples=4)
+    history.record("eth-usd", (1.0, None), timestamp=100)
+    history.record("eth-usd", (2.0, None), timestamp=90)
+
+    assert history.nearest("eth-usd", 90, max_distance=15) == (1.0, None)
+
+
+def test_history_interpolates_between_float_samples():
+    history = TrustedValueHistory(max_samples=4, interpolate=True)
+    history.record("eth-usd", (1.0, None), timestamp=100)
+    history.record("eth-usd", (3.0, None), timestamp=110)
+    history.record("eth-usd", (30, None), timestamp=120)
+
+    assert history.nearest("eth-usd", 105, max_distance=15) == (2.0, None)
+    assert history.nearest("eth-usd", 102.5, max_distance=15) == (1.5, None)
+    # ints are not interpolated, e.g. equality checked values
+    assert history.nearest("eth-usd", 117, max_distance=15) == (30, None)
+    # nor past the samples
+    assert history.nearest("eth-usd", 95, max_distance=15) == (1.0, None)
+    # a neighbour too far away falls back to the nearest sample
+    assert history.nearest("eth-usd", 105, max_distance=4) is None